@@ -0,0 +1,7 @@
+from src.api.asgi import create_asgi_app
+
+app = create_asgi_app()
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(app, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,33 @@
+import os
+import sys
+import time
+import argparse
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+def archive(retention_days, max_batches):
+    from src.api.app import create_app
+    from src.api.container import get_container
+    
+    app = create_app()
+    
+    with app.app_context():
+        order_archive = get_container().order_archive
+        if retention_days is not None:
+            order_archive.retention_days = retention_days
+        started = time.perf_counter()
+        stats = order_archive.archive(max_batches=max_batches)
+    
+    print(f"Archived {stats['orders']} orders into {stats['files']} file(s) "
+          f"in {stats['batches']} batch(es), {time.perf_counter() - started:.2f}s "
+          f"-> {order_archive.directory}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Move old served and cancelled orders into date-partitioned Arrow files"
+    )
+    parser.add_argument("--retention-days", type=int, help="Override ARCHIVE_RETENTION_DAYS")
+    parser.add_argument("--max-batches", type=int, help="Stop after this many batches (default: until done)")
+    args = parser.parse_args()
+    archive(args.retention_days, args.max_batches)
\ No newline at end of file
@@ -1,38 +1,478 @@
 import os
-import shutil
+import sqlite3
 import datetime
+import time
 import sys
+import gzip
+import json
+import shutil
+import struct
+import hashlib
+import argparse
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+# Pages copied per backup step; the source is only read-locked during a step,
+# so writers get a chance to run between steps
+PAGES_PER_STEP = 256
+STEP_PAUSE_SECONDS = 0.005
+BUSY_RETRY_SECONDS = 0.05
+# A write to the source from another connection restarts a stepped backup at
+# page 1; after this many restarts the rest is copied in a single step
+MAX_BACKUP_RESTARTS = 3
+
+# Page stream format: header, then (page number, page bytes) records.
+# A base file holds every page, an increment only the pages that changed
+# since the previous restore point of the same chain
+PAGE_FILE_MAGIC = b"LBKPAGES"
+HEADER = struct.Struct(">8sII")
+RECORD = struct.Struct(">I")
+DIGEST_SIZE = 8
+
+DEFAULT_FULL_EVERY = 24
+DEFAULT_KEEP_HOURLY = 24
+DEFAULT_KEEP_DAILY = 7
+DEFAULT_KEEP_WEEKLY = 4
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSION_SUFFIX = {"gzip": ".gz", "zstd": ".zst"}
+
+class _TooManyRestarts(Exception):
+    pass
+
+def online_backup(db_path, backup_path, pages=PAGES_PER_STEP, pause=STEP_PAUSE_SECONDS,
+                  max_restarts=MAX_BACKUP_RESTARTS):
+    stats = {'steps': 0, 'busy_retries': 0, 'lock_wait_seconds': 0.0, 'pages': 0, 'restarts': 0}
+    last_remaining = None
+    
+    def progress(status, remaining, total):
+        nonlocal last_remaining
+        stats['steps'] += 1
+        stats['pages'] = total
+        if last_remaining is not None and remaining > last_remaining:
+            stats['restarts'] += 1
+            if stats['restarts'] >= max_restarts:
+                raise _TooManyRestarts()
+        last_remaining = remaining
+        if status in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED):
+            # sqlite sleeps BUSY_RETRY_SECONDS before retrying the same step
+            stats['busy_retries'] += 1
+            stats['lock_wait_seconds'] += BUSY_RETRY_SECONDS
+        elif remaining and pause:
+            time.sleep(pause)
+    
+    source = sqlite3.connect(db_path)
+    target = sqlite3.connect(backup_path)
+    try:
+        started = time.perf_counter()
+        try:
+            source.backup(target, pages=pages, progress=progress, sleep=BUSY_RETRY_SECONDS)
+        except _TooManyRestarts:
+            # Writers keep outpacing the steps; one step holds the read lock
+            # for the whole copy but cannot be restarted
+            source.backup(target, pages=-1, sleep=BUSY_RETRY_SECONDS)
+            stats['steps'] += 1
+            stats['single_step'] = True
+            stats['pages'] = target.execute("PRAGMA page_count").fetchone()[0]
+        stats['elapsed_seconds'] = time.perf_counter() - started
+        if stats['restarts']:
+            print(f"Online backup restarted {stats['restarts']} times by concurrent writes"
+                  + (", finished in a single step" if stats.get('single_step') else ""))
+        stats['page_size'] = target.execute("PRAGMA page_size").fetchone()[0]
+        stats['bytes'] = stats['pages'] * stats['page_size']
+    finally:
+        target.close()
+        source.close()
+    
+    return stats
+
+def verify_backup(backup_path):
+    conn = sqlite3.connect(backup_path)
+    try:
+        rows = conn.execute("PRAGMA integrity_check").fetchall()
+    finally:
+        conn.close()
+    return [row[0] for row in rows]
+
+def open_compressed(path, mode):
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError("zstd backups need the 'zstandard' package")
+        raw = open(path, mode)
+        if mode == "wb":
+            return zstandard.ZstdCompressor(level=3).stream_writer(raw, closefd=True)
+        return zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+    return gzip.open(path, mode, compresslevel=6)
+
+def read_exact(stream, size):
+    chunks = []
+    while size:
+        chunk = stream.read(size)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+# Offset of the file change counter in the database header; SQLite bumps it on
+# every committed write transaction in rollback-journal mode
+CHANGE_COUNTER = struct.Struct(">I")
+CHANGE_COUNTER_OFFSET = 24
+
+def write_page_file(source, out_path, page_size, page_count, previous_digests):
+    digests = bytearray()
+    pages_written = 0
+    
+    with open_compressed(out_path, "wb") as out:
+        out.write(HEADER.pack(PAGE_FILE_MAGIC, page_size, page_count))
+        
+        source.seek(0)
+        for pgno in range(page_count):
+            page = source.read(page_size)
+            digest = hashlib.blake2b(page, digest_size=DIGEST_SIZE).digest()
+            digests += digest
+            
+            offset = pgno * DIGEST_SIZE
+            if previous_digests is not None and previous_digests[offset:offset + DIGEST_SIZE] == digest:
+                continue
+            
+            out.write(RECORD.pack(pgno))
+            out.write(page)
+            pages_written += 1
+    
+    return bytes(digests), page_count, pages_written
+
+def apply_page_file(path, target):
+    with open_compressed(path, "rb") as stream:
+        magic, page_size, page_count = HEADER.unpack(read_exact(stream, HEADER.size))
+        if magic != PAGE_FILE_MAGIC:
+            raise ValueError(f"Not a page backup file: {path}")
+        
+        while True:
+            record = read_exact(stream, RECORD.size)
+            if not record:
+                break
+            (pgno,) = RECORD.unpack(record)
+            target.seek(pgno * page_size)
+            target.write(read_exact(stream, page_size))
+    
+    target.truncate(page_count * page_size)
+
+def write_atomic(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def read_change_counter(db_path):
+    # (change counter, page size, page count) under a read transaction held
+    # only for these reads; None for WAL databases, whose main file header is
+    # not bumped on every commit
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        if conn.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal":
+            return None
+        conn.execute("BEGIN")
+        # The first read takes the SHARED lock, released at COMMIT
+        conn.execute("SELECT count(*) FROM sqlite_master").fetchone()
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        with open(db_path, "rb") as f:
+            f.seek(CHANGE_COUNTER_OFFSET)
+            (counter,) = CHANGE_COUNTER.unpack(f.read(CHANGE_COUNTER.size))
+        conn.execute("COMMIT")
+        return counter, page_size, page_count
+    finally:
+        conn.close()
+
+def diff_pages(db_path, out_path, previous_digests, previous_counter, snapshot_path):
+    # Diffs a snapshot taken with online_backup against the previous restore
+    # point, so the live database is never read-locked for longer than one
+    # backup step while pages are checked, hashed and compressed. The change
+    # counter is read before the snapshot: the snapshot holds at least that
+    # state, so a later run seeing the same counter has nothing new to store.
+    live = read_change_counter(db_path)
+    counter = live[0] if live else None
+    if live and previous_digests is not None and counter == previous_counter \
+            and len(previous_digests) == live[2] * DIGEST_SIZE:
+        # Nothing was committed since the previous (checked) point, so no page
+        # needs to be copied, read or checked again
+        _, page_size, page_count = live
+        with open_compressed(out_path, "wb") as out:
+            out.write(HEADER.pack(PAGE_FILE_MAGIC, page_size, page_count))
+        return previous_digests, page_size, page_count, 0, counter
+    
+    online_backup(db_path, snapshot_path)
+    conn = sqlite3.connect(snapshot_path)
+    try:
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        problems = [row[0] for row in conn.execute("PRAGMA quick_check").fetchall()]
+        if problems != ["ok"]:
+            raise RuntimeError(f"Database failed integrity check: {problems[:5]}")
+    finally:
+        conn.close()
+    
+    with open(snapshot_path, "rb") as source:
+        digests, page_count, pages_written = write_page_file(
+            source, out_path, page_size, page_count, previous_digests
+        )
+    return digests, page_size, page_count, pages_written, counter
+
+def load_manifest(chain_dir):
+    with open(os.path.join(chain_dir, "manifest.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+def save_manifest(chain_dir, manifest):
+    tmp_path = os.path.join(chain_dir, "manifest.json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(chain_dir, "manifest.json"))
 
-def backup_database():
-    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    db_path = os.path.join(current_dir, "auth.db")
-    backup_dir = os.path.join(current_dir, "backups")
+def list_chains(backup_dir):
+    if not os.path.isdir(backup_dir):
+        return []
+    chains = []
+    for name in sorted(os.listdir(backup_dir)):
+        chain_dir = os.path.join(backup_dir, name)
+        if name.startswith("chain_") and os.path.exists(os.path.join(chain_dir, "manifest.json")):
+            chains.append((chain_dir, load_manifest(chain_dir)))
+    return chains
+
+def backup_database(full=False, compression="gzip", full_every=DEFAULT_FULL_EVERY):
+    from src.infrastructure.config.settings import settings
+    
+    db_path = settings.DATABASE_PATH
+    backup_dir = os.path.join(PROJECT_DIR, "backups")
     
     os.makedirs(backup_dir, exist_ok=True)
     
-    if not os.path.exists(db_path):
+    if not db_path or not os.path.exists(db_path):
         print("Database file not found:", db_path)
         return False
     
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_path = os.path.join(backup_dir, f"auth_backup_{timestamp}.db")
+    now = datetime.datetime.now()
+    snapshot_path = os.path.join(backup_dir, f".snapshot_{now.strftime('%Y%m%d_%H%M%S')}.db")
+    chain_dir = None
+    out_path = None
     
     try:
-        shutil.copy2(db_path, backup_path)
-        print(f"Backup created: {backup_path}")
+        conn = sqlite3.connect(db_path)
+        try:
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        finally:
+            conn.close()
         
-        backups = sorted([f for f in os.listdir(backup_dir) if f.startswith("auth_backup_")])
-        if len(backups) > 7:
-            for old_backup in backups[:-7]:
-                os.remove(os.path.join(backup_dir, old_backup))
-                print(f"Removed old backup: {old_backup}")
+        chains = list_chains(backup_dir)
+        manifest = chains[-1][1] if chains else None
+        if manifest is not None:
+            chain_dir = chains[-1][0]
         
-        return True
+        # Chains written before digests were kept per restore point have no
+        # trustworthy digests for their last point, so they are closed
+        start_new_chain = (
+            full
+            or manifest is None
+            or not manifest["points"]
+            or "digests" not in manifest["points"][-1]
+            or manifest["page_size"] != page_size
+            or manifest["compression"] != compression
+            or len(manifest["points"]) > full_every
+        )
+        
+        previous_digests = None
+        previous_counter = None
+        if start_new_chain:
+            chain_dir = os.path.join(backup_dir, f"chain_{now.strftime('%Y%m%d_%H%M%S')}")
+            os.makedirs(chain_dir)
+            manifest = {
+                "page_size": page_size,
+                "compression": compression,
+                "points": []
+            }
+        else:
+            last_point = manifest["points"][-1]
+            with open(os.path.join(chain_dir, last_point["digests"]), "rb") as f:
+                previous_digests = f.read()
+            previous_counter = last_point.get("change_counter")
+        
+        index = len(manifest["points"])
+        kind = "base" if index == 0 else "incr"
+        file_name = f"{index:04d}_{kind}.pages{COMPRESSION_SUFFIX[compression]}"
+        digests_name = f"{index:04d}.digests"
+        out_path = os.path.join(chain_dir, file_name)
+        
+        started = time.perf_counter()
+        digests, snapshot_page_size, page_count, pages_written, counter = diff_pages(
+            db_path, out_path, previous_digests, previous_counter, snapshot_path
+        )
+        elapsed = time.perf_counter() - started
+        if snapshot_page_size != manifest["page_size"]:
+            raise RuntimeError("Page size changed during the backup; run it again")
+        
+        # The digests of a point are written before the manifest names them,
+        # and a point's page file is only ever diffed against the digests of
+        # the point before it, so a crash at any step leaves the chain usable
+        write_atomic(os.path.join(chain_dir, digests_name), digests)
+        manifest["points"].append({
+            "file": file_name,
+            "digests": digests_name,
+            "change_counter": counter,
+            "created_at": now.isoformat(timespec="seconds"),
+            "page_count": page_count,
+            "pages_written": pages_written,
+            "bytes": os.path.getsize(out_path)
+        })
+        save_manifest(chain_dir, manifest)
+        
+        # Only the newest point's digests are ever read again
+        if index:
+            previous_name = manifest["points"][-2].get("digests")
+            if previous_name and os.path.exists(os.path.join(chain_dir, previous_name)):
+                os.remove(os.path.join(chain_dir, previous_name))
+        
+        size = page_count * page_size
+        rate = size / elapsed if elapsed > 0 else 0
+        print(f"Backup created: {out_path} ({kind}, {pages_written}/{page_count} pages, "
+              f"{os.path.getsize(out_path)} bytes on disk)")
+        print(f"Diffed {size} bytes in {elapsed:.3f}s ({rate / 1024 / 1024:.1f} MiB/s)")
         
+        return True
+    
     except Exception as e:
+        if out_path and os.path.exists(out_path):
+            os.remove(out_path)
         print(f"Backup failed: {e}")
         return False
+    
+    finally:
+        if os.path.exists(snapshot_path):
+            os.remove(snapshot_path)
+
+def apply_retention(keep_hourly=DEFAULT_KEEP_HOURLY, keep_daily=DEFAULT_KEEP_DAILY,
+                    keep_weekly=DEFAULT_KEEP_WEEKLY):
+    backup_dir = os.path.join(PROJECT_DIR, "backups")
+    chains = list_chains(backup_dir)
+    if not chains:
+        return
+    
+    points = sorted(
+        (
+            (datetime.datetime.fromisoformat(point["created_at"]), chain_dir)
+            for chain_dir, manifest in chains
+            for point in manifest["points"]
+        ),
+        reverse=True
+    )
+    
+    # A chain is kept while any of its restore points is the newest one in a
+    # retained hour, day or ISO week; increments are useless without their base
+    keep = {chains[-1][0]}
+    for bucket_format, count in (("%Y%m%d%H", keep_hourly), ("%Y%m%d", keep_daily), ("%G%V", keep_weekly)):
+        seen = set()
+        for created_at, chain_dir in points:
+            bucket = created_at.strftime(bucket_format)
+            if bucket in seen:
+                continue
+            seen.add(bucket)
+            if len(seen) > count:
+                break
+            keep.add(chain_dir)
+    
+    for chain_dir, _ in chains:
+        if chain_dir not in keep:
+            shutil.rmtree(chain_dir)
+            print(f"Removed old backup chain: {os.path.basename(chain_dir)}")
+
+def restore_database(output_path, chain=None, at=None):
+    backup_dir = os.path.join(PROJECT_DIR, "backups")
+    chains = list_chains(backup_dir)
+    if chain:
+        chains = [(path, manifest) for path, manifest in chains if os.path.basename(path) == chain]
+    if not chains:
+        print("No backup chain found")
+        return False
+    
+    cutoff = datetime.datetime.fromisoformat(at) if at else None
+    candidates = []
+    for chain_dir, manifest in chains:
+        for index, point in enumerate(manifest["points"]):
+            created_at = datetime.datetime.fromisoformat(point["created_at"])
+            if cutoff is None or created_at <= cutoff:
+                candidates.append((created_at, chain_dir, index))
+    if not candidates:
+        print("No restore point at or before", at)
+        return False
+    
+    created_at, chain_dir, index = max(candidates)
+    manifest = load_manifest(chain_dir)
+    
+    if os.path.exists(output_path):
+        print("Refusing to overwrite existing file:", output_path)
+        return False
+    
+    # Rebuilt aside and renamed only once it checks out, so a failed restore
+    # never leaves a half-written database at output_path
+    tmp_path = output_path + ".restoring"
+    started = time.perf_counter()
+    try:
+        with open(tmp_path, "wb+") as target:
+            for point in manifest["points"][:index + 1]:
+                apply_page_file(os.path.join(chain_dir, point["file"]), target)
+            target.flush()
+            os.fsync(target.fileno())
+        
+        problems = verify_backup(tmp_path)
+        if problems != ["ok"]:
+            print(f"Restored database failed integrity check: {problems[:5]}")
+            return False
+        
+        os.replace(tmp_path, output_path)
+    except Exception as e:
+        print(f"Restore failed: {e}")
+        return False
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    
+    print(f"Restored {os.path.basename(chain_dir)} as of {created_at.isoformat()} "
+          f"({index + 1} files) to {output_path} in {time.perf_counter() - started:.3f}s")
+    return True
 
 if __name__ == "__main__":
-    success = backup_database()
+    parser = argparse.ArgumentParser(description="Incremental, compressed SQLite backups")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    backup_parser = subparsers.add_parser("backup", help="Take a backup (default command)")
+    backup_parser.add_argument("--full", action="store_true", help="Start a new chain with a full base")
+    backup_parser.add_argument("--compression", choices=sorted(COMPRESSION_SUFFIX), default="gzip")
+    backup_parser.add_argument("--full-every", type=int, default=DEFAULT_FULL_EVERY,
+                               help="Increments per chain before a new base is taken")
+    backup_parser.add_argument("--keep-hourly", type=int, default=DEFAULT_KEEP_HOURLY)
+    backup_parser.add_argument("--keep-daily", type=int, default=DEFAULT_KEEP_DAILY)
+    backup_parser.add_argument("--keep-weekly", type=int, default=DEFAULT_KEEP_WEEKLY)
+    
+    restore_parser = subparsers.add_parser("restore", help="Rebuild a database from a base plus increments")
+    restore_parser.add_argument("output", help="Path of the database file to create")
+    restore_parser.add_argument("--chain", help="Chain directory name (default: any)")
+    restore_parser.add_argument("--at", help="Latest restore point at or before this ISO timestamp")
+    
+    args = parser.parse_args()
+    
+    if args.command == "restore":
+        success = restore_database(args.output, chain=args.chain, at=args.at)
+    else:
+        if args.command is None:
+            args = backup_parser.parse_args([])
+        success = backup_database(full=args.full, compression=args.compression, full_every=args.full_every)
+        if success:
+            apply_retention(args.keep_hourly, args.keep_daily, args.keep_weekly)
+    
     sys.exit(0 if success else 1)
\ No newline at end of file
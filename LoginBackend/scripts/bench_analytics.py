@@ -0,0 +1,135 @@
+import os
+import math
+import sys
+import time
+import random
+import sqlite3
+import argparse
+import tempfile
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+
+from src.api.app import create_app
+from src.infrastructure.config.settings import settings
+from src.infrastructure.database.models import OrderModel
+from src.infrastructure.database.migrations import TRIGGERS
+from src.infrastructure.analytics.order_analytics import load_order_columns, summarize
+
+STATUSES = ["served"] * 8 + ["cancelled", "ready"]
+SEED_BATCH = 100000
+
+def seed(orders, days, rng):
+    # Straight through sqlite3 with the order triggers dropped: this database
+    # is thrown away, and the per-row trigger bodies would dominate seeding
+    conn = sqlite3.connect(settings.DATABASE_PATH)
+    for name in TRIGGERS:
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+    start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=days - 1)
+    span = days * 86400
+    tables = [f"T{number}" for number in range(1, 41)] + ["Takeaway"]
+    for offset in range(0, orders, SEED_BATCH):
+        rows = []
+        for number in range(offset, min(offset + SEED_BATCH, orders)):
+            created = (start + timedelta(seconds=rng.randrange(span))).strftime("%Y-%m-%d %H:%M:%S.%f")
+            rows.append((f"B{number:09d}", "Bench", rng.choice(tables), '["Soup"]',
+                         round(rng.lognormvariate(3, 0.6), 2), rng.choice(STATUSES), "", 1, None, 1,
+                         created, created))
+        conn.executemany(
+            "INSERT INTO orders (order_number, customer_name, table_number, items, total_amount, status, "
+            "kitchen_notes, created_by, assigned_to, version, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+        )
+        conn.commit()
+    conn.close()
+    return start.date(), (start + timedelta(days=days - 1)).date()
+
+def per_row(first_day, last_day, bins):
+    # How an analysis is written today: ORM objects, to_dict(), Python loops
+    start = datetime.combine(first_day, datetime.min.time())
+    end = datetime.combine(last_day + timedelta(days=1), datetime.min.time())
+    by_hour = defaultdict(lambda: [0, 0, 0])
+    by_day = defaultdict(lambda: [0, 0, 0])
+    by_table = defaultdict(lambda: [0, 0, 0])
+    heatmap = [[0] * 24 for _ in range(7)]
+    amounts = []
+    orders = cancelled = 0
+    revenue = 0
+    query = OrderModel.query.filter(OrderModel.created_at >= start, OrderModel.created_at < end)\
+        .order_by(OrderModel.id).yield_per(10000)
+    for order in query:
+        data = order.to_dict()
+        created = datetime.fromisoformat(data["created_at"])
+        is_paid = data["status"] != "cancelled"
+        # Cents rounded half away from zero, like the rollups
+        amount = math.floor(data["total_amount"] * 100 + 0.5) if is_paid else 0
+        orders += 1
+        cancelled += not is_paid
+        revenue += amount
+        heatmap[created.weekday()][created.hour] += 1
+        for groups, key in ((by_hour, created.hour), (by_day, created.date()), (by_table, data["table_number"])):
+            group = groups[key]
+            group[0] += 1
+            group[1] += is_paid
+            group[2] += amount
+        if is_paid:
+            amounts.append(data["total_amount"])
+    amounts.sort()
+    top = sorted(by_table.items(), key=lambda item: -item[1][2])[:10]
+    low, high = amounts[0], amounts[-1]
+    edges = [low + (high - low) * i / bins for i in range(bins + 1)]
+    histogram = [0] * bins
+    for amount in amounts:
+        histogram[min(bisect_right(edges, amount) - 1, bins - 1)] += 1
+    return {"orders": orders, "cancelled_orders": cancelled, "revenue": revenue / 100,
+            "median_ticket": amounts[len(amounts) // 2], "top_table": top[0][0], "histogram": histogram}
+
+def vectorized(first_day, last_day, bins):
+    columns = load_order_columns(first_day, last_day)
+    summary = summarize(columns, first_day, last_day, "day", bins=bins)
+    totals = summary["totals"]
+    return {"orders": totals["orders"], "cancelled_orders": totals["cancelled_orders"],
+            "revenue": totals["revenue"], "median_ticket": totals["median_ticket"],
+            "top_table": summary["top_tables"][0]["table_number"],
+            "histogram": summary["ticket_histogram"]["counts"]}
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare per-row Python order analytics with the vectorized NumPy module"
+    )
+    parser.add_argument("--orders", type=int, default=5000000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--bins", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--skip-per-row", action="store_true", help="Only time the vectorized path")
+    args = parser.parse_args()
+    
+    app = create_app()
+    with app.app_context():
+        (first_day, last_day), seconds = timed(seed, args.orders, args.days, random.Random(args.seed))
+        print(f"Seeded {args.orders} orders over {args.days} days in {seconds:.1f}s")
+        
+        fast, fast_seconds = timed(vectorized, first_day, last_day, args.bins)
+        print(f"vectorized: {fast_seconds:.2f}s ({args.orders / fast_seconds:,.0f} orders/s)")
+        
+        if not args.skip_per_row:
+            slow, slow_seconds = timed(per_row, first_day, last_day, args.bins)
+            print(f"per-row:    {slow_seconds:.2f}s ({args.orders / slow_seconds:,.0f} orders/s)")
+            print(f"speedup:    {slow_seconds / fast_seconds:.1f}x")
+            
+            for key in ("orders", "cancelled_orders", "revenue", "top_table"):
+                if slow[key] != fast[key]:
+                    print(f"MISMATCH {key}: per-row {slow[key]} vs vectorized {fast[key]}")
+            # Edges computed in a different order can move a value sitting exactly on one
+            moved = sum(abs(a - b) for a, b in zip(slow["histogram"], fast["histogram"])) // 2
+            print(f"median ticket: per-row {slow['median_ticket']} vs vectorized {fast['median_ticket']}; "
+                  f"histogram values in a different bin: {moved}")
\ No newline at end of file
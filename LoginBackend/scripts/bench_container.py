@@ -0,0 +1,87 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+
+from src.api.app import create_app
+from src.api.container import get_container
+from src.api.v1.controllers.auth_controller import ROLE_MAPPING
+from src.api.v1.schemas.auth_schemas import UserRole as SchemaUserRole
+from src.application.use_cases.login_with_role import LoginWithRoleUseCase
+from src.application.use_cases.register_user import RegisterUserUseCase
+from src.domain.entities.user import UserRole
+from src.infrastructure.repositories.user_repositories_impl import UserRepositoryImpl
+from src.infrastructure.services.jwt_service import JWTService
+
+def build_per_request():
+    # What every AuthController method and admin route used to do per request
+    user_repo = UserRepositoryImpl()
+    auth_service = JWTService()
+    role_mapping = {
+        SchemaUserRole.USER: UserRole.USER,
+        SchemaUserRole.ADMIN: UserRole.ADMIN,
+        SchemaUserRole.RESTAURANT_STAFF: UserRole.RESTAURANT_STAFF,
+        SchemaUserRole.GUEST: UserRole.GUEST
+    }
+    login = LoginWithRoleUseCase(user_repo, auth_service)
+    register = RegisterUserUseCase(user_repo, auth_service)
+    return login, register, role_mapping[SchemaUserRole.USER]
+
+def build_from_container():
+    container = get_container()
+    return container.login_use_case, container.register_use_case, ROLE_MAPPING[SchemaUserRole.USER]
+
+def measure(fn, iterations):
+    fn()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    # Keep the results alive so every allocation shows up in the snapshot diff
+    kept = [fn() for _ in range(1000)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    del kept
+    stats = after.compare_to(before, "filename")
+    allocated = sum(stat.size_diff for stat in stats if stat.size_diff > 0) / 1000
+    
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    per_call = (time.perf_counter() - started) / iterations
+    return per_call * 1e6, allocated
+
+def measure_requests(client, headers, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        client.get("/api/v1/auth/me", headers=headers)
+    return (time.perf_counter() - started) / iterations * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-request dependency construction vs app-scoped container")
+    parser.add_argument("--iterations", type=int, default=100000)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    
+    app = create_app()
+    with app.app_context():
+        old_us, old_bytes = measure(build_per_request, args.iterations)
+        new_us, new_bytes = measure(build_from_container, args.iterations)
+    
+    print(f"{'strategy':<14} {'us/call':>9} {'bytes/call':>11}")
+    print(f"{'per-request':<14} {old_us:>9.2f} {old_bytes:>11.0f}")
+    print(f"{'container':<14} {new_us:>9.2f} {new_bytes:>11.0f}")
+    
+    client = app.test_client()
+    login = client.post("/api/v1/auth/login", json={
+        "email": "user@example.com", "password": "Password123", "role": "user"
+    }).get_json()
+    headers = {"Authorization": f"Bearer {login['access_token']}"}
+    print(f"GET /api/v1/auth/me end to end: {measure_requests(client, headers, args.requests):.1f} us/request")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
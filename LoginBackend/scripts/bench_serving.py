@@ -0,0 +1,134 @@
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import tempfile
+import threading
+import subprocess
+import http.client
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVERS = {
+    "wsgi": [
+        sys.executable, "-c",
+        "import sys; sys.path.insert(0, '.'); from src.api.app import create_app; "
+        "create_app().run(host='127.0.0.1', port={port}, threaded=True)"
+    ],
+    "asgi": [
+        sys.executable, "-m", "uvicorn", "asgi:app",
+        "--host", "127.0.0.1", "--port", "{port}", "--log-level", "warning"
+    ],
+}
+
+ENDPOINTS = {
+    "health": ("GET", "/health", None),
+    "login": ("POST", "/api/v1/auth/login", {
+        "email": "user@example.com", "password": "Password123", "role": "user"
+    }),
+}
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def wait_for_port(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+def start_server(kind, port, env):
+    command = [part.replace("{port}", str(port)) for part in SERVERS[kind]]
+    process = subprocess.Popen(command, cwd=PROJECT_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if not wait_for_port(port):
+        process.kill()
+        raise RuntimeError(f"{kind} server did not start")
+    return process
+
+def run_load(port, endpoint, connections, duration):
+    method, path, payload = ENDPOINTS[endpoint]
+    body = json.dumps(payload) if payload else None
+    headers = {"Content-Type": "application/json"} if payload else {}
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+    
+    def worker():
+        local, failed = [], 0
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                if response.status >= 500:
+                    failed += 1
+                else:
+                    local.append(time.perf_counter() - started)
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+    
+    threads = [threading.Thread(target=worker) for _ in range(connections)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    
+    latencies.sort()
+    def percentile(q):
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000 if latencies else 0.0
+    
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(0.50),
+        "p99_ms": percentile(0.99),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare WSGI and ASGI serving under concurrent connections")
+    parser.add_argument("--endpoint", choices=sorted(ENDPOINTS), default="login")
+    parser.add_argument("--connections", default="1,10,50,200",
+                        help="Comma-separated concurrent connection counts")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per run")
+    parser.add_argument("--servers", default="wsgi,asgi")
+    args = parser.parse_args()
+    
+    env = dict(os.environ)
+    env["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    
+    print(f"{'server':<6} {'conns':>6} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for kind in args.servers.split(","):
+        port = free_port()
+        process = start_server(kind, port, env)
+        try:
+            for connections in (int(value) for value in args.connections.split(",")):
+                result = run_load(port, args.endpoint, connections, args.duration)
+                print(f"{kind:<6} {connections:>6} {result['requests']:>9} {result['errors']:>7} "
+                      f"{result['rps']:>9.1f} {result['p50_ms']:>9.1f} {result['p99_ms']:>9.1f}")
+        finally:
+            process.terminate()
+            process.wait()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
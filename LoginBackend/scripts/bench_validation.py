@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+import argparse
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from src.api.v1.schemas.auth_schemas import (
+    LoginRequest, RegisterRequest, TokenResponse, LOGIN_VALIDATOR, REGISTER_VALIDATOR
+)
+from src.domain.value_objects.email import Email
+from src.domain.value_objects.password import Password
+
+LOGIN_BODY = {"email": "user@example.com", "password": "Password123", "role": "user", "remember_me": False}
+REGISTER_BODY = {"email": "new.user@example.com", "password": "Password123", "username": "New User"}
+USER = {"id": 1, "email": "user@example.com", "username": "Regular User", "role": "user"}
+
+# Validation and response building only; bcrypt and the database are left out
+# so the numbers show the per-request overhead that was replaced
+def old_login():
+    data = LoginRequest(**LOGIN_BODY)
+    return TokenResponse(access_token="a", refresh_token="r", expires_in=1440, user=USER).dict(), data
+
+def new_login():
+    data = LOGIN_VALIDATOR.validate(LOGIN_BODY)
+    return {"access_token": "a", "refresh_token": "r", "token_type": "bearer",
+            "expires_in": 1440, "user": dict(USER)}, data
+
+def old_register():
+    data = RegisterRequest(**REGISTER_BODY)
+    Email(value=data.email)
+    Password(value=data.password)
+    return TokenResponse(access_token="a", expires_in=1440, user=USER).dict()
+
+def new_register():
+    data = REGISTER_VALIDATOR.validate(REGISTER_BODY)
+    return {"access_token": "a", "refresh_token": None, "token_type": "bearer",
+            "expires_in": 1440, "user": dict(USER)}, data
+
+def measure(fn, iterations):
+    fn()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description="pydantic models vs precompiled request validators")
+    parser.add_argument("--iterations", type=int, default=50000)
+    args = parser.parse_args()
+    
+    print(f"{'endpoint':<10} {'pydantic us':>12} {'validator us':>13} {'speedup':>8}")
+    for name, old, new in (("login", old_login, new_login), ("register", old_register, new_register)):
+        old_us = measure(old, args.iterations)
+        new_us = measure(new, args.iterations)
+        print(f"{name:<10} {old_us:>12.2f} {new_us:>13.2f} {old_us / new_us:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
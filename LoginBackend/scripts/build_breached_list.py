@@ -0,0 +1,84 @@
+import os
+import sys
+import heapq
+import hashlib
+import argparse
+import tempfile
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from src.infrastructure.services.breached_passwords import DIGEST_SIZE, BreachedPasswordList
+
+# Builds the sorted digest file read by BreachedPasswordList. Input is either
+# the Have I Been Pwned SHA-1 dump ("HEX:count" per line) or, with
+# --plaintext, one password per line. Digests are sorted in fixed-size chunks
+# spilled to temp files and merged, so memory stays bounded for any input size.
+
+def read_digests(path, plaintext):
+    with open(path, 'r', encoding='utf-8', errors='replace') as source:
+        for line in source:
+            line = line.rstrip('\r\n')
+            if not line:
+                continue
+            if plaintext:
+                yield hashlib.sha1(line.encode('utf-8')).digest()
+            else:
+                yield bytes.fromhex(line.split(':', 1)[0].strip())
+
+def read_chunk(path):
+    with open(path, 'rb') as chunk:
+        while True:
+            digest = chunk.read(DIGEST_SIZE)
+            if not digest:
+                return
+            yield digest
+
+def spill(digests, directory):
+    digests.sort()
+    handle, path = tempfile.mkstemp(dir=directory, suffix='.chunk')
+    with os.fdopen(handle, 'wb') as chunk:
+        chunk.write(b''.join(digests))
+    return path
+
+def build(source, output, plaintext=False, chunk_size=1_000_000):
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(output))) as work:
+        chunks, buffer = [], []
+        for digest in read_digests(source, plaintext):
+            buffer.append(digest)
+            if len(buffer) >= chunk_size:
+                chunks.append(spill(buffer, work))
+                buffer = []
+        if buffer or not chunks:
+            chunks.append(spill(buffer, work))
+        
+        written, previous = 0, None
+        partial = output + '.tmp'
+        with open(partial, 'wb') as target:
+            for digest in heapq.merge(*(read_chunk(path) for path in chunks)):
+                if digest != previous:
+                    target.write(digest)
+                    written += 1
+                    previous = digest
+        os.replace(partial, output)
+    return written
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the breached-password digest file")
+    parser.add_argument("source", help="HIBP SHA-1 dump or, with --plaintext, a password list")
+    parser.add_argument("output", help="Path to write; point BREACHED_PASSWORDS_PATH at it")
+    parser.add_argument("--plaintext", action="store_true", help="Source holds one password per line")
+    parser.add_argument("--chunk-size", type=int, default=1_000_000, help="Digests sorted in memory at once")
+    args = parser.parse_args()
+    
+    count = build(args.source, args.output, args.plaintext, args.chunk_size)
+    print(f"Wrote {count} digests ({count * DIGEST_SIZE / 1_048_576:.1f} MB) to {args.output}")
+    
+    breached = BreachedPasswordList(args.output)
+    try:
+        assert len(breached) == count
+    finally:
+        breached.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import os
+import sys
+import json
+import argparse
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+def load_entries(path):
+    from src.application.use_cases.bulk_register_users import parse_user_csv
+    
+    with open(path, encoding="utf-8") as f:
+        content = f.read()
+    
+    if path.lower().endswith(".csv"):
+        return parse_user_csv(content)
+    
+    data = json.loads(content)
+    return data.get("users", []) if isinstance(data, dict) else data
+
+def import_users(path, role, workers):
+    from src.api.app import create_app
+    from src.api.container import get_container
+    from src.domain.entities.user import UserRole
+    from src.application.use_cases.bulk_register_users import (
+        BulkRegisterUsersUseCase, BulkRegisterUsersRequest
+    )
+    
+    if not os.path.exists(path):
+        print("Input file not found:", path)
+        return False
+    
+    entries = load_entries(path)
+    app = create_app()
+    
+    with app.app_context():
+        container = get_container()
+        use_case = BulkRegisterUsersUseCase(
+            container.user_repository, container.auth_service, hash_workers=workers
+        )
+        result = use_case.execute(BulkRegisterUsersRequest(
+            entries=entries,
+            default_role=UserRole(role)
+        ))
+    
+    if not result.success:
+        print(f"Import failed: {result.error_message}")
+        return False
+    
+    for error in result.errors:
+        print(f"Row {error['index']} ({error['email']}): {error['error']}")
+    for email in result.skipped:
+        print(f"Skipped existing account: {email}")
+    
+    print(f"Created {len(result.created)} of {len(entries)} accounts "
+          f"in {result.elapsed_seconds:.2f}s ({result.accounts_per_second:.1f} accounts/sec)")
+    return not result.errors
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-create staff accounts from a JSON or CSV file")
+    parser.add_argument("path", help="JSON list of users or CSV with email,password,username,role columns")
+    parser.add_argument("--role", default="restaurant_staff", choices=["restaurant_staff", "admin"],
+                        help="Role for rows that do not set one")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Password hashing threads (default: CPU count)")
+    args = parser.parse_args()
+    
+    success = import_users(args.path, args.role, args.workers)
+    sys.exit(0 if success else 1)
\ No newline at end of file
@@ -0,0 +1,131 @@
+import json
+import time
+import base64
+import hashlib
+import secrets
+import argparse
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+# Local stand-in OpenID Connect provider for trying the social-login flow
+# without real Google credentials. /authorize approves immediately as the
+# configured identity. Every discovery and JWKS fetch is logged, which shows
+# whether the backend is serving them from its cache.
+#
+#   python scripts/oidc_stub_provider.py --port 9000
+#   GOOGLE_OIDC_ISSUER=http://127.0.0.1:9000 GOOGLE_CLIENT_ID=local-client python run.py
+#   open http://localhost:5000/api/v1/auth/oauth/google/authorize
+
+class StubProvider:
+    
+    def __init__(self, issuer, client_id, sub, email, name):
+        self.issuer = issuer
+        self.client_id = client_id
+        self.identity = {'sub': sub, 'email': email, 'email_verified': True, 'name': name}
+        self.rotate_key()
+        self.codes = {}
+        self.hits = {'discovery': 0, 'jwks': 0, 'token': 0}
+    
+    def rotate_key(self):
+        # New signing key under a new kid; the old one leaves the JWKS at once
+        self.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.kid = secrets.token_hex(4)
+    
+    def discovery(self):
+        return {
+            'issuer': self.issuer,
+            'authorization_endpoint': f'{self.issuer}/authorize',
+            'token_endpoint': f'{self.issuer}/token',
+            'jwks_uri': f'{self.issuer}/jwks',
+            'id_token_signing_alg_values_supported': ['RS256'],
+        }
+    
+    def jwks(self):
+        key = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(self.private_key.public_key()))
+        key.update({'kid': self.kid, 'use': 'sig', 'alg': 'RS256'})
+        return {'keys': [key]}
+    
+    def authorize(self, params):
+        code = secrets.token_urlsafe(16)
+        self.codes[code] = params
+        query = urllib.parse.urlencode({'code': code, 'state': params['state']})
+        return f"{params['redirect_uri']}?{query}"
+    
+    def token(self, form):
+        params = self.codes.pop(form.get('code'), None)
+        if params is None or form.get('client_id') != self.client_id:
+            return 400, {'error': 'invalid_grant'}
+        challenge = base64.urlsafe_b64encode(
+            hashlib.sha256(form.get('code_verifier', '').encode()).digest()
+        ).rstrip(b'=').decode()
+        if challenge != params.get('code_challenge'):
+            return 400, {'error': 'invalid_grant', 'error_description': 'PKCE verification failed'}
+        now = int(time.time())
+        claims = dict(self.identity, iss=self.issuer, aud=self.client_id, iat=now, exp=now + 300,
+                      nonce=params.get('nonce'))
+        id_token = jwt.encode(claims, self.private_key, algorithm='RS256', headers={'kid': self.kid})
+        return 200, {'id_token': id_token, 'access_token': secrets.token_urlsafe(16), 'token_type': 'Bearer'}
+
+def make_handler(provider):
+    class Handler(BaseHTTPRequestHandler):
+        
+        def _json(self, status, body):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        
+        def do_GET(self):
+            url = urllib.parse.urlparse(self.path)
+            if url.path == '/.well-known/openid-configuration':
+                provider.hits['discovery'] += 1
+                self._json(200, provider.discovery())
+            elif url.path == '/jwks':
+                provider.hits['jwks'] += 1
+                self._json(200, provider.jwks())
+            elif url.path == '/authorize':
+                params = dict(urllib.parse.parse_qsl(url.query))
+                self.send_response(302)
+                self.send_header('Location', provider.authorize(params))
+                self.end_headers()
+            else:
+                self._json(404, {'error': 'not_found'})
+        
+        def do_POST(self):
+            if urllib.parse.urlparse(self.path).path != '/token':
+                self._json(404, {'error': 'not_found'})
+                return
+            provider.hits['token'] += 1
+            length = int(self.headers.get('Content-Length', 0))
+            form = dict(urllib.parse.parse_qsl(self.rfile.read(length).decode()))
+            self._json(*provider.token(form))
+        
+        def log_message(self, format, *args):
+            print(f"{self.command} {self.path.split('?', 1)[0]} hits={provider.hits}", flush=True)
+    
+    return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in OpenID Connect provider")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--client-id", default="local-client")
+    parser.add_argument("--sub", default="stub-user-1")
+    parser.add_argument("--email", default="social.user@example.com")
+    parser.add_argument("--name", default="Social User")
+    args = parser.parse_args()
+    
+    issuer = f"http://127.0.0.1:{args.port}"
+    provider = StubProvider(issuer, args.client_id, args.sub, args.email, args.name)
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(provider))
+    print(f"Stub OIDC provider at {issuer} (client id {args.client_id})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
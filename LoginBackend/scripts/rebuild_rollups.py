@@ -0,0 +1,31 @@
+import os
+import sys
+import argparse
+from datetime import datetime
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+def parse_day(value):
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+def rebuild(first_day, last_day):
+    from src.api.app import create_app
+    from src.api.container import get_container
+    from src.infrastructure.database.rollups import rebuild_rollups
+    
+    app = create_app()
+    
+    with app.app_context():
+        batches = rebuild_rollups(get_container().order_archive, first_day, last_day)
+    
+    print(f"Rebuilt order rollups in {batches} batch(es)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Recompute the hourly and daily order rollups from the orders table and its archive"
+    )
+    parser.add_argument("--from", dest="first_day", type=parse_day, help="First day (YYYY-MM-DD), default oldest order")
+    parser.add_argument("--to", dest="last_day", type=parse_day, help="Last day (YYYY-MM-DD), default newest order")
+    args = parser.parse_args()
+    rebuild(args.first_day, args.last_day)
\ No newline at end of file
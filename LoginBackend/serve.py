@@ -0,0 +1,65 @@
+import argparse
+from gunicorn.app.base import BaseApplication
+from src.infrastructure.config.settings import settings
+
+class ProductionServer(BaseApplication):
+    
+    def __init__(self, options):
+        self.options = options
+        super().__init__()
+    
+    def load_config(self):
+        for key, value in self.options.items():
+            if value is not None and key in self.cfg.settings:
+                self.cfg.set(key, value)
+    
+    def load(self):
+        from src.api.app import create_app
+        from src.infrastructure.database.session import db
+        
+        app = create_app()
+        
+        # create_app runs migrations and seeding in the master; close those
+        # connections so forked workers never share a database handle
+        with app.app_context():
+            db.engine.dispose()
+        
+        return app
+
+def build_options(args):
+    return {
+        'bind': args.bind,
+        'workers': args.workers,
+        'threads': args.threads,
+        'worker_class': 'gthread' if args.threads > 1 else 'sync',
+        'preload_app': not args.no_preload,
+        'max_requests': args.max_requests,
+        'max_requests_jitter': args.max_requests_jitter,
+        'timeout': args.timeout,
+        'graceful_timeout': args.graceful_timeout,
+        'pidfile': args.pidfile,
+        'accesslog': '-' if args.access_log else None,
+        'errorlog': '-',
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run the API under gunicorn with pre-forked workers")
+    parser.add_argument('--bind', default=settings.WEB_BIND)
+    parser.add_argument('--workers', type=int, default=settings.WEB_WORKERS)
+    parser.add_argument('--threads', type=int, default=settings.WEB_THREADS)
+    parser.add_argument('--max-requests', type=int, default=settings.WEB_MAX_REQUESTS,
+                        help="Recycle a worker after this many requests (0 disables)")
+    parser.add_argument('--max-requests-jitter', type=int, default=settings.WEB_MAX_REQUESTS_JITTER)
+    parser.add_argument('--timeout', type=int, default=settings.WEB_TIMEOUT)
+    parser.add_argument('--graceful-timeout', type=int, default=settings.WEB_GRACEFUL_TIMEOUT)
+    # With preload, 'kill -HUP' forks new workers from the code already
+    # imported in the master, so it only suits config changes. A code deploy
+    # needs 'kill -USR2' (new master and workers) followed by 'kill -TERM' of
+    # the old master, or --no-preload, under which HUP re-imports the app.
+    parser.add_argument('--pidfile', help="Write the master PID here for 'kill -HUP'/'kill -USR2' reloads")
+    parser.add_argument('--no-preload', action='store_true',
+                        help="Import the app in each worker instead of once in the master "
+                             "(HUP then loads new code)")
+    parser.add_argument('--access-log', action='store_true')
+    
+    ProductionServer(build_options(parser.parse_args())).run()
\ No newline at end of file
@@ -2,8 +2,16 @@ from flask import Flask
 from flask_cors import CORS
 from .v1.routes.auth_routes import auth_bp
 from .v1.routes.kitchen_routes import kitchen_bp
+from .container import Container
 from src.infrastructure.database.session import db
+from src.infrastructure.database.migrations import run_migrations
 from src.infrastructure.config.settings import settings
+from src.infrastructure.services.breached_passwords import BreachedPasswordList
+from src.infrastructure.services.bcrypt_service import BcryptService
+from src.infrastructure.services.argon2_service import Argon2Service
+from src.infrastructure.services.password_hashers import PasswordHashers
+from src.infrastructure.services.startup_lock import startup_lock
+from src.domain.value_objects.password_policy import PasswordPolicy, configure_password_policy
 import datetime
 
 def create_app():
@@ -13,7 +21,42 @@ def create_app():
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     app.config['SECRET_KEY'] = settings.JWT_SECRET_KEY
     
+    configure_password_policy(PasswordPolicy(
+        min_length=settings.PASSWORD_MIN_LENGTH,
+        require_digit=settings.PASSWORD_REQUIRE_DIGIT,
+        require_letter=settings.PASSWORD_REQUIRE_LETTER,
+        require_upper=settings.PASSWORD_REQUIRE_UPPER,
+        require_lower=settings.PASSWORD_REQUIRE_LOWER,
+        require_symbol=settings.PASSWORD_REQUIRE_SYMBOL,
+        breached_passwords=(
+            BreachedPasswordList(settings.BREACHED_PASSWORDS_PATH)
+            if settings.BREACHED_PASSWORDS_PATH else None
+        )
+    ))
+    
+    # One process calibrates while the others wait and then read its result
+    with startup_lock(settings.STARTUP_LOCK_PATH):
+        rounds = BcryptService.configure(
+            rounds=settings.BCRYPT_ROUNDS,
+            target_ms=settings.BCRYPT_TARGET_MS,
+            min_rounds=settings.BCRYPT_MIN_ROUNDS,
+            max_rounds=settings.BCRYPT_MAX_ROUNDS,
+            calibration_path=settings.BCRYPT_CALIBRATION_PATH
+        )
+    PasswordHashers.configure(settings.PASSWORD_HASHER)
+    if settings.PASSWORD_HASHER == 'argon2id':
+        Argon2Service.configure(
+            time_cost=settings.ARGON2_TIME_COST,
+            memory_cost=settings.ARGON2_MEMORY_COST_KIB,
+            parallelism=settings.ARGON2_PARALLELISM
+        )
+        print(f"Password hasher: argon2id (t={settings.ARGON2_TIME_COST}, "
+              f"m={settings.ARGON2_MEMORY_COST_KIB} KiB, p={settings.ARGON2_PARALLELISM})")
+    else:
+        print(f"Password hasher: bcrypt (work factor {rounds})")
+    
     db.init_app(app)
+    Container().init_app(app)
     
     CORS(app, 
          resources={r"/api/*": {"origins": settings.FRONTEND_URL}},
@@ -23,12 +66,17 @@ def create_app():
     app.register_blueprint(auth_bp)
     app.register_blueprint(kitchen_bp)
     
-    with app.app_context():
+    # Workers started together would otherwise race to create tables, run
+    # migrations and insert the test users twice
+    with app.app_context(), startup_lock(settings.STARTUP_LOCK_PATH):
         db.create_all()
+        run_migrations(app.extensions['container'].order_archive)
+        # Built before workers fork (serve.py preloads), so they start warm
+        app.extensions['container'].prep_list.rebuild()
+        app.extensions['container'].prep_times.sync()
         print(f"Database initialized at: {settings.DATABASE_PATH}")
         
         from src.infrastructure.database.models import UserModel
-        from src.infrastructure.services.bcrypt_service import BcryptService
         
         if UserModel.query.count() == 0:
             print("Creating initial test users...")
@@ -57,7 +105,7 @@ def create_app():
             ]
             
             for user_data in test_users:
-                hashed_password = BcryptService.hash_password(user_data['password'])
+                hashed_password = PasswordHashers.hash_password(user_data['password'])
                 new_user = UserModel(
                     email=user_data['email'],
                     username=user_data['username'],
@@ -0,0 +1,68 @@
+from flask import current_app
+from ..application.use_cases.login_with_role import LoginWithRoleUseCase
+from ..application.use_cases.register_user import RegisterUserUseCase
+from ..application.use_cases.login_guest import LoginGuestUseCase
+from ..application.use_cases.bulk_register_users import BulkRegisterUsersUseCase
+from ..application.use_cases.social_login import LoginSocialUseCase
+from ..application.use_cases.change_password import ChangePasswordUseCase
+from ..application.use_cases.deactivate_user import DeactivateUserUseCase
+from ..application.use_cases.logout_everywhere import LogoutEverywhereUseCase
+from ..infrastructure.repositories.user_repositories_impl import UserRepositoryImpl
+from ..infrastructure.services.jwt_service import JWTService
+from ..infrastructure.services.oidc_service import build_oidc_clients
+from ..infrastructure.cache.token_epochs import TokenEpochCache
+from ..infrastructure.cache.prep_list import PrepList
+from ..infrastructure.cache.prep_times import PrepTimeStats
+from ..infrastructure.archive.order_archive import OrderArchive
+from ..infrastructure.config.settings import settings
+from .v1.controllers.auth_controller import AuthController
+
+# Built once per app in create_app. Everything here is stateless (the
+# repository goes through Flask-SQLAlchemy's per-request session), so one
+# instance is shared by all requests and threads.
+class Container:
+    
+    def __init__(self):
+        self.user_repository = UserRepositoryImpl()
+        self.auth_service = JWTService()
+        # Holds each provider's cached discovery document and JWKS for the
+        # lifetime of the process
+        self.oidc_clients = build_oidc_clients(settings)
+        self.token_epochs = TokenEpochCache(self.user_repository, ttl=settings.TOKEN_EPOCH_TTL_SECONDS)
+        self.prep_list = PrepList()
+        self.prep_times = PrepTimeStats(
+            window_days=settings.PREP_TIMES_WINDOW_DAYS,
+            relative_accuracy=settings.PREP_TIMES_RELATIVE_ACCURACY
+        )
+        self.order_archive = OrderArchive(
+            settings.ARCHIVE_DIR,
+            retention_days=settings.ARCHIVE_RETENTION_DAYS,
+            batch_size=settings.ARCHIVE_BATCH_SIZE,
+            compression=settings.ARCHIVE_COMPRESSION
+        )
+        
+        self.login_use_case = LoginWithRoleUseCase(self.user_repository, self.auth_service)
+        self.register_use_case = RegisterUserUseCase(self.user_repository, self.auth_service)
+        self.login_guest_use_case = LoginGuestUseCase(self.user_repository, self.auth_service)
+        self.bulk_register_use_case = BulkRegisterUsersUseCase(self.user_repository, self.auth_service)
+        self.login_social_use_case = LoginSocialUseCase(self.user_repository, self.auth_service)
+        self.change_password_use_case = ChangePasswordUseCase(self.user_repository, self.auth_service)
+        self.deactivate_user_use_case = DeactivateUserUseCase(self.user_repository)
+        self.logout_everywhere_use_case = LogoutEverywhereUseCase(self.user_repository)
+        
+        self.auth_controller = AuthController(
+            user_repository=self.user_repository,
+            auth_service=self.auth_service,
+            login_use_case=self.login_use_case,
+            register_use_case=self.register_use_case,
+            login_guest_use_case=self.login_guest_use_case,
+            login_social_use_case=self.login_social_use_case,
+            oidc_clients=self.oidc_clients,
+            token_epochs=self.token_epochs
+        )
+    
+    def init_app(self, app):
+        app.extensions['container'] = self
+
+def get_container() -> Container:
+    return current_app.extensions['container']
\ No newline at end of file
@@ -1,6 +1,7 @@
 from functools import wraps
 from flask import request, jsonify
-from src.infrastructure.services.jwt_service import JWTService
+from src.api.container import get_container
+from src.domain.entities.permission import Permission, permissions_for_role, permission_names
 
 def token_required(f):
     @wraps(f)
@@ -15,14 +16,20 @@ def token_required(f):
         if not token:
             return jsonify({'error': 'Token is missing'}), 401
         
-        auth_service = JWTService()
-        payload = auth_service.verify_token(token)
+        container = get_container()
+        payload = container.auth_service.verify_token(token)
         
-        if not payload:
+        if not payload or payload.get('type') != 'access':
             return jsonify({'error': 'Token is invalid or expired'}), 401
         
+        if not container.token_epochs.is_current(int(payload['sub']), payload.get('ep', 0)):
+            return jsonify({'error': 'Token has been revoked'}), 401
+        
         request.user_id = int(payload['sub'])
         request.user_role = payload['role']
+        # Tokens issued before permissions were embedded only carry the role
+        perms = payload.get('perms')
+        request.permissions = perms if isinstance(perms, int) else permissions_for_role(request.user_role)
         request.is_guest = payload.get('is_guest', False)
         
         return f(*args, **kwargs)
@@ -41,4 +48,24 @@ def roles_required(*roles):
                 }), 403
             return f(*args, **kwargs)
         return decorated
+    return wrapper
+
+def permissions_required(*permissions: Permission):
+    required = 0
+    for permission in permissions:
+        required |= permission
+    required = int(required)
+    names = permission_names(required)
+    
+    def wrapper(f):
+        @wraps(f)
+        @token_required
+        def decorated(*args, **kwargs):
+            if request.permissions & required != required:
+                return jsonify({
+                    'error': 'Forbidden',
+                    'message': f'Required permissions: {names}'
+                }), 403
+            return f(*args, **kwargs)
+        return decorated
     return wrapper
\ No newline at end of file
@@ -1,142 +1,157 @@
-from flask import jsonify, request
-from typing import Dict, Any
-import json
+from flask import jsonify, request, redirect, session, current_app
+from functools import lru_cache
+from typing import Dict, Any, Optional
+import hmac
 from ....application.use_cases.login_with_role import LoginWithRoleUseCase, LoginWithRoleRequest
 from ....application.use_cases.register_user import RegisterUserUseCase, RegisterUserRequest
 from ....application.use_cases.login_guest import LoginGuestUseCase
-from ....infrastructure.repositories.user_repositories_impl import UserRepositoryImpl
-from ....infrastructure.services.jwt_service import JWTService
-from ....domain.entities.user import UserRole
+from ....application.use_cases.social_login import LoginSocialUseCase, SocialLoginRequest
+from ....application.interfaces.auth_service import AuthService
+from ....domain.repositories.user_repository import UserRepository
+from ....domain.entities.user import UserRole, AuthProvider
+from ....domain.entities.permission import Permission, permissions_for_role
+from ....infrastructure.config.settings import settings
+from ....infrastructure.services.oidc_service import OIDCClient, OIDCError
+from ....infrastructure.cache.token_epochs import TokenEpochCache
 from ..schemas.auth_schemas import (
-    LoginRequest, RegisterRequest, TokenResponse, 
-    UserResponse, ErrorResponse, UserRole as SchemaUserRole
+    LOGIN_VALIDATOR, REGISTER_VALIDATOR,
+    TokenResponse, UserResponse, ErrorResponse, UserRole as SchemaUserRole
 )
+from ..schemas.request_validators import RequestValidationError
+
+ROLE_MAPPING = {
+    SchemaUserRole.USER: UserRole.USER,
+    SchemaUserRole.ADMIN: UserRole.ADMIN,
+    SchemaUserRole.RESTAURANT_STAFF: UserRole.RESTAURANT_STAFF,
+    SchemaUserRole.GUEST: UserRole.GUEST
+}
+
+# login and register build plain dicts with the same shape as ErrorResponse and
+# TokenResponse instead of constructing pydantic models on every request
+def _error_body(error: str, message: str, details: Optional[dict] = None) -> Dict[str, Any]:
+    return {"error": error, "message": message, "details": details}
+
+# Tokens accepted by one /introspect call
+MAX_INTROSPECT_BATCH = 1000
+
+# Claims copied into an RFC 7662 introspection response
+_INTROSPECTED_CLAIMS = ('sub', 'role', 'perms', 'is_guest', 'exp', 'iat')
+
+@lru_cache(maxsize=256)
+def _permission_mask(names: str) -> int:
+    mask = 0
+    for name in filter(None, (part.strip() for part in names.split(','))):
+        mask |= Permission[name.upper()]
+    return int(mask)
+
+def _user_body(user) -> Dict[str, Any]:
+    return {
+        "id": user.id,
+        "email": user.email,
+        "username": user.username,
+        "role": user.role.value
+    }
 
 class AuthController:
     
-    @staticmethod
-    def login() -> Dict[str, Any]:
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        auth_service: AuthService,
+        login_use_case: LoginWithRoleUseCase,
+        register_use_case: RegisterUserUseCase,
+        login_guest_use_case: LoginGuestUseCase,
+        login_social_use_case: LoginSocialUseCase,
+        oidc_clients: Dict[str, OIDCClient],
+        token_epochs: TokenEpochCache
+    ):
+        self.user_repository = user_repository
+        self.auth_service = auth_service
+        self.login_use_case = login_use_case
+        self.register_use_case = register_use_case
+        self.login_guest_use_case = login_guest_use_case
+        self.login_social_use_case = login_social_use_case
+        self.oidc_clients = oidc_clients
+        self.token_epochs = token_epochs
+    
+    def login(self, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         try:
-            login_data = LoginRequest(**request.get_json())
-            
-            user_repo = UserRepositoryImpl()
-            auth_service = JWTService()
-            
-            role_mapping = {
-                SchemaUserRole.USER: UserRole.USER,
-                SchemaUserRole.ADMIN: UserRole.ADMIN,
-                SchemaUserRole.RESTAURANT_STAFF: UserRole.RESTAURANT_STAFF,
-                SchemaUserRole.GUEST: UserRole.GUEST
-            }
-            
-            domain_role = role_mapping[login_data.role]
+            login_data = LOGIN_VALIDATOR.validate(
+                request.get_json(silent=True) if data is None else data
+            )
             
-            use_case = LoginWithRoleUseCase(user_repo, auth_service)
             request_data = LoginWithRoleRequest(
-                email=login_data.email,
-                password=login_data.password,
-                role=domain_role,
-                remember_me=login_data.remember_me
+                email=login_data['email'],
+                password=login_data['password'],
+                role=ROLE_MAPPING[login_data['role']],
+                remember_me=login_data['remember_me']
             )
             
-            result = use_case.execute(request_data)
+            result = self.login_use_case.execute(request_data)
             
             if not result.success:
-                return jsonify(ErrorResponse(
-                    error="authentication_failed",
-                    message=result.error_message
-                ).dict()), 401
-            
-            token_response = TokenResponse(
-                access_token=result.access_token,
-                refresh_token=result.refresh_token,
-                expires_in=1440 if not login_data.remember_me else 10080,
-                user={
-                    "id": result.user.id,
-                    "email": result.user.email,
-                    "username": result.user.username,
-                    "role": result.user.role.value
-                }
-            )
-            
-            return jsonify(token_response.dict()), 200
-            
+                return jsonify(_error_body("authentication_failed", result.error_message)), 401
+            
+            return jsonify({
+                "access_token": result.access_token,
+                "refresh_token": result.refresh_token,
+                "token_type": "bearer",
+                "expires_in": 1440 if not login_data['remember_me'] else 10080,
+                "user": _user_body(result.user)
+            }), 200
+            
+        except RequestValidationError as e:
+            return jsonify(_error_body("validation_error", str(e), e.errors)), 400
         except Exception as e:
-            return jsonify(ErrorResponse(
-                error="server_error",
-                message=str(e)
-            ).dict()), 500
+            return jsonify(_error_body("server_error", str(e))), 500
     
-    @staticmethod
-    def register() -> Dict[str, Any]:
+    def register(self) -> Dict[str, Any]:
         try:
-            register_data = RegisterRequest(**request.get_json())
+            register_data = REGISTER_VALIDATOR.validate(request.get_json(silent=True))
             
-            user_repo = UserRepositoryImpl()
-            auth_service = JWTService()
-            
-            role_mapping = {
-                SchemaUserRole.USER: UserRole.USER,
-                SchemaUserRole.ADMIN: UserRole.ADMIN,
-                SchemaUserRole.RESTAURANT_STAFF: UserRole.RESTAURANT_STAFF,
-                SchemaUserRole.GUEST: UserRole.GUEST
-            }
-            
-            domain_role = role_mapping[register_data.role]
+            domain_role = ROLE_MAPPING[register_data['role']]
             
             # IMPORTANT: Customers can only register as USER
             # Even if they try to register as ADMIN or RESTAURANT_STAFF,
             # they will be registered as USER
             if domain_role != UserRole.USER:
-                return jsonify(ErrorResponse(
-                    error="registration_failed",
-                    message="Customers can only register as regular users"
-                ).dict()), 400
+                return jsonify(_error_body(
+                    "registration_failed",
+                    "Customers can only register as regular users"
+                )), 400
             
-            use_case = RegisterUserUseCase(user_repo, auth_service)
+            # Email and password were fully checked above, so the use case
+            # skips building the Email and Password value objects again
             request_data = RegisterUserRequest(
-                email=register_data.email,
-                password=register_data.password,
-                username=register_data.username,
+                email=register_data['email'].lower(),
+                password=register_data['password'],
+                username=register_data['username'],
                 role=UserRole.USER,  # Force USER role for customer registration
-                register_as_customer=True
+                register_as_customer=True,
+                validated=True
             )
             
-            result = use_case.execute(request_data)
+            result = self.register_use_case.execute(request_data)
             
             if not result.success:
-                return jsonify(ErrorResponse(
-                    error="registration_failed",
-                    message=result.error_message
-                ).dict()), 400
-            
-            token_response = TokenResponse(
-                access_token=result.access_token,
-                expires_in=1440,
-                user={
-                    "id": result.user.id,
-                    "email": result.user.email,
-                    "username": result.user.username,
-                    "role": result.user.role.value
-                }
-            )
-            
-            return jsonify(token_response.dict()), 201
-            
+                return jsonify(_error_body("registration_failed", result.error_message)), 400
+            
+            return jsonify({
+                "access_token": result.access_token,
+                "refresh_token": None,
+                "token_type": "bearer",
+                "expires_in": 1440,
+                "user": _user_body(result.user)
+            }), 201
+            
+        except RequestValidationError as e:
+            return jsonify(_error_body("validation_error", str(e), e.errors)), 400
         except Exception as e:
-            return jsonify(ErrorResponse(
-                error="server_error",
-                message=str(e)
-            ).dict()), 500
+            return jsonify(_error_body("server_error", str(e))), 500
     
-    @staticmethod
-    def login_as_guest() -> Dict[str, Any]:
+    def login_as_guest(self) -> Dict[str, Any]:
         try:
-            user_repo = UserRepositoryImpl()
-            auth_service = JWTService()
-            
-            use_case = LoginGuestUseCase(user_repo, auth_service)
-            result = use_case.execute()
+            result = self.login_guest_use_case.execute()
             
             if not result.success:
                 return jsonify(ErrorResponse(
@@ -164,8 +179,61 @@ class AuthController:
                 message=str(e)
             ).dict()), 500
     
-    @staticmethod
-    def get_current_user() -> Dict[str, Any]:
+    def oauth_authorize(self, provider: str):
+        client = self.oidc_clients.get(provider)
+        if client is None:
+            return jsonify(_error_body("unknown_provider", f"Social login with {provider} is not enabled")), 404
+        
+        try:
+            login_state = client.new_login_state()
+            url = client.authorization_url(login_state)
+        except OIDCError as e:
+            return jsonify(_error_body("provider_unavailable", str(e))), 502
+        
+        session[f'oauth_{provider}'] = login_state
+        return redirect(url)
+    
+    def oauth_callback(self, provider: str) -> Dict[str, Any]:
+        client = self.oidc_clients.get(provider)
+        if client is None:
+            return jsonify(_error_body("unknown_provider", f"Social login with {provider} is not enabled")), 404
+        
+        login_state = session.pop(f'oauth_{provider}', None)
+        if 'error' in request.args:
+            return jsonify(_error_body("authentication_failed", request.args.get('error_description') or request.args['error'])), 401
+        if not login_state or request.args.get('state') != login_state['state'] or not request.args.get('code'):
+            return jsonify(_error_body("invalid_state", "Login session expired or state mismatch, start again")), 400
+        
+        try:
+            id_token = client.exchange_code(request.args['code'], login_state['code_verifier'])
+            claims = client.verify_id_token(id_token, login_state['nonce'])
+        except OIDCError as e:
+            return jsonify(_error_body("authentication_failed", str(e))), 401
+        
+        try:
+            result = self.login_social_use_case.execute(SocialLoginRequest(
+                provider=AuthProvider(provider),
+                provider_id=claims['sub'],
+                email=claims.get('email', ''),
+                email_verified=claims.get('email_verified') is True,
+                username=claims.get('name')
+            ))
+            
+            if not result.success:
+                return jsonify(_error_body("authentication_failed", result.error_message)), 401
+            
+            return jsonify({
+                "access_token": result.access_token,
+                "refresh_token": result.refresh_token,
+                "token_type": "bearer",
+                "expires_in": 1440,
+                "user": _user_body(result.user)
+            }), 201 if result.created else 200
+            
+        except Exception as e:
+            return jsonify(_error_body("server_error", str(e))), 500
+    
+    def get_current_user(self) -> Dict[str, Any]:
         try:
             auth_header = request.headers.get('Authorization')
             if not auth_header or not auth_header.startswith('Bearer '):
@@ -175,8 +243,7 @@ class AuthController:
                 ).dict()), 401
             
             token = auth_header.split(' ')[1]
-            auth_service = JWTService()
-            payload = auth_service.verify_token(token)
+            payload = self.auth_service.verify_token(token)
             
             if not payload:
                 return jsonify(ErrorResponse(
@@ -184,8 +251,7 @@ class AuthController:
                     message="Invalid token"
                 ).dict()), 401
             
-            user_repo = UserRepositoryImpl()
-            user = user_repo.find_by_id(int(payload['sub']))
+            user = self.user_repository.find_by_id(int(payload['sub']))
             
             if not user:
                 return jsonify(ErrorResponse(
@@ -210,8 +276,94 @@ class AuthController:
                 message=str(e)
             ).dict()), 500
     
-    @staticmethod
-    def quick_login() -> Dict[str, Any]:
+    # /introspect and /verify only decode the JWT: no pydantic models and no
+    # database access, so gateways can call them on every proxied request
+    def _introspect_token(self, token: Any) -> Dict[str, Any]:
+        payload = self.auth_service.verify_token(token) if isinstance(token, str) and token else None
+        if not payload or not self.token_epochs.is_current(int(payload['sub']), payload.get('ep', 0)):
+            return {"active": False}
+        result = {"active": True, "token_type": payload.get('type', 'access')}
+        for claim in _INTROSPECTED_CLAIMS:
+            if claim in payload:
+                result[claim] = payload[claim]
+        if result['token_type'] == 'access' and 'perms' not in result:
+            result['perms'] = permissions_for_role(payload.get('role', ''))
+        return result
+    
+    def _may_introspect(self) -> bool:
+        # RFC 7662 section 2.1: callers must be authorized, either as a
+        # gateway holding the shared secret or with an admin access token
+        supplied = request.headers.get('Authorization', '')
+        if settings.INTROSPECTION_SECRET and hmac.compare_digest(
+                supplied.encode(), f'Bearer {settings.INTROSPECTION_SECRET}'.encode()):
+            return True
+        payload = self.auth_service.verify_token(supplied[7:]) if supplied.startswith('Bearer ') else None
+        if (not payload or payload.get('type') != 'access'
+                or not self.token_epochs.is_current(int(payload['sub']), payload.get('ep', 0))):
+            return False
+        perms = payload.get('perms')
+        if not isinstance(perms, int):
+            perms = permissions_for_role(payload.get('role', ''))
+        return bool(perms & Permission.TOKENS_INTROSPECT)
+    
+    def introspect(self) -> Dict[str, Any]:
+        if not self._may_introspect():
+            response = jsonify(_error_body(
+                "unauthorized", "Introspection requires the gateway secret or an admin access token"
+            ))
+            response.headers['WWW-Authenticate'] = 'Bearer'
+            return response, 401
+        
+        data = request.get_json(silent=True) if request.is_json else request.form
+        if not data:
+            return jsonify(_error_body("invalid_request", "Send token or tokens")), 400
+        
+        if 'tokens' in data:
+            tokens = data['tokens']
+            if not isinstance(tokens, list):
+                return jsonify(_error_body("invalid_request", "tokens must be a list")), 400
+            if len(tokens) > MAX_INTROSPECT_BATCH:
+                return jsonify(_error_body(
+                    "invalid_request", f"At most {MAX_INTROSPECT_BATCH} tokens per request"
+                )), 400
+            return jsonify({"results": [self._introspect_token(token) for token in tokens]}), 200
+        
+        return jsonify(self._introspect_token(data.get('token'))), 200
+    
+    def verify(self):
+        # nginx auth_request / Traefik forwardAuth: only the status code and
+        # the X-User-* headers matter, the body stays empty
+        response = current_app.response_class(status=401)
+        auth_header = request.headers.get('Authorization', '')
+        payload = self.auth_service.verify_token(auth_header[7:]) if auth_header.startswith('Bearer ') else None
+        if (not payload or payload.get('type') != 'access'
+                or not self.token_epochs.is_current(int(payload['sub']), payload.get('ep', 0))):
+            response.headers['WWW-Authenticate'] = 'Bearer'
+            return response
+        
+        perms = payload.get('perms')
+        if not isinstance(perms, int):
+            perms = permissions_for_role(payload.get('role', ''))
+        required = request.args.get('permissions')
+        if required:
+            try:
+                mask = _permission_mask(required)
+            except KeyError as e:
+                response.status_code = 400
+                response.headers['X-Auth-Error'] = f'Unknown permission {e}'
+                return response
+            if perms & mask != mask:
+                response.status_code = 403
+                return response
+        
+        response.status_code = 200
+        response.headers['X-User-Id'] = payload['sub']
+        response.headers['X-User-Role'] = payload.get('role', '')
+        response.headers['X-User-Permissions'] = str(perms)
+        response.headers['X-User-Is-Guest'] = 'true' if payload.get('is_guest') else 'false'
+        return response
+    
+    def quick_login(self) -> Dict[str, Any]:
         try:
             data = request.get_json()
             role = data.get('role', 'user')
@@ -224,7 +376,7 @@ class AuthController:
             }
             
             if role == 'guest':
-                return AuthController.login_as_guest()
+                return self.login_as_guest()
             
             if role not in test_accounts:
                 return jsonify(ErrorResponse(
@@ -233,15 +385,14 @@ class AuthController:
                 ).dict()), 400
             
             test_account = test_accounts[role]
-            request._cached_data = json.dumps({
+            
+            return self.login({
                 'email': test_account['email'],
                 'password': test_account['password'],
                 'role': role,
                 'remember_me': False
             })
             
-            return AuthController.login()
-            
         except Exception as e:
             return jsonify(ErrorResponse(
                 error="server_error",
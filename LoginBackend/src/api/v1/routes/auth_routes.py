@@ -1,35 +1,102 @@
-from flask import Blueprint, request, jsonify
-from src.api.v1.controllers.auth_controller import AuthController
-from src.api.middleware.auth_middleware import token_required, roles_required
+from flask import Blueprint, request
+from src.api.container import get_container
+from src.api.middleware.auth_middleware import token_required, roles_required, permissions_required
+from src.application.use_cases.register_user import RegisterUserRequest
+from src.application.use_cases.bulk_register_users import BulkRegisterUsersRequest, parse_user_csv
+from src.application.use_cases.change_password import ChangePasswordRequest
+from src.domain.entities.user import UserRole
+from src.domain.entities.permission import Permission
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/v1/auth')
 
 @auth_bp.route('/login', methods=['POST'])
 def login():
-    return AuthController.login()
+    return get_container().auth_controller.login()
 
 @auth_bp.route('/register', methods=['POST'])
 def register():
-    return AuthController.register()
+    return get_container().auth_controller.register()
 
 @auth_bp.route('/guest', methods=['POST'])
 def login_as_guest():
-    return AuthController.login_as_guest()
+    return get_container().auth_controller.login_as_guest()
 
 @auth_bp.route('/quick-login', methods=['POST'])
 def quick_login():
-    return AuthController.quick_login()
+    return get_container().auth_controller.quick_login()
+
+@auth_bp.route('/oauth/<provider>/authorize', methods=['GET'])
+def oauth_authorize(provider):
+    return get_container().auth_controller.oauth_authorize(provider)
+
+@auth_bp.route('/oauth/<provider>/callback', methods=['GET'])
+def oauth_callback(provider):
+    return get_container().auth_controller.oauth_callback(provider)
+
+@auth_bp.route('/introspect', methods=['POST'])
+def introspect():
+    return get_container().auth_controller.introspect()
+
+@auth_bp.route('/verify', methods=['GET', 'HEAD'])
+def verify():
+    return get_container().auth_controller.verify()
 
 @auth_bp.route('/me', methods=['GET'])
 @token_required
 def get_current_user():
-    return AuthController.get_current_user()
+    return get_container().auth_controller.get_current_user()
 
 @auth_bp.route('/logout', methods=['POST'])
 @token_required
 def logout():
     return {"message": "Logged out successfully"}, 200
 
+@auth_bp.route('/logout-all', methods=['POST'])
+@token_required
+def logout_everywhere():
+    result = get_container().logout_everywhere_use_case.execute(request.user_id)
+    if not result.success:
+        return {"error": result.error_message}, 404
+    get_container().token_epochs.expire()
+    return {"message": "Logged out on all devices"}, 200
+
+@auth_bp.route('/change-password', methods=['POST'])
+@token_required
+def change_password():
+    data = request.get_json(silent=True) or {}
+    current_password = data.get('current_password')
+    new_password = data.get('new_password')
+    
+    if not current_password or not new_password:
+        return {"error": "current_password and new_password are required"}, 400
+    
+    result = get_container().change_password_use_case.execute(ChangePasswordRequest(
+        user_id=request.user_id,
+        current_password=current_password,
+        new_password=new_password
+    ))
+    
+    if not result.success:
+        return {"error": result.error_message}, 400
+    get_container().token_epochs.expire()
+    
+    return {
+        "message": "Password changed; other sessions have been logged out",
+        "access_token": result.access_token,
+        "refresh_token": result.refresh_token,
+        "token_type": "bearer"
+    }, 200
+
+@auth_bp.route('/users/<int:user_id>/deactivate', methods=['POST'])
+@permissions_required(Permission.USERS_DEACTIVATE)
+def deactivate_user(user_id):
+    result = get_container().deactivate_user_use_case.execute(user_id, request.user_id)
+    if not result.success:
+        status = 404 if result.error_message == "User not found" else 400
+        return {"error": result.error_message}, status
+    get_container().token_epochs.expire()
+    return {"message": "User deactivated and signed out", "user_id": user_id}, 200
+
 @auth_bp.route('/admin-only', methods=['GET'])
 @roles_required('admin')
 def admin_only():
@@ -65,13 +132,8 @@ def reset_password(token):
     return {"message": "Password reset successful"}, 200
 
 @auth_bp.route('/create-admin', methods=['POST'])
-@roles_required('admin')
+@permissions_required(Permission.USERS_CREATE_ADMIN)
 def create_admin_account():
-    from ....infrastructure.repositories.user_repositories_impl import UserRepositoryImpl
-    from ....infrastructure.services.jwt_service import JWTService
-    from ....application.use_cases.register_user import RegisterUserUseCase, RegisterUserRequest
-    from ....domain.entities.user import UserRole
-    
     data = request.get_json()
     email = data.get('email')
     password = data.get('password')
@@ -80,10 +142,6 @@ def create_admin_account():
     if not email or not password:
         return {"error": "Email and password are required"}, 400
     
-    user_repo = UserRepositoryImpl()
-    auth_service = JWTService()
-    
-    use_case = RegisterUserUseCase(user_repo, auth_service)
     request_data = RegisterUserRequest(
         email=email,
         password=password,
@@ -92,7 +150,7 @@ def create_admin_account():
         register_as_customer=False
     )
     
-    result = use_case.execute(request_data)
+    result = get_container().register_use_case.execute(request_data)
     
     if not result.success:
         return {"error": result.error_message}, 400
@@ -108,13 +166,8 @@ def create_admin_account():
     }, 201
 
 @auth_bp.route('/create-restaurant-staff', methods=['POST'])
-@roles_required('admin')
+@permissions_required(Permission.USERS_CREATE_STAFF)
 def create_restaurant_staff_account():
-    from ....infrastructure.repositories.user_repositories_impl import UserRepositoryImpl
-    from ....infrastructure.services.jwt_service import JWTService
-    from ....application.use_cases.register_user import RegisterUserUseCase, RegisterUserRequest
-    from ....domain.entities.user import UserRole
-    
     data = request.get_json()
     email = data.get('email')
     password = data.get('password')
@@ -123,10 +176,6 @@ def create_restaurant_staff_account():
     if not email or not password:
         return {"error": "Email and password are required"}, 400
     
-    user_repo = UserRepositoryImpl()
-    auth_service = JWTService()
-    
-    use_case = RegisterUserUseCase(user_repo, auth_service)
     request_data = RegisterUserRequest(
         email=email,
         password=password,
@@ -135,7 +184,7 @@ def create_restaurant_staff_account():
         register_as_customer=False
     )
     
-    result = use_case.execute(request_data)
+    result = get_container().register_use_case.execute(request_data)
     
     if not result.success:
         return {"error": result.error_message}, 400
@@ -148,4 +197,48 @@ def create_restaurant_staff_account():
             "username": result.user.username,
             "role": result.user.role.value
         }
-    }, 201
\ No newline at end of file
+    }, 201
+
+@auth_bp.route('/create-restaurant-staff/bulk', methods=['POST'])
+@permissions_required(Permission.USERS_CREATE_STAFF)
+def create_staff_accounts_bulk():
+    if request.mimetype == 'text/csv':
+        entries = parse_user_csv(request.get_data(as_text=True))
+    else:
+        data = request.get_json()
+        entries = data.get('users') if isinstance(data, dict) else data
+    
+    if not entries or not isinstance(entries, list):
+        return {"error": "A non-empty list of users is required"}, 400
+    
+    # Admin rows need the same permission as /create-admin
+    allowed_roles = (UserRole.RESTAURANT_STAFF,)
+    if request.permissions & Permission.USERS_CREATE_ADMIN:
+        allowed_roles += (UserRole.ADMIN,)
+    elif any(isinstance(entry, dict) and entry.get('role') == UserRole.ADMIN.value for entry in entries):
+        return {"error": "Creating admin accounts requires the users_create_admin permission"}, 403
+    
+    result = get_container().bulk_register_use_case.execute(
+        BulkRegisterUsersRequest(entries=entries, allowed_roles=allowed_roles)
+    )
+    
+    if not result.success:
+        return {"error": result.error_message}, 500
+    
+    return {
+        "message": f"Created {len(result.created)} accounts",
+        "created": len(result.created),
+        "skipped": result.skipped,
+        "errors": result.errors,
+        "elapsed_seconds": round(result.elapsed_seconds, 3),
+        "accounts_per_second": round(result.accounts_per_second, 1),
+        "users": [
+            {
+                "id": user.id,
+                "email": user.email,
+                "username": user.username,
+                "role": user.role.value
+            }
+            for user in result.created
+        ]
+    }, 201 if result.created else 200
\ No newline at end of file
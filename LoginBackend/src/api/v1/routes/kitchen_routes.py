@@ -1,14 +1,167 @@
-from flask import Blueprint, request, jsonify
-from ...middleware.auth_middleware import token_required, roles_required
-from ....infrastructure.database.session import db
-from ....infrastructure.database.models import OrderModel, UserModel
-from datetime import datetime
+from flask import Blueprint, request, jsonify, make_response
+from ...middleware.auth_middleware import token_required, permissions_required
+from ...container import get_container
+from ....infrastructure.database.session import db, IN_CLAUSE_CHUNK
+from ....infrastructure.database.models import (
+    OrderModel, OrderStatusEventModel, OrderRollupDailyModel, OrderRollupHourlyModel, UserModel
+)
+from ....infrastructure.cache.table_version import orders_version, users_version
+from ....infrastructure.archive.order_archive import ARCHIVE_COLUMNS, ARCHIVED_STATUSES
+from ....infrastructure.analytics.order_analytics import (
+    BUCKET_SECONDS, MAX_TIMELINE_BUCKETS, load_order_columns, summarize, timeline_buckets
+)
+from ....domain.entities.order import OrderStatus, allowed_sources
+from ....domain.entities.permission import Permission
+from ....infrastructure.config.settings import settings
+from datetime import datetime, timedelta
+from functools import lru_cache
 import json
 
 kitchen_bp = Blueprint('kitchen', __name__, url_prefix='/api/v1/kitchen')
 
+CLAIM_ATTEMPTS = 3
+MAX_BULK_STATUS_UPDATES = 500
+
+# ?granularity= -> (rollup read, length of the bucket prefix naming a period)
+REPORT_GRANULARITIES = {
+    'hour': (OrderRollupHourlyModel, 19),
+    'day': (OrderRollupDailyModel, 10),
+    'month': (OrderRollupDailyModel, 7),
+    'year': (OrderRollupDailyModel, 4),
+}
+MAX_HOURLY_REPORT_DAYS = 93
+DEFAULT_REPORT_DAYS = 30
+DEFAULT_ARCHIVE_LIMIT = 100
+MAX_ARCHIVE_LIMIT = 1000
+MAX_ANALYTICS_TOP_TABLES = 100
+MAX_ANALYTICS_BINS = 200
+# Analytics read every order of the range on the request thread (about 4 s
+# per million orders), so the range is capped and results are kept per ETag
+MAX_ANALYTICS_DAYS = 366
+ANALYTICS_CACHE_SIZE = 32
+
+# ?expand= name -> the order column holding the user id
+EXPANDABLE_USERS = {
+    'creator': 'created_by',
+    'assignee': 'assigned_to',
+}
+
+def _not_modified(etag):
+    if request.if_none_match.contains_weak(etag):
+        response = make_response('', 304)
+        response.set_etag(etag, weak=True)
+        return response
+    return None
+
+def _expand_fields():
+    names = [name.strip() for name in request.args.get('expand', '').split(',') if name.strip()]
+    unknown = [name for name in names if name not in EXPANDABLE_USERS]
+    if unknown:
+        return None, (jsonify({
+            'success': False,
+            'error': f"Cannot expand {', '.join(unknown)}; expected any of {sorted(EXPANDABLE_USERS)}"
+        }), 400)
+    return tuple(dict.fromkeys(names)), None
+
+def _expand_tag(expand):
+    # Expanded user summaries change with the users table, not the orders one
+    return (f'users-{users_version.value}',) if expand else ()
+
+def _serialize_orders(orders, expand=()):
+    # Every referenced user is fetched in one IN query on just the summary
+    # columns, instead of a lazy relationship load per order
+    if not expand:
+        return [order.to_dict() for order in orders]
+    
+    user_ids = sorted({
+        getattr(order, EXPANDABLE_USERS[name]) for order in orders for name in expand
+    } - {None})
+    users = {}
+    for start in range(0, len(user_ids), IN_CLAUSE_CHUNK):
+        rows = db.session.query(UserModel.id, UserModel.username, UserModel.role)\
+            .filter(UserModel.id.in_(user_ids[start:start + IN_CLAUSE_CHUNK]))
+        for user_id, username, role in rows:
+            users[user_id] = {'id': user_id, 'username': username, 'role': role}
+    
+    serialized = []
+    for order in orders:
+        data = order.to_dict()
+        for name in expand:
+            data[name] = users.get(getattr(order, EXPANDABLE_USERS[name]))
+        serialized.append(data)
+    return serialized
+
+def _commit_order_changes():
+    # Commits an order write together with the orders version bump, which
+    # invalidates every worker's ETags, and (without triggers) the prep list
+    # totals of the orders it remembered
+    get_container().prep_list.apply_writes()
+    orders_version.bump()
+    db.session.commit()
+
+def _expected_version(data):
+    if 'version' not in data:
+        return None, None
+    try:
+        return int(data['version']), None
+    except (TypeError, ValueError):
+        return None, (jsonify({'success': False, 'error': 'Version must be an integer'}), 400)
+
+def _status_values(target, user_id):
+    values = {'status': target.value}
+    
+    if target == OrderStatus.PREPARING:
+        values['assigned_to'] = user_id
+    
+    if target in [OrderStatus.PENDING, OrderStatus.CANCELLED, OrderStatus.SERVED]:
+        values['assigned_to'] = None
+    
+    return values
+
+def _apply_order_update(order_id, values, expected_version=None, from_statuses=None):
+    # One conditional UPDATE ... RETURNING instead of get-mutate-commit, so a
+    # stale version or a disallowed transition loses the race instead of
+    # silently overwriting
+    get_container().prep_list.lock([order_id])
+    stmt = db.update(OrderModel).where(OrderModel.id == order_id)
+    if expected_version is not None:
+        stmt = stmt.where(OrderModel.version == expected_version)
+    if from_statuses is not None:
+        stmt = stmt.where(OrderModel.status.in_(from_statuses))
+    stmt = stmt.values(version=OrderModel.version + 1, **values)\
+        .returning(OrderModel)\
+        .execution_options(populate_existing=True)
+    
+    order = db.session.execute(stmt).scalar_one_or_none()
+    
+    if not order:
+        db.session.rollback()
+        current = db.session.query(OrderModel.status, OrderModel.version)\
+            .filter_by(id=order_id).first()
+        if current is None:
+            return None, (jsonify({'success': False, 'error': 'Order not found'}), 404)
+        if from_statuses is not None and current.status not in from_statuses and \
+                (expected_version is None or current.version == expected_version):
+            return None, (jsonify({
+                'success': False,
+                'error': f"Cannot change order status from {current.status} to {values['status']}",
+                'current_status': current.status,
+                'current_version': current.version
+            }), 409)
+        return None, (jsonify({
+            'success': False,
+            'error': 'Order was modified by someone else',
+            'current_status': current.status,
+            'current_version': current.version
+        }), 409)
+    
+    # Serialize before commit so expire_on_commit doesn't cost a reload
+    order_data = order.to_dict()
+    _commit_order_changes()
+    return order_data, None
+
 @kitchen_bp.route('/orders', methods=['POST'])
-@roles_required('admin', 'restaurant_staff')
+@permissions_required(Permission.ORDERS_CREATE)
 def create_order():
     try:
         data = request.get_json()
@@ -39,7 +192,9 @@ def create_order():
         )
         
         db.session.add(new_order)
-        db.session.commit()
+        db.session.flush()
+        get_container().prep_list.remember({new_order.id: None})
+        _commit_order_changes()
         
         return jsonify({
             'success': True,
@@ -52,11 +207,14 @@ def create_order():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @kitchen_bp.route('/orders', methods=['GET'])
-@roles_required('admin', 'restaurant_staff')
+@permissions_required(Permission.ORDERS_READ)
 def get_orders():
     try:
         status = request.args.get('status')
         today_only = request.args.get('today', 'false').lower() == 'true'
+        expand, error = _expand_fields()
+        if error:
+            return error
         
         query = OrderModel.query
         
@@ -72,31 +230,46 @@ def get_orders():
         
         return jsonify({
             'success': True,
-            'orders': [order.to_dict() for order in orders]
+            'orders': _serialize_orders(orders, expand)
         })
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @kitchen_bp.route('/orders/pending', methods=['GET'])
-@roles_required('admin', 'restaurant_staff')
+@permissions_required(Permission.ORDERS_READ)
 def get_pending_orders():
     try:
+        expand, error = _expand_fields()
+        if error:
+            return error
+        
+        etag = orders_version.etag('pending', *expand, *_expand_tag(expand))
+        not_modified = _not_modified(etag)
+        if not_modified:
+            return not_modified
+        
         orders = OrderModel.query.filter_by(status='pending')\
             .order_by(OrderModel.created_at.asc()).all()
         
-        return jsonify({
+        response = jsonify({
             'success': True,
-            'orders': [order.to_dict() for order in orders]
+            'orders': _serialize_orders(orders, expand)
         })
+        response.set_etag(etag, weak=True)
+        return response
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @kitchen_bp.route('/orders/<int:order_id>', methods=['GET'])
-@roles_required('admin', 'restaurant_staff')
+@permissions_required(Permission.ORDERS_READ)
 def get_order(order_id):
     try:
+        expand, error = _expand_fields()
+        if error:
+            return error
+        
         order = OrderModel.query.get(order_id)
         
         if not order:
@@ -104,14 +277,143 @@ def get_order(order_id):
         
         return jsonify({
             'success': True,
-            'order': order.to_dict()
+            'order': _serialize_orders([order], expand)[0]
         })
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@kitchen_bp.route('/orders/<int:order_id>/history', methods=['GET'])
+@permissions_required(Permission.ORDERS_READ)
+def get_order_history(order_id):
+    try:
+        events = OrderStatusEventModel.query\
+            .filter(OrderStatusEventModel.order_id == order_id)\
+            .order_by(OrderStatusEventModel.id)\
+            .all()
+        
+        # Orders created before the history table existed have no events
+        if not events and OrderModel.query.get(order_id) is None:
+            return jsonify({'success': False, 'error': 'Order not found'}), 404
+        
+        return jsonify({
+            'success': True,
+            'order_id': order_id,
+            'events': [{
+                'from_status': event.from_status,
+                'to_status': event.to_status,
+                'assigned_to': event.assigned_to,
+                'created_at': event.created_at.isoformat()
+            } for event in events]
+        })
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@kitchen_bp.route('/orders/archive', methods=['GET'])
+@permissions_required(Permission.ORDERS_READ)
+def get_archived_orders():
+    try:
+        # Orders are only archived once untouched for the retention period, so
+        # the default window ends where the archive does
+        archive = get_container().order_archive
+        first_day, last_day, error = _report_range(
+            datetime.utcnow().date() - timedelta(days=archive.retention_days)
+        )
+        if error:
+            return error
+        
+        statuses = [name.strip() for name in request.args.get('status', '').split(',') if name.strip()]
+        fields = [name.strip() for name in request.args.get('fields', '').split(',') if name.strip()]
+        unknown = [name for name in statuses if name not in ARCHIVED_STATUSES] + \
+            [name for name in fields if name not in ARCHIVE_COLUMNS]
+        if unknown:
+            return jsonify({'success': False, 'error': f"Unknown status or field: {', '.join(unknown)}"}), 400
+        
+        limit = request.args.get('limit', DEFAULT_ARCHIVE_LIMIT, type=int)
+        if limit is None or not 1 <= limit <= MAX_ARCHIVE_LIMIT:
+            return jsonify({'success': False, 'error': f'limit must be between 1 and {MAX_ARCHIVE_LIMIT}'}), 400
+        before_id = request.args.get('before_id', type=int)
+        if 'before_id' in request.args and (before_id is None or before_id < 1):
+            return jsonify({'success': False, 'error': 'before_id must be a positive integer'}), 400
+        
+        # Newest id first across the whole range; pass next_before_id back as
+        # before_id for the next page. Only the requested columns are read.
+        columns = list(dict.fromkeys(['id', *fields])) if fields else ARCHIVE_COLUMNS
+        orders = archive.latest(first_day, last_day, limit + 1, columns, statuses, before_id)
+        has_more = len(orders) > limit
+        orders = orders[:limit]
+        
+        for order in orders:
+            for name, value in order.items():
+                if isinstance(value, datetime):
+                    order[name] = value.isoformat()
+        
+        return jsonify({
+            'success': True,
+            'from': first_day.isoformat(),
+            'to': last_day.isoformat(),
+            'orders': orders,
+            'has_more': has_more,
+            'next_before_id': orders[-1]['id'] if has_more else None
+        })
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@kitchen_bp.route('/orders/claim-next', methods=['POST'])
+@permissions_required(Permission.ORDERS_UPDATE)
+def claim_next_order():
+    try:
+        oldest_pending = db.select(OrderModel.id)\
+            .where(OrderModel.status == OrderStatus.PENDING.value)\
+            .order_by(OrderModel.created_at.asc(), OrderModel.id.asc())\
+            .limit(1)\
+            .scalar_subquery()
+        
+        # Picking and claiming happen in one statement; the repeated status
+        # check makes a cook who lost the race to the same row retry instead
+        # of taking over another cook's order
+        stmt = db.update(OrderModel)\
+            .where(OrderModel.id == oldest_pending)\
+            .where(OrderModel.status == OrderStatus.PENDING.value)\
+            .values(
+                status=OrderStatus.PREPARING.value,
+                assigned_to=request.user_id,
+                version=OrderModel.version + 1
+            )\
+            .returning(OrderModel)\
+            .execution_options(populate_existing=True, synchronize_session=False)
+        
+        order = None
+        for _ in range(CLAIM_ATTEMPTS):
+            order = db.session.execute(stmt).scalar_one_or_none()
+            if order:
+                break
+            db.session.rollback()
+            if not OrderModel.query.filter_by(status=OrderStatus.PENDING.value).first():
+                break
+        
+        if not order:
+            return jsonify({'success': False, 'error': 'No pending orders'}), 404
+        
+        # The claim only moves a pending order to preparing
+        get_container().prep_list.remember({order.id: (OrderStatus.PENDING.value, order.items)})
+        order_data = order.to_dict()
+        _commit_order_changes()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Order claimed',
+            'order': order_data
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @kitchen_bp.route('/orders/<int:order_id>/status', methods=['PUT'])
-@roles_required('admin', 'restaurant_staff')
+@permissions_required(Permission.ORDERS_UPDATE)
 def update_order_status(order_id):
     try:
         data = request.get_json()
@@ -120,65 +422,179 @@ def update_order_status(order_id):
         if not new_status:
             return jsonify({'success': False, 'error': 'Status is required'}), 400
         
-        valid_statuses = ['pending', 'preparing', 'ready', 'served', 'cancelled']
+        valid_statuses = [status.value for status in OrderStatus]
         if new_status not in valid_statuses:
             return jsonify({
                 'success': False, 
                 'error': f'Status must be one of: {valid_statuses}'
             }), 400
         
-        order = OrderModel.query.get(order_id)
-        if not order:
-            return jsonify({'success': False, 'error': 'Order not found'}), 404
+        expected_version, error = _expected_version(data)
+        if error:
+            return error
         
-        old_status = order.status
-        order.status = new_status
+        target = OrderStatus(new_status)
+        values = _status_values(target, request.user_id)
         
-        if new_status == 'preparing':
-            order.assigned_to = request.user_id
-        
-        if new_status in ['cancelled', 'served']:
-            order.assigned_to = None
-        
-        db.session.commit()
+        order_data, error = _apply_order_update(
+            order_id, values, expected_version, from_statuses=allowed_sources(target)
+        )
+        if error:
+            return error
         
         return jsonify({
             'success': True,
-            'message': f'Order status updated from {old_status} to {new_status}',
-            'order': order.to_dict()
+            'message': f'Order status updated to {new_status}',
+            'order': order_data
         })
         
     except Exception as e:
         db.session.rollback()
         return jsonify({'success': False, 'error': str(e)}), 500
     
+@kitchen_bp.route('/orders/status', methods=['PUT'])
+@permissions_required(Permission.ORDERS_UPDATE)
+def bulk_update_order_status():
+    try:
+        data = request.get_json()
+        updates = data.get('updates') if isinstance(data, dict) else None
+        
+        if not updates or not isinstance(updates, list):
+            return jsonify({'success': False, 'error': 'Updates are required'}), 400
+        
+        if len(updates) > MAX_BULK_STATUS_UPDATES:
+            return jsonify({
+                'success': False,
+                'error': f'At most {MAX_BULK_STATUS_UPDATES} updates per request'
+            }), 400
+        
+        valid_statuses = [status.value for status in OrderStatus]
+        requested = {}
+        groups = {}
+        
+        for update in updates:
+            try:
+                order_id = int(update['id'])
+                target = OrderStatus(update['status'])
+                version = int(update['version']) if update.get('version') is not None else None
+            except (KeyError, TypeError, ValueError):
+                return jsonify({
+                    'success': False,
+                    'error': f'Each update needs an integer id and a status in {valid_statuses}'
+                }), 400
+            
+            if order_id in requested:
+                return jsonify({'success': False, 'error': f'Order {order_id} listed twice'}), 400
+            
+            requested[order_id] = (target, version)
+            unversioned, versioned = groups.setdefault(target, ([], []))
+            if version is None:
+                unversioned.append(order_id)
+            else:
+                versioned.append((order_id, version))
+        
+        # One set-based UPDATE per distinct target status (and id chunk; a
+        # versioned match binds two values per order), all in one transaction
+        get_container().prep_list.lock(requested)
+        results = {}
+        pairs_per_chunk = IN_CLAUSE_CHUNK // 2
+        for target, (unversioned, versioned) in groups.items():
+            matches = [
+                OrderModel.id.in_(unversioned[start:start + IN_CLAUSE_CHUNK])
+                for start in range(0, len(unversioned), IN_CLAUSE_CHUNK)
+            ] + [
+                db.tuple_(OrderModel.id, OrderModel.version).in_(versioned[start:start + pairs_per_chunk])
+                for start in range(0, len(versioned), pairs_per_chunk)
+            ]
+            
+            for match in matches:
+                stmt = db.update(OrderModel)\
+                    .where(match)\
+                    .where(OrderModel.status.in_(allowed_sources(target)))\
+                    .values(version=OrderModel.version + 1, **_status_values(target, request.user_id))\
+                    .returning(OrderModel.id, OrderModel.version)\
+                    .execution_options(synchronize_session=False)
+                
+                for row in db.session.execute(stmt):
+                    results[row.id] = {
+                        'id': row.id,
+                        'success': True,
+                        'status': target.value,
+                        'version': row.version
+                    }
+        
+        missed = [order_id for order_id in requested if order_id not in results]
+        if missed:
+            current = {
+                row.id: row for row in db.session.query(
+                    OrderModel.id, OrderModel.status, OrderModel.version
+                ).filter(OrderModel.id.in_(missed))
+            }
+            for order_id in missed:
+                target, version = requested[order_id]
+                row = current.get(order_id)
+                if row is None:
+                    error = 'Order not found'
+                elif version is not None and row.version != version:
+                    error = 'Order was modified by someone else'
+                else:
+                    error = f'Cannot change order status from {row.status} to {target.value}'
+                results[order_id] = {
+                    'id': order_id,
+                    'success': False,
+                    'error': error,
+                    'current_status': row.status if row else None,
+                    'current_version': row.version if row else None
+                }
+        
+        updated = len(requested) - len(missed)
+        if updated:
+            _commit_order_changes()
+        else:
+            db.session.commit()
+        
+        return jsonify({
+            'success': not missed,
+            'updated': updated,
+            'failed': len(missed),
+            'results': [results[order_id] for order_id in requested]
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @kitchen_bp.route('/orders/<int:order_id>', methods=['PUT'])
-@roles_required('admin', 'restaurant_staff')
+@permissions_required(Permission.ORDERS_UPDATE)
 def update_order(order_id):
     try:
         data = request.get_json()
-        order = OrderModel.query.get(order_id)
         
-        if not order:
-            return jsonify({'success': False, 'error': 'Order not found'}), 404
+        expected_version, error = _expected_version(data)
+        if error:
+            return error
+        
+        values = {}
         
         if 'customer_name' in data:
-            order.customer_name = data['customer_name']
+            values['customer_name'] = data['customer_name']
         if 'table_number' in data:
-            order.table_number = data['table_number']
+            values['table_number'] = data['table_number']
         if 'kitchen_notes' in data:
-            order.kitchen_notes = data['kitchen_notes']
+            values['kitchen_notes'] = data['kitchen_notes']
         if 'items' in data:
-            order.items = json.dumps(data['items'])
+            values['items'] = json.dumps(data['items'])
         if 'total_amount' in data:
-            order.total_amount = data['total_amount']
+            values['total_amount'] = data['total_amount']
         
-        db.session.commit()
+        order_data, error = _apply_order_update(order_id, values, expected_version)
+        if error:
+            return error
         
         return jsonify({
             'success': True,
             'message': 'Order updated successfully',
-            'order': order.to_dict()
+            'order': order_data
         })
         
     except Exception as e:
@@ -186,16 +602,17 @@ def update_order(order_id):
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @kitchen_bp.route('/orders/<int:order_id>', methods=['DELETE'])
-@roles_required('admin')
+@permissions_required(Permission.ORDERS_DELETE)
 def delete_order(order_id):
     try:
+        get_container().prep_list.lock([order_id])
         order = OrderModel.query.get(order_id)
         
         if not order:
             return jsonify({'success': False, 'error': 'Order not found'}), 404
         
         db.session.delete(order)
-        db.session.commit()
+        _commit_order_changes()
         
         return jsonify({
             'success': True,
@@ -206,36 +623,218 @@ def delete_order(order_id):
         db.session.rollback()
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@kitchen_bp.route('/prep-list', methods=['GET'])
+@permissions_required(Permission.ORDERS_READ)
+def get_prep_list():
+    try:
+        etag = orders_version.etag('prep-list')
+        not_modified = _not_modified(etag)
+        if not_modified:
+            return not_modified
+        
+        response = jsonify({
+            'success': True,
+            **get_container().prep_list.snapshot()
+        })
+        response.set_etag(etag, weak=True)
+        return response
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@kitchen_bp.route('/prep-times', methods=['GET'])
+@permissions_required(Permission.ORDERS_READ)
+def get_prep_times():
+    try:
+        days = request.args.get('days', 1, type=int)
+        if days is None or not 1 <= days <= settings.PREP_TIMES_WINDOW_DAYS:
+            return jsonify({
+                'success': False,
+                'error': f'days must be between 1 and {settings.PREP_TIMES_WINDOW_DAYS}'
+            }), 400
+        
+        # The window rolls over at UTC midnight even without any writes
+        etag = orders_version.etag('prep-times', days, datetime.utcnow().date())
+        not_modified = _not_modified(etag)
+        if not_modified:
+            return not_modified
+        
+        prep_times = get_container().prep_times
+        response = jsonify({
+            'success': True,
+            'days': days,
+            'unit': 'seconds',
+            'relative_accuracy': prep_times.relative_accuracy,
+            **prep_times.report(days)
+        })
+        response.set_etag(etag, weak=True)
+        return response
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+def _report_range(default_last_day=None):
+    try:
+        last_day = datetime.strptime(request.args['to'], '%Y-%m-%d').date() \
+            if 'to' in request.args else default_last_day or datetime.utcnow().date()
+        first_day = datetime.strptime(request.args['from'], '%Y-%m-%d').date() \
+            if 'from' in request.args else last_day - timedelta(days=DEFAULT_REPORT_DAYS - 1)
+    except ValueError:
+        return None, None, (jsonify({'success': False, 'error': 'Dates must be YYYY-MM-DD'}), 400)
+    if first_day > last_day:
+        return None, None, (jsonify({'success': False, 'error': "'from' must not be after 'to'"}), 400)
+    return first_day, last_day, None
+
+def _report_row(orders, cancelled, revenue_cents):
+    paid = orders - cancelled
+    return {
+        'orders': orders,
+        'cancelled_orders': cancelled,
+        'revenue': revenue_cents / 100,
+        'average_order_value': round(revenue_cents / paid / 100, 2) if paid else 0.0
+    }
+
+@kitchen_bp.route('/reports', methods=['GET'])
+@permissions_required(Permission.ORDERS_READ)
+def get_reports():
+    try:
+        granularity = request.args.get('granularity', 'day')
+        if granularity not in REPORT_GRANULARITIES:
+            return jsonify({
+                'success': False,
+                'error': f"granularity must be one of {sorted(REPORT_GRANULARITIES)}"
+            }), 400
+        
+        first_day, last_day, error = _report_range()
+        if error:
+            return error
+        if granularity == 'hour' and (last_day - first_day).days >= MAX_HOURLY_REPORT_DAYS:
+            return jsonify({
+                'success': False,
+                'error': f'Hourly reports cover at most {MAX_HOURLY_REPORT_DAYS} days'
+            }), 400
+        
+        etag = orders_version.etag('reports', granularity, first_day, last_day)
+        not_modified = _not_modified(etag)
+        if not_modified:
+            return not_modified
+        
+        # Reads only the rollups (at most one row per day or hour in range),
+        # so the cost does not depend on how many orders there are
+        model, prefix = REPORT_GRANULARITIES[granularity]
+        period = db.func.substr(model.bucket, 1, prefix)
+        rows = db.session.query(
+            period,
+            db.func.sum(model.order_count),
+            db.func.sum(model.cancelled_count),
+            db.func.sum(model.revenue_cents)
+        ).filter(
+            model.bucket >= first_day.isoformat(),
+            model.bucket < (last_day + timedelta(days=1)).isoformat()
+        ).group_by(period)\
+            .having(db.func.sum(model.order_count) > 0)\
+            .order_by(period)\
+            .all()
+        
+        response = jsonify({
+            'success': True,
+            'from': first_day.isoformat(),
+            'to': last_day.isoformat(),
+            'granularity': granularity,
+            'totals': _report_row(*(sum(row[i] for row in rows) for i in (1, 2, 3))),
+            'periods': [{'period': row[0], **_report_row(row[1], row[2], row[3])} for row in rows]
+        })
+        response.set_etag(etag, weak=True)
+        return response
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@lru_cache(maxsize=ANALYTICS_CACHE_SIZE)
+def _analytics_summary(database, etag, first_day, last_day, bucket, top, bins, include_archive):
+    # database and etag only key the cache; the etag carries orders_version,
+    # so after any order write older entries are never hit again
+    columns = load_order_columns(
+        first_day, last_day, get_container().order_archive if include_archive else None
+    )
+    return summarize(columns, first_day, last_day, bucket, top_tables=top, bins=bins)
+
+@kitchen_bp.route('/analytics', methods=['GET'])
+@permissions_required(Permission.ORDERS_READ)
+def get_analytics():
+    try:
+        first_day, last_day, error = _report_range()
+        if error:
+            return error
+        
+        bucket = request.args.get('bucket', 'day')
+        top = request.args.get('top', 10, type=int)
+        bins = request.args.get('bins', 20, type=int)
+        include_archive = request.args.get('archive', 'true').lower() == 'true'
+        if bucket not in BUCKET_SECONDS:
+            return jsonify({'success': False, 'error': f"bucket must be one of {sorted(BUCKET_SECONDS)}"}), 400
+        if (last_day - first_day).days >= MAX_ANALYTICS_DAYS:
+            return jsonify({'success': False, 'error': f'Analytics cover at most {MAX_ANALYTICS_DAYS} days'}), 400
+        if timeline_buckets(first_day, last_day, bucket) > MAX_TIMELINE_BUCKETS:
+            return jsonify({
+                'success': False,
+                'error': f'The range spans more than {MAX_TIMELINE_BUCKETS} {bucket} buckets'
+            }), 400
+        if top is None or not 1 <= top <= MAX_ANALYTICS_TOP_TABLES:
+            return jsonify({'success': False, 'error': f'top must be between 1 and {MAX_ANALYTICS_TOP_TABLES}'}), 400
+        if bins is None or not 1 <= bins <= MAX_ANALYTICS_BINS:
+            return jsonify({'success': False, 'error': f'bins must be between 1 and {MAX_ANALYTICS_BINS}'}), 400
+        
+        etag = orders_version.etag('analytics', first_day, last_day, bucket, top, bins, include_archive)
+        not_modified = _not_modified(etag)
+        if not_modified:
+            return not_modified
+        
+        response = jsonify({
+            'success': True,
+            'from': first_day.isoformat(),
+            'to': last_day.isoformat(),
+            'bucket': bucket,
+            **_analytics_summary(str(db.engine.url), etag, first_day, last_day, bucket, top, bins, include_archive)
+        })
+        response.set_etag(etag, weak=True)
+        return response
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @kitchen_bp.route('/dashboard', methods=['GET'])
-@roles_required('admin', 'restaurant_staff')
+@permissions_required(Permission.ORDERS_READ)
 def kitchen_dashboard():
     try:
         today = datetime.now().date()
         
+        # Today's counters roll over at midnight even without any writes
+        expand, error = _expand_fields()
+        if error:
+            return error
+        
+        etag = orders_version.etag('dashboard', today.isoformat(), *expand, *_expand_tag(expand))
+        not_modified = _not_modified(etag)
+        if not_modified:
+            return not_modified
+        
         total_orders = OrderModel.query.count()
         pending_orders = OrderModel.query.filter_by(status='pending').count()
         preparing_orders = OrderModel.query.filter_by(status='preparing').count()
         ready_orders = OrderModel.query.filter_by(status='ready').count()
         
-        today_orders = OrderModel.query.filter(
-            db.func.date(OrderModel.created_at) == today
-        ).count()
-        
-        today_revenue_result = db.session.query(
-            db.func.sum(OrderModel.total_amount)
-        ).filter(
-            db.func.date(OrderModel.created_at) == today,
-            OrderModel.status != 'cancelled'
-        ).first()
-        
-        today_revenue = float(today_revenue_result[0] or 0)
+        # One primary-key lookup in the daily rollup instead of a SUM over orders
+        today_rollup = db.session.get(OrderRollupDailyModel, today.isoformat())
+        today_orders = today_rollup.order_count if today_rollup else 0
+        today_revenue = today_rollup.revenue_cents / 100 if today_rollup else 0.0
         
         recent_orders = OrderModel.query\
             .order_by(OrderModel.created_at.desc())\
             .limit(10)\
             .all()
         
-        return jsonify({
+        response = jsonify({
             'success': True,
             'stats': {
                 'total_orders': total_orders,
@@ -245,8 +844,10 @@ def kitchen_dashboard():
                 'today_orders': today_orders,
                 'today_revenue': today_revenue
             },
-            'recent_orders': [order.to_dict() for order in recent_orders]
+            'recent_orders': _serialize_orders(recent_orders, expand)
         })
+        response.set_etag(etag, weak=True)
+        return response
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
\ No newline at end of file
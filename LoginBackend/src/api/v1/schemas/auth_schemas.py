@@ -1,6 +1,11 @@
 from pydantic import BaseModel, EmailStr, Field, validator
 from typing import Optional
 from enum import Enum
+from ....domain.value_objects.password_policy import check_password
+from .request_validators import (
+    RequestValidator, email_field, string_field, optional_string_field,
+    bool_field, choice_field, password_field
+)
 
 class UserRole(str, Enum):
     USER = "user"
@@ -16,19 +21,29 @@ class LoginRequest(BaseModel):
 
 class RegisterRequest(BaseModel):
     email: EmailStr
-    password: str = Field(..., min_length=8)
+    # Length and the other rules come from the configured password policy
+    password: str
     username: Optional[str] = None
     role: UserRole = UserRole.USER
     
     @validator('password')
     def validate_password(cls, v):
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters')
-        if not any(char.isdigit() for char in v):
-            raise ValueError('Password must contain at least one digit')
-        if not any(char.isalpha() for char in v):
-            raise ValueError('Password must contain at least one letter')
-        return v
+        return check_password(v)
+
+# Hot-path equivalents of LoginRequest and RegisterRequest used by AuthController
+LOGIN_VALIDATOR = RequestValidator(
+    email=(email_field,),
+    password=(string_field(min_length=1),),
+    remember_me=(bool_field, False),
+    role=(choice_field(UserRole), UserRole.USER)
+)
+
+REGISTER_VALIDATOR = RequestValidator(
+    email=(email_field,),
+    password=(password_field,),
+    username=(optional_string_field, None),
+    role=(choice_field(UserRole), UserRole.USER)
+)
 
 class QuickLoginRequest(BaseModel):
     role: UserRole
@@ -11,18 +11,23 @@ class AuthService(ABC):
     def verify_password(self, password: str, hashed_password: str) -> bool:
         pass
     
+    @abstractmethod
+    def needs_rehash(self, hashed_password: str) -> bool:
+        pass
+    
     @abstractmethod
     def create_access_token(
         self, 
         user_id: int, 
         role: str, 
         expires_minutes: int = 1440,
-        is_guest: bool = False
+        is_guest: bool = False,
+        token_epoch: int = 0
     ) -> str:
         pass
     
     @abstractmethod
-    def create_refresh_token(self, user_id: int) -> str:
+    def create_refresh_token(self, user_id: int, token_epoch: int = 0) -> str:
         pass
     
     @abstractmethod
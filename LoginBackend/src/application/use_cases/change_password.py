@@ -0,0 +1,63 @@
+from typing import Optional
+from dataclasses import dataclass
+from ...domain.entities.user import User
+from ...domain.value_objects.password import Password
+from ...domain.repositories.user_repository import UserRepository
+from ...application.interfaces.auth_service import AuthService
+
+@dataclass
+class ChangePasswordRequest:
+    user_id: int
+    current_password: str
+    new_password: str
+
+@dataclass
+class ChangePasswordResponse:
+    success: bool
+    access_token: Optional[str] = None
+    refresh_token: Optional[str] = None
+    user: Optional[User] = None
+    error_message: Optional[str] = None
+
+class ChangePasswordUseCase:
+    def __init__(
+        self, 
+        user_repository: UserRepository,
+        auth_service: AuthService
+    ):
+        self.user_repository = user_repository
+        self.auth_service = auth_service
+    
+    def execute(self, request: ChangePasswordRequest) -> ChangePasswordResponse:
+        try:
+            new_password = Password(value=request.new_password).value
+        except ValueError as e:
+            return ChangePasswordResponse(
+                success=False,
+                error_message=e.errors()[0]['msg'] if hasattr(e, 'errors') else str(e)
+            )
+        
+        user = self.user_repository.find_by_id(request.user_id)
+        if not user or not user.password_hash:
+            return ChangePasswordResponse(success=False, error_message="This account has no password to change")
+        
+        if not self.auth_service.verify_password(request.current_password, user.password_hash):
+            return ChangePasswordResponse(success=False, error_message="Current password is incorrect")
+        
+        # Every token issued before this point stops working, including the
+        # one used for this request; the caller gets a fresh pair
+        epoch = self.user_repository.revoke_tokens(
+            user.id,
+            password_hash=self.auth_service.hash_password(new_password)
+        )
+        
+        return ChangePasswordResponse(
+            success=True,
+            access_token=self.auth_service.create_access_token(
+                user_id=user.id,
+                role=user.role.value,
+                token_epoch=epoch
+            ),
+            refresh_token=self.auth_service.create_refresh_token(user_id=user.id, token_epoch=epoch),
+            user=user
+        )
\ No newline at end of file
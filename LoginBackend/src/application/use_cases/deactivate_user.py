@@ -0,0 +1,20 @@
+from typing import Optional
+from dataclasses import dataclass
+from ...domain.repositories.user_repository import UserRepository
+
+@dataclass
+class DeactivateUserResponse:
+    success: bool
+    error_message: Optional[str] = None
+
+class DeactivateUserUseCase:
+    def __init__(self, user_repository: UserRepository):
+        self.user_repository = user_repository
+    
+    def execute(self, user_id: int, acting_user_id: int) -> DeactivateUserResponse:
+        if user_id == acting_user_id:
+            return DeactivateUserResponse(success=False, error_message="You cannot deactivate your own account")
+        # Deactivation and revocation are one UPDATE, so no token outlives it
+        if self.user_repository.revoke_tokens(user_id, is_active=False) is None:
+            return DeactivateUserResponse(success=False, error_message="User not found")
+        return DeactivateUserResponse(success=True)
\ No newline at end of file
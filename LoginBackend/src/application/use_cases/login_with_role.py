@@ -54,16 +54,22 @@ class LoginWithRoleUseCase:
                 error_message="Invalid email or password"
             )
         
-        self.user_repository.update_last_login(user.id)
+        # The plaintext is only available here, so hashes made with a different
+        # work factor are replaced in the same commit as last_login
+        new_hash = None
+        if self.auth_service.needs_rehash(user.password_hash):
+            new_hash = self.auth_service.hash_password(request.password)
+        self.user_repository.update_last_login(user.id, password_hash=new_hash)
         
         token_expiry = 7 * 24 * 60 if request.remember_me else 24 * 60
         access_token = self.auth_service.create_access_token(
             user_id=user.id,
             role=user.role.value,
-            expires_minutes=token_expiry
+            expires_minutes=token_expiry,
+            token_epoch=user.token_epoch
         )
         
-        refresh_token = self.auth_service.create_refresh_token(user_id=user.id)
+        refresh_token = self.auth_service.create_refresh_token(user_id=user.id, token_epoch=user.token_epoch)
         
         return LoginWithRoleResponse(
             success=True,
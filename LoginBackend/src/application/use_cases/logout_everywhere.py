@@ -0,0 +1,17 @@
+from typing import Optional
+from dataclasses import dataclass
+from ...domain.repositories.user_repository import UserRepository
+
+@dataclass
+class LogoutEverywhereResponse:
+    success: bool
+    error_message: Optional[str] = None
+
+class LogoutEverywhereUseCase:
+    def __init__(self, user_repository: UserRepository):
+        self.user_repository = user_repository
+    
+    def execute(self, user_id: int) -> LogoutEverywhereResponse:
+        if self.user_repository.revoke_tokens(user_id) is None:
+            return LogoutEverywhereResponse(success=False, error_message="User not found")
+        return LogoutEverywhereResponse(success=True)
\ No newline at end of file
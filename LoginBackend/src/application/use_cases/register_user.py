@@ -13,6 +13,7 @@ class RegisterUserRequest:
     username: Optional[str] = None
     role: UserRole = UserRole.USER
     register_as_customer: bool = True
+    validated: bool = False
 
 @dataclass
 class RegisterUserResponse:
@@ -32,11 +33,14 @@ class RegisterUserUseCase:
     
     def execute(self, request: RegisterUserRequest) -> RegisterUserResponse:
         try:
-            email_obj = Email(value=request.email)
-            
-            password_obj = Password(value=request.password)
+            if request.validated:
+                email = request.email
+                password = request.password
+            else:
+                email = Email(value=request.email).value
+                password = Password(value=request.password).value
             
-            existing_user = self.user_repository.find_by_email(email_obj.value)
+            existing_user = self.user_repository.find_by_email(email)
             if existing_user:
                 return RegisterUserResponse(
                     success=False,
@@ -48,10 +52,10 @@ class RegisterUserUseCase:
             else:
                 final_role = request.role
             
-            password_hash = self.auth_service.hash_password(password_obj.value)
+            password_hash = self.auth_service.hash_password(password)
             
             new_user = User(
-                email=email_obj.value,
+                email=email,
                 username=request.username,
                 password_hash=password_hash,
                 role=final_role,
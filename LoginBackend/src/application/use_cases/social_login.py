@@ -0,0 +1,79 @@
+from typing import Optional
+from dataclasses import dataclass
+from ...domain.entities.user import User, UserRole, AuthProvider
+from ...domain.repositories.user_repository import UserRepository
+from ...application.interfaces.auth_service import AuthService
+
+@dataclass
+class SocialLoginRequest:
+    provider: AuthProvider
+    provider_id: str
+    email: str
+    email_verified: bool = False
+    username: Optional[str] = None
+
+@dataclass
+class SocialLoginResponse:
+    success: bool
+    access_token: Optional[str] = None
+    refresh_token: Optional[str] = None
+    user: Optional[User] = None
+    created: bool = False
+    error_message: Optional[str] = None
+
+class LoginSocialUseCase:
+    def __init__(
+        self, 
+        user_repository: UserRepository,
+        auth_service: AuthService
+    ):
+        self.user_repository = user_repository
+        self.auth_service = auth_service
+    
+    def execute(self, request: SocialLoginRequest) -> SocialLoginResponse:
+        user = self.user_repository.find_by_provider(request.provider.value, request.provider_id)
+        created = False
+        
+        if user is None:
+            if not request.email or not request.email_verified:
+                return SocialLoginResponse(
+                    success=False,
+                    error_message="The identity provider did not return a verified email"
+                )
+            # Accounts are not linked automatically: whoever controls the
+            # existing account has to sign in with its original method
+            if self.user_repository.find_by_email(request.email):
+                return SocialLoginResponse(
+                    success=False,
+                    error_message="Email already registered with a different sign-in method"
+                )
+            user = self.user_repository.save(User(
+                email=request.email.strip().lower(),
+                username=request.username,
+                password_hash=None,
+                role=UserRole.USER,
+                provider=request.provider,
+                provider_id=request.provider_id,
+                is_verified=True
+            ))
+            created = True
+        
+        if not user.is_active:
+            return SocialLoginResponse(
+                success=False,
+                error_message="Account is deactivated"
+            )
+        
+        self.user_repository.update_last_login(user.id)
+        
+        return SocialLoginResponse(
+            success=True,
+            access_token=self.auth_service.create_access_token(
+                user_id=user.id,
+                role=user.role.value,
+                token_epoch=user.token_epoch
+            ),
+            refresh_token=self.auth_service.create_refresh_token(user_id=user.id, token_epoch=user.token_epoch),
+            user=user,
+            created=created
+        )
\ No newline at end of file
@@ -0,0 +1,29 @@
+from enum import Enum
+from typing import Dict, FrozenSet, List
+
+class OrderStatus(str, Enum):
+    PENDING = "pending"
+    PREPARING = "preparing"
+    READY = "ready"
+    SERVED = "served"
+    CANCELLED = "cancelled"
+
+ORDER_TRANSITIONS: Dict[OrderStatus, FrozenSet[OrderStatus]] = {
+    OrderStatus.PENDING: frozenset({OrderStatus.PREPARING, OrderStatus.CANCELLED}),
+    OrderStatus.PREPARING: frozenset({OrderStatus.PENDING, OrderStatus.READY, OrderStatus.CANCELLED}),
+    OrderStatus.READY: frozenset({OrderStatus.SERVED}),
+    OrderStatus.SERVED: frozenset(),
+    OrderStatus.CANCELLED: frozenset(),
+}
+
+# Reverse of ORDER_TRANSITIONS: which current statuses may move to a target,
+# used as the WHERE status IN (...) guard of a single UPDATE
+_ALLOWED_SOURCES: Dict[OrderStatus, List[str]] = {
+    target: sorted(
+        source.value for source, targets in ORDER_TRANSITIONS.items() if target in targets
+    )
+    for target in OrderStatus
+}
+
+def allowed_sources(target: OrderStatus) -> List[str]:
+    return _ALLOWED_SOURCES[target]
\ No newline at end of file
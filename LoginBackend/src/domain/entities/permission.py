@@ -0,0 +1,36 @@
+from enum import IntFlag
+from typing import Dict, List
+from .user import UserRole
+
+# Bit positions are part of issued tokens: append new permissions, never
+# reorder or reuse a retired bit
+class Permission(IntFlag):
+    ORDERS_READ = 1 << 0
+    ORDERS_CREATE = 1 << 1
+    ORDERS_UPDATE = 1 << 2
+    ORDERS_DELETE = 1 << 3
+    USERS_CREATE_STAFF = 1 << 4
+    USERS_CREATE_ADMIN = 1 << 5
+    USERS_DEACTIVATE = 1 << 6
+    TOKENS_INTROSPECT = 1 << 7
+
+_KITCHEN = Permission.ORDERS_READ | Permission.ORDERS_CREATE | Permission.ORDERS_UPDATE
+
+ROLE_PERMISSIONS: Dict[UserRole, int] = {
+    UserRole.USER: 0,
+    UserRole.GUEST: 0,
+    UserRole.RESTAURANT_STAFF: int(_KITCHEN),
+    UserRole.ADMIN: int(
+        _KITCHEN | Permission.ORDERS_DELETE
+        | Permission.USERS_CREATE_STAFF | Permission.USERS_CREATE_ADMIN
+        | Permission.USERS_DEACTIVATE | Permission.TOKENS_INTROSPECT
+    ),
+}
+
+_ROLE_PERMISSIONS_BY_VALUE: Dict[str, int] = {role.value: bits for role, bits in ROLE_PERMISSIONS.items()}
+
+def permissions_for_role(role: str) -> int:
+    return _ROLE_PERMISSIONS_BY_VALUE.get(role, 0)
+
+def permission_names(granted: int) -> List[str]:
+    return [permission.name.lower() for permission in Permission if granted & permission]
@@ -26,6 +26,7 @@ class User:
     is_active: bool = True
     is_verified: bool = False
     last_login: Optional[datetime] = None
+    token_epoch: int = 0
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     
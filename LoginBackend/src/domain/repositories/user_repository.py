@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, List, Set, Tuple
 from ..entities.user import User
 
 class UserRepository(ABC):
@@ -16,10 +16,18 @@ class UserRepository(ABC):
     def find_by_provider(self, provider: str, provider_id: str) -> Optional[User]:
         pass
     
+    @abstractmethod
+    def find_existing_emails(self, emails: List[str]) -> Set[str]:
+        pass
+    
     @abstractmethod
     def save(self, user: User) -> User:
         pass
     
+    @abstractmethod
+    def save_many(self, users: List[User]) -> List[User]:
+        pass
+    
     @abstractmethod
     def update(self, user: User) -> User:
         pass
@@ -29,5 +37,22 @@ class UserRepository(ABC):
         pass
     
     @abstractmethod
-    def update_last_login(self, user_id: int) -> None:
+    def update_last_login(self, user_id: int, password_hash: Optional[str] = None) -> None:
+        pass
+    
+    @abstractmethod
+    def revoke_tokens(
+        self,
+        user_id: int,
+        password_hash: Optional[str] = None,
+        is_active: Optional[bool] = None
+    ) -> Optional[int]:
+        pass
+    
+    @abstractmethod
+    def latest_token_epoch(self) -> int:
+        pass
+    
+    @abstractmethod
+    def find_token_epochs_since(self, epoch: int) -> List[Tuple[int, int]]:
         pass
\ No newline at end of file
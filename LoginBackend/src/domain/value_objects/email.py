@@ -1,11 +1,14 @@
 from pydantic import BaseModel, EmailStr, validator
 
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
 class Email(BaseModel):
     value: EmailStr
     
     @validator('value')
     def normalize_email(cls, v):
-        return v.lower().strip()
+        return normalize_email(v)
     
     def __str__(self):
         return self.value
\ No newline at end of file
@@ -1,17 +1,12 @@
 from pydantic import BaseModel, validator
+from .password_policy import check_password
 
 class Password(BaseModel):
     value: str
     
     @validator('value')
     def validate_password(cls, v):
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters')
-        if not any(char.isdigit() for char in v):
-            raise ValueError('Password must contain at least one digit')
-        if not any(char.isalpha() for char in v):
-            raise ValueError('Password must contain at least one letter')
-        return v
+        return check_password(v)
     
     def __str__(self):
         return self.value
\ No newline at end of file
@@ -0,0 +1,56 @@
+from typing import Optional
+
+class PasswordPolicy:
+    # Character-class rules are compiled once into a list of (predicate, message)
+    # pairs; check() walks the password a single time and stops as soon as
+    # every required class has been seen. breached_passwords is any object
+    # supporting "password in breached_passwords" (see BreachedPasswordList).
+    
+    def __init__(self, min_length: int = 8, require_digit: bool = True,
+                 require_letter: bool = True, require_upper: bool = False,
+                 require_lower: bool = False, require_symbol: bool = False,
+                 breached_passwords=None):
+        self.min_length = min_length
+        self.breached_passwords = breached_passwords
+        self.length_message = f'Password must be at least {min_length} characters'
+        
+        rules = [
+            (require_digit, str.isdigit, 'Password must contain at least one digit'),
+            (require_letter, str.isalpha, 'Password must contain at least one letter'),
+            (require_upper, str.isupper, 'Password must contain at least one uppercase letter'),
+            (require_lower, str.islower, 'Password must contain at least one lowercase letter'),
+            (require_symbol, _is_symbol, 'Password must contain at least one symbol'),
+        ]
+        self.rules = [(predicate, message) for required, predicate, message in rules if required]
+    
+    def check(self, v: str) -> str:
+        if len(v) < self.min_length:
+            raise ValueError(self.length_message)
+        
+        pending = self.rules
+        if pending:
+            for char in v:
+                pending = [rule for rule in pending if not rule[0](char)]
+                if not pending:
+                    break
+            if pending:
+                raise ValueError(pending[0][1])
+        
+        if self.breached_passwords is not None and v in self.breached_passwords:
+            raise ValueError('Password has appeared in a data breach; choose a different one')
+        return v
+
+def _is_symbol(char: str) -> bool:
+    return not char.isalnum() and not char.isspace()
+
+_policy = PasswordPolicy()
+
+def configure_password_policy(policy: Optional[PasswordPolicy]) -> None:
+    global _policy
+    _policy = policy or PasswordPolicy()
+
+def get_password_policy() -> PasswordPolicy:
+    return _policy
+
+def check_password(v: str) -> str:
+    return _policy.check(v)
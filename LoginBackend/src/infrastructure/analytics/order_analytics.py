@@ -0,0 +1,246 @@
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
+from ..database.session import db, is_sqlite
+from ..database.models import OrderModel
+from ...domain.entities.order import OrderStatus
+
+if TYPE_CHECKING:
+    from ..archive.order_archive import OrderArchive
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+LOAD_CHUNK_SIZE = 100000
+BUCKET_SECONDS = {'hour': 3600, 'day': 86400, 'week': 7 * 86400}
+MAX_TIMELINE_BUCKETS = 5000
+_EPOCH = date(1970, 1, 1)
+
+def _epoch_seconds(day: date) -> int:
+    return (day - _EPOCH).days * 86400
+
+def _timeline_origin(first_day: date, bucket: str) -> int:
+    # Weeks start on Monday
+    return _epoch_seconds(first_day - timedelta(days=first_day.weekday()) if bucket == 'week' else first_day)
+
+def timeline_buckets(first_day: date, last_day: date, bucket: str) -> int:
+    end = _epoch_seconds(last_day + timedelta(days=1))
+    return -(-(end - _timeline_origin(first_day, bucket)) // BUCKET_SECONDS[bucket])
+
+@dataclass
+class OrderColumns:
+    # One entry per order: created_at as UTC epoch seconds, the total in
+    # cents (rounded like the rollups), the cancelled flag, and table_number
+    # as an index into table_labels
+    created_at: Any
+    amount_cents: Any
+    cancelled: Any
+    table: Any
+    table_labels: List[str] = field(default_factory=list)
+    
+    def __len__(self) -> int:
+        return len(self.created_at)
+
+class _ColumnBuilder:
+    
+    def __init__(self):
+        self.chunks = {'created_at': [], 'amount_cents': [], 'cancelled': [], 'table': []}
+        self.labels: Dict[str, int] = {}
+    
+    def add(self, created_at, amount_cents, cancelled, tables) -> None:
+        # table_number becomes a small integer code, so grouping by it is a
+        # bincount. The codes come from one C-level dict lookup per order,
+        # an order of magnitude faster than np.unique sorting an object array
+        # of strings.
+        for label in set(tables).difference(self.labels):
+            self.labels[label] = len(self.labels)
+        codes = np.fromiter(map(self.labels.__getitem__, tables), dtype=np.int32, count=len(tables))
+        self.chunks['created_at'].append(np.asarray(created_at, dtype=np.int64))
+        self.chunks['amount_cents'].append(np.asarray(amount_cents, dtype=np.int64))
+        self.chunks['cancelled'].append(np.asarray(cancelled, dtype=bool))
+        self.chunks['table'].append(codes)
+    
+    def build(self) -> OrderColumns:
+        dtypes = {'created_at': np.int64, 'amount_cents': np.int64, 'cancelled': bool, 'table': np.int32}
+        arrays = {
+            name: np.concatenate(chunks) if chunks else np.zeros(0, dtypes[name])
+            for name, chunks in self.chunks.items()
+        }
+        # Codes were handed out in set order, which varies between processes;
+        # renumbering them by label keeps ties (top_tables) in the same order
+        # for the same data
+        labels = sorted(self.labels)
+        renumber = np.zeros(len(labels), np.int32)
+        renumber[[self.labels[label] for label in labels]] = np.arange(len(labels), dtype=np.int32)
+        arrays['table'] = renumber[arrays['table']]
+        return OrderColumns(table_labels=labels, **arrays)
+
+# Both yield (created_at epoch seconds, cents, cancelled, table_number)
+# columns, chunk_size orders at a time in primary-key order
+
+def _sqlite_chunks(first_day: date, last_day: date, chunk_size: int) -> Iterator[tuple]:
+    # Straight from the DB-API cursor (no Row wrappers or type processing);
+    # SQLite computes the epoch seconds and cents itself
+    start = first_day.isoformat()
+    end = (last_day + timedelta(days=1)).isoformat()
+    cursor = db.session.connection().connection.cursor()
+    last_id = 0
+    try:
+        while True:
+            cursor.execute(
+                "SELECT id, CAST(strftime('%s', created_at) AS INTEGER), "
+                "CAST(ROUND(COALESCE(total_amount, 0) * 100) AS INTEGER), "
+                "status = ?, COALESCE(table_number, '') FROM orders "
+                "WHERE id > ? AND created_at >= ? AND created_at < ? ORDER BY id LIMIT ?",
+                (OrderStatus.CANCELLED.value, last_id, start, end, chunk_size)
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            ids, *columns = zip(*rows)
+            yield columns
+            last_id = ids[-1]
+            if len(rows) < chunk_size:
+                break
+    finally:
+        cursor.close()
+
+def _chunks(first_day: date, last_day: date, chunk_size: int) -> Iterator[tuple]:
+    # Any backend: datetimes and amounts, converted here with the same
+    # arithmetic as the SQLite query
+    stmt = db.select(
+        OrderModel.id, OrderModel.created_at, OrderModel.total_amount,
+        OrderModel.status == OrderStatus.CANCELLED.value,
+        db.func.coalesce(OrderModel.table_number, '')
+    ).where(
+        OrderModel.id > db.bindparam('last_id'),
+        OrderModel.created_at >= datetime.combine(first_day, datetime.min.time()),
+        OrderModel.created_at < datetime.combine(last_day + timedelta(days=1), datetime.min.time())
+    ).order_by(OrderModel.id).limit(chunk_size)
+    last_id = 0
+    while True:
+        rows = db.session.execute(stmt, {'last_id': last_id}).all()
+        if not rows:
+            break
+        ids, created_at, total_amount, cancelled, tables = zip(*rows)
+        # SQLite's ROUND: half away from zero
+        amounts = np.asarray([amount or 0.0 for amount in total_amount], dtype=np.float64) * 100
+        yield (
+            np.array(created_at, dtype='datetime64[s]').astype(np.int64),
+            np.copysign(np.floor(np.abs(amounts) + 0.5), amounts).astype(np.int64),
+            cancelled,
+            tables
+        )
+        last_id = ids[-1]
+        if len(rows) < chunk_size:
+            break
+
+def load_order_columns(first_day: date, last_day: date, archive: Optional['OrderArchive'] = None,
+                       chunk_size: int = LOAD_CHUNK_SIZE) -> OrderColumns:
+    # Reads only the four columns the analytics need and keeps them as NumPy
+    # arrays. Archived orders in the range are added from their Arrow files;
+    # pyarrow is only needed when there are any.
+    if np is None:
+        raise RuntimeError("Order analytics needs the 'numpy' package")
+    
+    builder = _ColumnBuilder()
+    chunks = _sqlite_chunks if is_sqlite() else _chunks
+    for columns in chunks(first_day, last_day, chunk_size):
+        builder.add(*columns)
+    
+    if archive is not None:
+        for chunk in archive.order_columns(first_day, last_day):
+            builder.add(*chunk)
+    
+    return builder.build()
+
+def _ticket_stats(orders, cents, paid) -> Dict[str, Any]:
+    return {
+        'orders': int(orders),
+        'revenue': int(cents) / 100,
+        'average_ticket': round(int(cents) / paid / 100, 2) if paid else 0.0
+    }
+
+def summarize(columns: OrderColumns, first_day: date, last_day: date, bucket: str = 'day',
+              top_tables: int = 10, bins: int = 20) -> Dict[str, Any]:
+    # Every aggregate below is a handful of whole-array operations (masks,
+    # bincount, histogram, percentile); nothing loops over orders in Python.
+    # Orders count whether or not they were cancelled; revenue and tickets
+    # only count the rest, the same as the rollups. Revenue is summed in
+    # integer cents so it matches the rollups to the cent.
+    paid = ~columns.cancelled
+    cents = np.where(paid, columns.amount_cents, 0)
+    paid_amounts = columns.amount_cents[paid] / 100
+    
+    hour_of_day = (columns.created_at // 3600) % 24
+    # 1970-01-01 was a Thursday; weekday 0 is Monday
+    weekday = (columns.created_at // 86400 + 3) % 7
+    
+    by_hour = {
+        'orders': np.bincount(hour_of_day, minlength=24),
+        'paid': np.bincount(hour_of_day, weights=paid, minlength=24),
+        'revenue': np.bincount(hour_of_day, weights=cents, minlength=24),
+    }
+    heatmap = np.bincount(weekday * 24 + hour_of_day, minlength=7 * 24).reshape(7, 24)
+    
+    width = BUCKET_SECONDS[bucket]
+    origin = _timeline_origin(first_day, bucket)
+    count = timeline_buckets(first_day, last_day, bucket)
+    slot = (columns.created_at - origin) // width
+    in_range = (slot >= 0) & (slot < count)
+    slot = slot[in_range]
+    timeline = {
+        'orders': np.bincount(slot, minlength=count),
+        'paid': np.bincount(slot, weights=paid[in_range], minlength=count),
+        'revenue': np.bincount(slot, weights=cents[in_range], minlength=count),
+    }
+    
+    table_count = len(columns.table_labels)
+    by_table = {
+        'orders': np.bincount(columns.table, minlength=table_count),
+        'paid': np.bincount(columns.table, weights=paid, minlength=table_count),
+        'revenue': np.bincount(columns.table, weights=cents, minlength=table_count),
+    }
+    top = np.argsort(-by_table['revenue'], kind='stable')[:top_tables]
+    
+    if len(paid_amounts):
+        histogram, edges = np.histogram(paid_amounts, bins=bins)
+        p50, p90, p99 = np.percentile(paid_amounts, [50, 90, 99])
+    else:
+        histogram, edges = np.zeros(0, np.int64), np.zeros(0)
+        p50 = p90 = p99 = 0.0
+    
+    return {
+        'totals': {
+            **_ticket_stats(len(columns), cents.sum(), int(paid.sum())),
+            'cancelled_orders': int(columns.cancelled.sum()),
+            'median_ticket': round(float(p50), 2),
+            'p90_ticket': round(float(p90), 2),
+            'p99_ticket': round(float(p99), 2),
+        },
+        'by_hour_of_day': [
+            {'hour': hour, **_ticket_stats(by_hour['orders'][hour], by_hour['revenue'][hour], by_hour['paid'][hour])}
+            for hour in range(24)
+        ],
+        'weekday_hour_orders': heatmap.tolist(),
+        'timeline': [
+            {
+                'start': datetime.utcfromtimestamp(origin + i * width).isoformat() + 'Z',
+                **_ticket_stats(timeline['orders'][i], timeline['revenue'][i], timeline['paid'][i])
+            }
+            for i in range(count)
+        ],
+        'top_tables': [
+            {
+                'table_number': columns.table_labels[i] or None,
+                **_ticket_stats(by_table['orders'][i], by_table['revenue'][i], by_table['paid'][i])
+            }
+            for i in top
+        ],
+        'ticket_histogram': {
+            'edges': [round(float(edge), 2) for edge in edges],
+            'counts': histogram.tolist()
+        },
+    }
\ No newline at end of file
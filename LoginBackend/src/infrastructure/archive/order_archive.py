@@ -0,0 +1,239 @@
+import os
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from ..database.session import db, IN_CLAUSE_CHUNK
+from ..database.models import OrderModel, OrderArchiveFileModel
+from ..cache.table_version import orders_version
+from ...domain.entities.order import OrderStatus
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+
+ARCHIVED_STATUSES = (OrderStatus.SERVED.value, OrderStatus.CANCELLED.value)
+ARCHIVE_COLUMNS = [column.name for column in OrderModel.__table__.columns]
+
+def _arrow_schema():
+    types = {'id': pa.int64(), 'total_amount': pa.float64(), 'created_by': pa.int64(),
+             'assigned_to': pa.int64(), 'version': pa.int64(),
+             'created_at': pa.timestamp('us'), 'updated_at': pa.timestamp('us')}
+    return pa.schema([(name, types.get(name, pa.string())) for name in ARCHIVE_COLUMNS])
+
+def _cents(total_amount):
+    # Same arithmetic as CAST(ROUND(COALESCE(total_amount, 0) * 100) AS INTEGER)
+    return pc.round(pc.multiply(pc.fill_null(total_amount, 0.0), 100),
+                    round_mode='half_towards_infinity').cast(pa.int64())
+
+def _write_file(path: str, columns: Dict[str, list], compression: str) -> None:
+    # Written aside and renamed, so a reader or a crash never sees half a file
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    table = pa.Table.from_pydict(columns, schema=_arrow_schema())
+    temp_path = path + '.tmp'
+    feather.write_feather(table, temp_path, compression=compression)
+    with open(temp_path, 'rb') as f:
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+class OrderArchive:
+    # Moves served and cancelled orders untouched for retention_days out of
+    # the orders table into compressed Arrow IPC files, one directory per
+    # created_at day (date=YYYY-MM-DD). Each batch holds SQLite's write lock
+    # from the first statement on, so the rows it selects, writes out and
+    # deletes cannot change in between; batches are bounded so other writers
+    # wait at most one batch.
+    #
+    # Arrow IPC is read through a memory map and only the requested columns
+    # are decompressed, so a scan touches just the bytes it needs.
+    
+    def __init__(self, directory: str, retention_days: int = 90, batch_size: int = 5000,
+                 compression: str = 'zstd'):
+        self.directory = directory
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+        self.compression = compression
+    
+    @staticmethod
+    def _require_pyarrow() -> None:
+        if pa is None:
+            raise RuntimeError("Order archiving needs the 'pyarrow' package")
+    
+    def archive(self, max_batches: Optional[int] = None) -> Dict[str, int]:
+        self._require_pyarrow()
+        cutoff = datetime.utcnow() - timedelta(days=self.retention_days)
+        stats = {'batches': 0, 'orders': 0, 'files': 0}
+        while max_batches is None or stats['batches'] < max_batches:
+            orders, files = self._archive_batch(cutoff)
+            if not orders:
+                break
+            stats['batches'] += 1
+            stats['orders'] += orders
+            stats['files'] += files
+            if orders < self.batch_size:
+                break
+        return stats
+    
+    def _archive_batch(self, cutoff: datetime) -> Tuple[int, int]:
+        written = []
+        try:
+            # A write first, so the transaction holds the lock before it reads
+            db.session.execute(
+                db.delete(OrderArchiveFileModel).where(OrderArchiveFileModel.pending.is_(True))
+            )
+            rows = db.session.execute(
+                db.select(*OrderModel.__table__.columns)
+                .where(OrderModel.status.in_(ARCHIVED_STATUSES), OrderModel.updated_at < cutoff)
+                .order_by(OrderModel.id)
+                .limit(self.batch_size)
+            ).all()
+            if not rows:
+                db.session.rollback()
+                return 0, 0
+            
+            partitions = defaultdict(list)
+            for row in rows:
+                partitions[(row.created_at or row.updated_at).date().isoformat()].append(row)
+            
+            for day, day_rows in partitions.items():
+                relative_path = os.path.join(
+                    f'date={day}', f'orders-{day_rows[0].id}-{day_rows[-1].id}.arrow'
+                )
+                _write_file(
+                    os.path.join(self.directory, relative_path),
+                    {name: [getattr(row, name) for row in day_rows] for name in ARCHIVE_COLUMNS},
+                    self.compression
+                )
+                written.append(relative_path)
+                db.session.add(OrderArchiveFileModel(
+                    partition_date=day,
+                    path=relative_path,
+                    row_count=len(day_rows),
+                    first_order_id=day_rows[0].id,
+                    last_order_id=day_rows[-1].id,
+                    pending=True
+                ))
+            db.session.flush()
+            
+            ids = [row.id for row in rows]
+            for start in range(0, len(ids), IN_CLAUSE_CHUNK):
+                db.session.execute(
+                    db.delete(OrderModel).where(OrderModel.id.in_(ids[start:start + IN_CLAUSE_CHUNK]))
+                )
+            db.session.execute(
+                db.update(OrderArchiveFileModel)
+                .where(OrderArchiveFileModel.pending.is_(True))
+                .values(pending=False)
+            )
+            orders_version.bump()
+            db.session.commit()
+            return len(rows), len(partitions)
+        except Exception:
+            db.session.rollback()
+            for relative_path in written:
+                try:
+                    os.remove(os.path.join(self.directory, relative_path))
+                except OSError:
+                    pass
+            raise
+    
+    def _files(self, first_day: date, last_day: date):
+        return db.session.query(OrderArchiveFileModel)\
+            .filter(OrderArchiveFileModel.pending.is_(False),
+                    OrderArchiveFileModel.partition_date >= first_day.isoformat(),
+                    OrderArchiveFileModel.partition_date <= last_day.isoformat())
+    
+    def _read(self, relative_path: str, columns: Sequence[str], statuses: Optional[Sequence[str]],
+              before_id: Optional[int] = None) -> 'pa.Table':
+        read_columns = list(dict.fromkeys(
+            [*columns, *(['status'] if statuses else []), *(['id'] if before_id else [])]
+        ))
+        table = feather.read_table(
+            os.path.join(self.directory, relative_path), columns=read_columns, memory_map=True
+        )
+        if statuses:
+            table = table.filter(pc.is_in(table['status'], value_set=pa.array(list(statuses))))
+        if before_id:
+            table = table.filter(pc.less(table['id'], before_id))
+        return table.select(list(columns))
+    
+    def scan(self, first_day: date, last_day: date, columns: Sequence[str] = ARCHIVE_COLUMNS,
+             statuses: Optional[Sequence[str]] = None) -> Iterator[Tuple[str, 'pa.Table']]:
+        # Yields (partition day, table) newest day first, each file's rows
+        # filtered by status and holding only the requested columns
+        files = self._files(first_day, last_day)\
+            .with_entities(OrderArchiveFileModel.partition_date, OrderArchiveFileModel.path)\
+            .order_by(OrderArchiveFileModel.partition_date.desc(), OrderArchiveFileModel.last_order_id.desc())\
+            .all()
+        if files:
+            self._require_pyarrow()
+        for day, relative_path in files:
+            yield day, self._read(relative_path, columns, statuses)
+    
+    def latest(self, first_day: date, last_day: date, limit: int, columns: Sequence[str] = ARCHIVE_COLUMNS,
+               statuses: Optional[Sequence[str]] = None, before_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        # Up to limit orders with id < before_id, highest id first, across
+        # every file of the range. Files overlap in ids (a day is archived in
+        # several batches and runs), so they are visited by last_order_id and
+        # merged; once limit rows beat the next file's highest id the rest
+        # cannot contribute and is never opened.
+        query = self._files(first_day, last_day)
+        if before_id:
+            query = query.filter(OrderArchiveFileModel.first_order_id < before_id)
+        files = query.with_entities(OrderArchiveFileModel.path, OrderArchiveFileModel.last_order_id)\
+            .order_by(OrderArchiveFileModel.last_order_id.desc())\
+            .all()
+        if files:
+            self._require_pyarrow()
+        columns = list(dict.fromkeys(['id', *columns]))
+        orders = []
+        for relative_path, last_order_id in files:
+            if len(orders) >= limit and orders[limit - 1]['id'] > last_order_id:
+                break
+            table = self._read(relative_path, columns, statuses, before_id)
+            table = table.sort_by([('id', 'descending')]).slice(0, limit)
+            orders = sorted(orders + table.to_pylist(), key=lambda order: order['id'], reverse=True)[:limit]
+        return orders
+    
+    def rollup_rows(self, first_day: date, last_day: date) -> List[Tuple[str, int, int, int]]:
+        # (hour bucket, orders, cancelled, revenue cents) of archived orders,
+        # matching the arithmetic of the rollup triggers
+        totals = defaultdict(lambda: [0, 0, 0])
+        for _, table in self.scan(first_day, last_day, ('created_at', 'status', 'total_amount')):
+            cancelled = pc.fill_null(pc.equal(table['status'], OrderStatus.CANCELLED.value), False)
+            cents = pc.if_else(cancelled, 0, _cents(table['total_amount']))
+            grouped = pa.table({
+                'bucket': pc.strftime(table['created_at'], format='%Y-%m-%d %H:00:00'),
+                'cancelled': cancelled.cast(pa.int64()),
+                'cents': cents,
+            }).group_by('bucket').aggregate([('cancelled', 'count'), ('cancelled', 'sum'), ('cents', 'sum')])
+            for bucket, orders, cancelled_count, revenue in zip(*(
+                grouped[name].to_pylist() for name in ('bucket', 'cancelled_count', 'cancelled_sum', 'cents_sum')
+            )):
+                total = totals[bucket]
+                total[0] += orders
+                total[1] += cancelled_count
+                total[2] += revenue
+        return [(bucket, *total) for bucket, total in sorted(totals.items())]
+    
+    def order_columns(self, first_day: date, last_day: date) -> Iterator[Tuple[Any, Any, Any, List[str]]]:
+        # (created_at epoch seconds, total in cents, cancelled, table_number)
+        # per archived order of the range, one NumPy chunk per file
+        for _, table in self.scan(first_day, last_day, ('created_at', 'total_amount', 'status', 'table_number')):
+            yield (
+                pc.divide(table['created_at'].cast(pa.int64()), 1000000).to_numpy(),
+                _cents(table['total_amount']).to_numpy(),
+                pc.fill_null(pc.equal(table['status'], OrderStatus.CANCELLED.value), False).to_numpy(),
+                pc.fill_null(table['table_number'], '').to_pylist()
+            )
+    
+    def date_range(self) -> Tuple[Optional[date], Optional[date]]:
+        oldest, newest = db.session.query(
+            db.func.min(OrderArchiveFileModel.partition_date),
+            db.func.max(OrderArchiveFileModel.partition_date)
+        ).filter(OrderArchiveFileModel.pending.is_(False)).one()
+        if oldest is None:
+            return None, None
+        return date.fromisoformat(oldest), date.fromisoformat(newest)
\ No newline at end of file
@@ -0,0 +1,152 @@
+import json
+import string
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.exc import IntegrityError
+from ..database.session import db, is_sqlite, IN_CLAUSE_CHUNK
+from ..database.models import OrderModel, PrepListTotalModel
+from ..database.prep_totals import PREP_STATUSES, rebuild_prep_totals
+from ...domain.entities.order import OrderStatus
+
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+def _reject_constant(name):
+    raise ValueError(f'{name} is not JSON')
+
+def parse_items(items_json: Optional[str]) -> Counter:
+    # Must count exactly what the prep_list_totals triggers count (see
+    # database/prep_totals.py)
+    counts = Counter()
+    try:
+        items = json.loads(items_json, parse_constant=_reject_constant) if items_json else []
+    except ValueError:
+        return counts
+    for item in items if isinstance(items, list) else []:
+        if isinstance(item, str):
+            name, qty = item, 1
+        elif isinstance(item, dict):
+            name = item.get('name')
+            qty = next((item[key] for key in ('qty', 'quantity') if item.get(key) is not None), 1)
+        else:
+            continue
+        if isinstance(qty, str):
+            qty = qty.strip(' ')
+            if not (qty.isascii() and qty.isdigit()):
+                continue
+        elif not isinstance(qty, (int, float)):
+            continue
+        qty = int(qty)
+        if isinstance(name, str) and name.strip(' ') and qty > 0:
+            counts[name.strip(' ').translate(_ASCII_LOWER)] += qty
+    return counts
+
+class PrepList:
+    # Item totals over the orders still in the kitchen, per status. The
+    # totals live in prep_list_totals and are adjusted on every order write,
+    # so all workers share them and a read is O(distinct items) plus an index
+    # count of the active orders. On SQLite triggers adjust them (see
+    # database/prep_totals.py). Other backends have no triggers: writers call
+    # lock() or remember() with what the orders counted before the write, and
+    # apply_writes() moves the difference into the totals before commit.
+    TRACKED = PREP_STATUSES
+    _BEFORE = 'prep_list_before'
+    
+    def rebuild(self) -> None:
+        if is_sqlite():
+            rebuild_prep_totals()
+            return
+        totals = Counter()
+        rows = db.session.query(OrderModel.status, OrderModel.items)\
+            .filter(OrderModel.status.in_(self.TRACKED))\
+            .yield_per(1000)
+        for status, items in rows:
+            for name, qty in parse_items(items).items():
+                totals[status, name] += qty
+        db.session.query(PrepListTotalModel).delete()
+        db.session.add_all(
+            PrepListTotalModel(status=status, name=name, quantity=quantity)
+            for (status, name), quantity in totals.items()
+        )
+        db.session.commit()
+    
+    def remember(self, before: Dict[int, Optional[Tuple[str, Optional[str]]]]) -> None:
+        # (status, items) of each order before this transaction wrote it, or
+        # None for an order it inserted; the first state remembered wins
+        if is_sqlite():
+            return
+        remembered = db.session.info.setdefault(self._BEFORE, {})
+        for order_id, state in before.items():
+            remembered.setdefault(order_id, state)
+    
+    def lock(self, order_ids: Iterable[int]) -> None:
+        # Remembers the orders as they are now, row-locked until commit so no
+        # other writer changes them in between
+        if is_sqlite():
+            return
+        ids = list(order_ids)
+        for start in range(0, len(ids), IN_CLAUSE_CHUNK):
+            rows = db.session.query(OrderModel.id, OrderModel.status, OrderModel.items)\
+                .filter(OrderModel.id.in_(ids[start:start + IN_CLAUSE_CHUNK]))\
+                .with_for_update()
+            self.remember({order_id: (status, items) for order_id, status, items in rows})
+    
+    def apply_writes(self) -> None:
+        remembered = db.session.info.pop(self._BEFORE, None)
+        if not remembered:
+            return
+        ids = list(remembered)
+        after = {}
+        for start in range(0, len(ids), IN_CLAUSE_CHUNK):
+            rows = db.session.query(OrderModel.id, OrderModel.status, OrderModel.items)\
+                .filter(OrderModel.id.in_(ids[start:start + IN_CLAUSE_CHUNK]))
+            after.update((order_id, (status, items)) for order_id, status, items in rows)
+        
+        changes = Counter()
+        for order_id, before in remembered.items():
+            for state, sign in ((before, -1), (after.get(order_id), 1)):
+                if state and state[0] in self.TRACKED:
+                    for name, qty in parse_items(state[1]).items():
+                        changes[state[0], name] += sign * qty
+        # Sorted so concurrent writers take the total rows' locks in one order
+        for (status, name), change in sorted(changes.items()):
+            if change:
+                self._add(status, name, change)
+        db.session.query(PrepListTotalModel).filter(PrepListTotalModel.quantity <= 0)\
+            .delete(synchronize_session=False)
+    
+    def _increment(self, status: str, name: str, change: int) -> int:
+        return db.session.query(PrepListTotalModel)\
+            .filter(PrepListTotalModel.status == status, PrepListTotalModel.name == name)\
+            .update({PrepListTotalModel.quantity: PrepListTotalModel.quantity + change},
+                    synchronize_session=False)
+    
+    def _add(self, status: str, name: str, change: int) -> None:
+        if self._increment(status, name, change) or change < 0:
+            return
+        # A concurrent first insert of the same item makes this one fail and
+        # the update is repeated against its row
+        try:
+            with db.session.begin_nested():
+                db.session.add(PrepListTotalModel(status=status, name=name, quantity=change))
+        except IntegrityError:
+            self._increment(status, name, change)
+    
+    def _totals(self) -> List[Tuple[str, str, int]]:
+        return db.session.query(
+            PrepListTotalModel.status, PrepListTotalModel.name, PrepListTotalModel.quantity
+        ).all()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        totals = {}
+        for status, name, quantity in self._totals():
+            totals.setdefault(name, {'name': name, **{tracked: 0 for tracked in self.TRACKED}})[status] += quantity
+        order_counts = dict(
+            db.session.query(OrderModel.status, db.func.count())
+            .filter(OrderModel.status.in_(self.TRACKED))
+            .group_by(OrderModel.status)
+        )
+        items = sorted(totals.values(), key=lambda item: (-item[OrderStatus.PENDING.value], item['name']))
+        return {
+            'items': items,
+            'orders': {status: order_counts.get(status, 0) for status in self.TRACKED}
+        }
\ No newline at end of file
@@ -0,0 +1,126 @@
+import threading
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Tuple
+from sqlalchemy.orm import aliased
+from .prep_list import parse_items
+from .quantile_sketch import QuantileSketch
+from .table_version import TableVersion, orders_version
+from ..database.session import db
+from ..database.models import OrderModel, OrderStatusEventModel
+from ...domain.entities.order import OrderStatus
+
+SYNC_BATCH_SIZE = 5000
+
+class PrepTimeStats:
+    # Prep time is PREPARING -> READY of one order, taken from
+    # order_status_events. Each READY event is added once to a quantile
+    # sketch for its UTC hour and to one per (day, cook) and (day, item), so a
+    # report over N days merges at most N * 24 + N * (cooks + items) small
+    # sketches and never rereads the history.
+    #
+    # Like TokenEpochCache, only events above the last id seen are read, and
+    # only after orders_version moved; the first sync loads window_days.
+    # Sketches older than the window are dropped.
+    
+    def __init__(self, window_days: int = 7, relative_accuracy: float = 0.01,
+                 version: TableVersion = orders_version):
+        self.window_days = window_days
+        self.relative_accuracy = relative_accuracy
+        self.version = version
+        self._lock = threading.Lock()
+        self._hours: Dict[datetime, QuantileSketch] = {}
+        self._cooks: Dict[Tuple[date, int], QuantileSketch] = {}
+        self._items: Dict[Tuple[date, str], QuantileSketch] = {}
+        self._last_event_id = 0
+        self._seen_version = -1
+    
+    def _sketch(self, sketches: dict, key) -> QuantileSketch:
+        sketch = sketches.get(key)
+        if sketch is None:
+            sketch = sketches[key] = QuantileSketch(self.relative_accuracy)
+        return sketch
+    
+    def _query(self, since: datetime):
+        event = OrderStatusEventModel
+        started = aliased(OrderStatusEventModel)
+        started_at = db.select(started.created_at)\
+            .where(started.order_id == event.order_id,
+                   started.to_status == OrderStatus.PREPARING.value,
+                   started.id < event.id)\
+            .order_by(started.id.desc())\
+            .limit(1)\
+            .scalar_subquery()
+        return db.select(event.id, event.created_at, event.assigned_to, started_at, OrderModel.items)\
+            .outerjoin(OrderModel, OrderModel.id == event.order_id)\
+            .where(event.id > self._last_event_id,
+                   event.to_status == OrderStatus.READY.value,
+                   event.created_at >= since)\
+            .order_by(event.id)\
+            .limit(SYNC_BATCH_SIZE)
+    
+    def _prune(self, now: datetime) -> None:
+        first_day = now.date() - timedelta(days=self.window_days - 1)
+        first_hour = datetime.combine(first_day, datetime.min.time())
+        for hour in [hour for hour in self._hours if hour < first_hour]:
+            del self._hours[hour]
+        for sketches in (self._cooks, self._items):
+            for key in [key for key in sketches if key[0] < first_day]:
+                del sketches[key]
+    
+    def sync(self) -> None:
+        version = self.version.value
+        if version == self._seen_version:
+            return
+        with self._lock:
+            if version == self._seen_version:
+                return
+            now = datetime.utcnow()
+            since = datetime.combine(now.date() - timedelta(days=self.window_days - 1), datetime.min.time())
+            while True:
+                rows = db.session.execute(self._query(since)).all()
+                for event_id, ready_at, cook, started_at, items_json in rows:
+                    self._last_event_id = event_id
+                    if started_at is None:
+                        continue
+                    seconds = max((ready_at - started_at).total_seconds(), 0.0)
+                    day = ready_at.date()
+                    self._sketch(self._hours, ready_at.replace(minute=0, second=0, microsecond=0)).add(seconds)
+                    if cook is not None:
+                        self._sketch(self._cooks, (day, cook)).add(seconds)
+                    for name in parse_items(items_json):
+                        self._sketch(self._items, (day, name)).add(seconds)
+                if len(rows) < SYNC_BATCH_SIZE:
+                    break
+            self._prune(now)
+            self._seen_version = version
+    
+    def report(self, days: int = 1) -> Dict[str, Any]:
+        self.sync()
+        first_day = datetime.utcnow().date() - timedelta(days=days - 1)
+        with self._lock:
+            hours = sorted(hour for hour in self._hours if hour.date() >= first_day)
+            by_cook = defaultdict(list)
+            for (day, cook), sketch in self._cooks.items():
+                if day >= first_day:
+                    by_cook[cook].append(sketch)
+            by_item = defaultdict(list)
+            for (day, name), sketch in self._items.items():
+                if day >= first_day:
+                    by_item[name].append(sketch)
+            
+            merged = lambda sketches: QuantileSketch.merged(sketches, self.relative_accuracy).summary()
+            return {
+                'overall': merged(self._hours[hour] for hour in hours),
+                'by_hour': [
+                    {'hour': hour.isoformat() + 'Z', **self._hours[hour].summary()} for hour in hours
+                ],
+                'by_cook': sorted(
+                    ({'user_id': cook, **merged(sketches)} for cook, sketches in by_cook.items()),
+                    key=lambda row: row['user_id']
+                ),
+                'by_item': sorted(
+                    ({'name': name, **merged(sketches)} for name, sketches in by_item.items()),
+                    key=lambda row: row['name']
+                ),
+            }
\ No newline at end of file
@@ -0,0 +1,80 @@
+import math
+from typing import Dict, Iterable, Optional
+
+class QuantileSketch:
+    # DDSketch: a value v goes to the bucket ceil(log_gamma(v)), so every
+    # quantile is returned within relative_accuracy of the true value for any
+    # distribution. Memory grows with log(max / min) rather than with the
+    # number of values (about 900 buckets cover 1 ms to 1 day at 1%), and two
+    # sketches merge exactly by adding their bucket counts.
+    MIN_VALUE = 1e-3
+    
+    def __init__(self, relative_accuracy: float = 0.01):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._buckets: Dict[int, int] = {}
+        self._zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+    
+    def add(self, value: float) -> None:
+        if value < self.MIN_VALUE:
+            self._zero_count += 1
+        else:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self._buckets[key] = self._buckets.get(key, 0) + 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+    
+    def merge(self, other: 'QuantileSketch') -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracies")
+        for key, count in other._buckets.items():
+            self._buckets[key] = self._buckets.get(key, 0) + count
+        self._zero_count += other._zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+    
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self._zero_count
+        if rank < seen:
+            return self.min
+        for key in sorted(self._buckets):
+            seen += self._buckets[key]
+            if seen > rank:
+                # Midpoint of the bucket (gamma^(k-1), gamma^k] in relative terms
+                value = 2 * self._gamma ** key / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+    
+    def summary(self, quantiles: Iterable[float] = (0.5, 0.9, 0.95, 0.99), digits: int = 1) -> Dict[str, Optional[float]]:
+        if not self.count:
+            return {'count': 0}
+        result = {
+            'count': self.count,
+            'mean': round(self.sum / self.count, digits),
+            'min': round(self.min, digits),
+            'max': round(self.max, digits),
+        }
+        for q in quantiles:
+            result[f'p{q * 100:g}'] = round(self.quantile(q), digits)
+        return result
+    
+    @classmethod
+    def merged(cls, sketches: Iterable['QuantileSketch'], relative_accuracy: float) -> 'QuantileSketch':
+        total = cls(relative_accuracy)
+        for sketch in sketches:
+            total.merge(sketch)
+        return total
\ No newline at end of file
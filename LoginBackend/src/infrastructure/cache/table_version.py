@@ -0,0 +1,57 @@
+from sqlalchemy.exc import IntegrityError
+from ..database.session import db
+from ..database.models import TableVersionModel
+
+class TableVersion:
+    # A change counter stored in table_versions, so it is shared by every
+    # worker, whether or not they were forked from a preloaded master, and by
+    # every host on the same database. Writers call bump() before they
+    # commit: the increment is part of their transaction, and because the
+    # database serializes writers each bump returns exactly the previous
+    # value plus one. Reads are a primary-key lookup.
+    
+    def __init__(self, name: str):
+        self.name = name
+    
+    @property
+    def value(self) -> int:
+        version = db.session.execute(
+            db.select(TableVersionModel.version).where(TableVersionModel.name == self.name)
+        ).scalar()
+        return version or 0
+    
+    def _increment(self):
+        return db.session.execute(
+            db.update(TableVersionModel)
+            .where(TableVersionModel.name == self.name)
+            .values(version=TableVersionModel.version + 1)
+            .returning(TableVersionModel.version)
+            .execution_options(synchronize_session=False)
+        ).scalar()
+    
+    def bump(self) -> int:
+        version = self._increment()
+        if version is None:
+            # First bump ever; a concurrent first bump makes the insert fail
+            # and the update is repeated against its row
+            try:
+                with db.session.begin_nested():
+                    db.session.add(TableVersionModel(name=self.name, version=1))
+                return 1
+            except IntegrityError:
+                version = self._increment()
+        return version
+    
+    def etag(self, *parts) -> str:
+        tag = f"{self.name}-{self.value}"
+        if parts:
+            tag += '-' + '-'.join(str(part) for part in parts)
+        return tag
+
+orders_version = TableVersion('orders')
+# Bumped when an existing user changes or goes away, which is what order
+# responses with expanded user summaries depend on
+users_version = TableVersion('users')
+# Hands out users.token_epoch values; run_migrations starts it above every
+# epoch stored before it existed
+token_epochs_version = TableVersion('token_epochs')
\ No newline at end of file
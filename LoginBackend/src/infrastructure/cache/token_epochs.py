@@ -0,0 +1,46 @@
+import time
+import threading
+from typing import Dict
+from ...domain.repositories.user_repository import UserRepository
+
+class TokenEpochCache:
+    # user id -> current token epoch, holding only users whose tokens were
+    # ever revoked (everyone else is implicitly 0). Epochs come from one
+    # counter row in the database, committed in increasing order, so the
+    # latest epoch doubles as a change counter seen by every worker and host.
+    # It is polled at most once per ttl seconds (a primary-key lookup); only
+    # when it passed the high-water mark are the newer rows read. A
+    # revocation therefore takes effect everywhere within ttl seconds.
+    
+    def __init__(self, user_repository: UserRepository, ttl: float = 1.0):
+        self.user_repository = user_repository
+        self.ttl = ttl
+        self._epochs: Dict[int, int] = {}
+        self._high_water = 0
+        self._next_poll = 0.0
+        self._lock = threading.Lock()
+    
+    def _sync(self) -> None:
+        if time.monotonic() < self._next_poll:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if now < self._next_poll:
+                return
+            if self.user_repository.latest_token_epoch() > self._high_water:
+                for user_id, epoch in self.user_repository.find_token_epochs_since(self._high_water):
+                    self._epochs[user_id] = epoch
+                    if epoch > self._high_water:
+                        self._high_water = epoch
+            self._next_poll = now + self.ttl
+    
+    def expire(self) -> None:
+        # Makes the next check poll, e.g. right after this process revoked
+        self._next_poll = 0.0
+    
+    def is_current(self, user_id: int, token_epoch: int) -> bool:
+        self._sync()
+        return token_epoch >= self._epochs.get(user_id, 0)
+    
+    def __len__(self) -> int:
+        return len(self._epochs)
\ No newline at end of file
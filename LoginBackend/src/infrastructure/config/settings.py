@@ -3,13 +3,92 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+def _sqlite_path(database_url):
+    if not database_url.startswith("sqlite:///"):
+        return None
+    path = database_url[len("sqlite:///"):].split("?", 1)[0]
+    if not path or path == ":memory:":
+        return None
+    # Flask-SQLAlchemy resolves relative SQLite paths against the instance folder
+    if not os.path.isabs(path):
+        path = os.path.join(BASE_DIR, "instance", path)
+    return path
+
 class Settings:
     DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///auth.db")
+    DATABASE_PATH = _sqlite_path(DATABASE_URL)
     
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
     JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "1440"))
+    # Longest a revoked token keeps working on a worker that did not revoke it
+    TOKEN_EPOCH_TTL_SECONDS = float(os.getenv("TOKEN_EPOCH_TTL_SECONDS", "1"))
     DEBUG = os.getenv("DEBUG", "False").lower() == "true"
     FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
+    # Shared secret gateways send as "Authorization: Bearer ..." to /introspect.
+    # Without it only access tokens holding tokens_introspect may call it
+    INTROSPECTION_SECRET = os.getenv("INTROSPECTION_SECRET", "")
+    
+    # Social login is enabled per provider by setting its client id
+    OIDC_REDIRECT_BASE_URL = os.getenv("OIDC_REDIRECT_BASE_URL", "http://localhost:5000")
+    OIDC_CACHE_TTL = int(os.getenv("OIDC_CACHE_TTL", "3600"))
+    GOOGLE_OIDC_ISSUER = os.getenv("GOOGLE_OIDC_ISSUER", "https://accounts.google.com")
+    GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID", "")
+    GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET", "")
+    
+    PASSWORD_MIN_LENGTH = int(os.getenv("PASSWORD_MIN_LENGTH", "8"))
+    PASSWORD_REQUIRE_DIGIT = os.getenv("PASSWORD_REQUIRE_DIGIT", "True").lower() == "true"
+    PASSWORD_REQUIRE_LETTER = os.getenv("PASSWORD_REQUIRE_LETTER", "True").lower() == "true"
+    PASSWORD_REQUIRE_UPPER = os.getenv("PASSWORD_REQUIRE_UPPER", "False").lower() == "true"
+    PASSWORD_REQUIRE_LOWER = os.getenv("PASSWORD_REQUIRE_LOWER", "False").lower() == "true"
+    PASSWORD_REQUIRE_SYMBOL = os.getenv("PASSWORD_REQUIRE_SYMBOL", "False").lower() == "true"
+    # bcrypt or argon2id; hashes made by the other one are upgraded on login
+    PASSWORD_HASHER = os.getenv("PASSWORD_HASHER", "bcrypt")
+    ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "3"))
+    ARGON2_MEMORY_COST_KIB = int(os.getenv("ARGON2_MEMORY_COST_KIB", "65536"))
+    ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "4"))
+    
+    # Empty calibrates the cost once so one hash takes about BCRYPT_TARGET_MS,
+    # and keeps the result in BCRYPT_CALIBRATION_PATH for later starts on the
+    # same host (recalibrated after 30 days or on other hardware)
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS") or 0)
+    BCRYPT_TARGET_MS = float(os.getenv("BCRYPT_TARGET_MS", "250"))
+    BCRYPT_MIN_ROUNDS = int(os.getenv("BCRYPT_MIN_ROUNDS", "10"))
+    BCRYPT_MAX_ROUNDS = int(os.getenv("BCRYPT_MAX_ROUNDS", "16"))
+    BCRYPT_CALIBRATION_PATH = os.getenv(
+        "BCRYPT_CALIBRATION_PATH", os.path.join(BASE_DIR, "instance", "bcrypt_rounds")
+    )
+    
+    # Prep-time report window and the relative error of its percentiles
+    PREP_TIMES_WINDOW_DAYS = int(os.getenv("PREP_TIMES_WINDOW_DAYS", "7"))
+    PREP_TIMES_RELATIVE_ACCURACY = float(os.getenv("PREP_TIMES_RELATIVE_ACCURACY", "0.01"))
+    
+    # Served and cancelled orders untouched for ARCHIVE_RETENTION_DAYS are moved
+    # to Arrow files under ARCHIVE_DIR by scripts/archive_orders.py
+    ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", os.path.join(BASE_DIR, "instance", "archive"))
+    ARCHIVE_RETENTION_DAYS = int(os.getenv("ARCHIVE_RETENTION_DAYS", "90"))
+    ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "5000"))
+    ARCHIVE_COMPRESSION = os.getenv("ARCHIVE_COMPRESSION", "zstd")
+    
+    # Sorted SHA-1 digest file built by scripts/build_breached_list.py; empty disables the check
+    BREACHED_PASSWORDS_PATH = os.getenv("BREACHED_PASSWORDS_PATH", "")
+    
+    # Matches SQLAlchemy's default pool (5 + 10 overflow), so request threads
+    # never queue for a database connection
+    ASGI_WORKER_THREADS = int(os.getenv("ASGI_WORKER_THREADS", "15"))
+    
+    WEB_BIND = os.getenv("WEB_BIND", "0.0.0.0:5000")
+    WEB_WORKERS = int(os.getenv("WEB_WORKERS", str((os.cpu_count() or 1) * 2 + 1)))
+    WEB_THREADS = int(os.getenv("WEB_THREADS", "2"))
+    WEB_MAX_REQUESTS = int(os.getenv("WEB_MAX_REQUESTS", "5000"))
+    WEB_MAX_REQUESTS_JITTER = int(os.getenv("WEB_MAX_REQUESTS_JITTER", "500"))
+    WEB_TIMEOUT = int(os.getenv("WEB_TIMEOUT", "30"))
+    WEB_GRACEFUL_TIMEOUT = int(os.getenv("WEB_GRACEFUL_TIMEOUT", "30"))
+    
+    # Held while create_app calibrates, migrates and seeds, so workers started
+    # together (serve.py --no-preload) take turns
+    STARTUP_LOCK_PATH = os.getenv("STARTUP_LOCK_PATH", os.path.join(BASE_DIR, "instance", "startup.lock"))
 
 settings = Settings()
\ No newline at end of file
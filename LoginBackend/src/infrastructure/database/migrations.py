@@ -0,0 +1,167 @@
+from typing import TYPE_CHECKING
+from sqlalchemy import inspect, text
+from .session import db, is_sqlite
+from .models import UserModel, TableVersionModel
+from .rollups import ROLLUP_TRIGGERS, rebuild_rollups, rollups_missing
+from .prep_totals import PREP_TOTALS_TRIGGERS
+from ...domain.value_objects.email import normalize_email
+
+if TYPE_CHECKING:
+    from ..archive.order_archive import OrderArchive
+
+# db.create_all() only creates missing tables, so columns and indexes added to
+# existing tables after the first release are applied here
+ADDED_COLUMNS = {
+    'orders': [
+        ('version', 'INTEGER NOT NULL DEFAULT 1'),
+    ],
+    'users': [
+        ('email_normalized', 'VARCHAR(255)'),
+        ('token_epoch', 'INTEGER NOT NULL DEFAULT 0'),
+    ],
+}
+
+BACKFILL_BATCH_SIZE = 5000
+
+# Fills a column added above from another column of the same row. Rows are
+# walked in primary-key order, one committed batch at a time, so a large table
+# is never locked for the whole backfill and an interrupted run resumes where
+# it stopped (only rows still NULL are picked up).
+BACKFILLS = [
+    ('users', 'email_normalized', 'email', normalize_email),
+]
+
+# Same text format SQLAlchemy writes for DateTime columns on SQLite
+_NOW = "strftime('%Y-%m-%d %H:%M:%f', 'now') || '000'"
+
+# Record every change of orders.status in order_status_events, and keep the
+# order rollups and the prep list totals in step (see rollups.py and
+# prep_totals.py)
+TRIGGERS = {
+    'trg_orders_status_insert': (
+        'AFTER INSERT ON orders '
+        'WHEN NEW.status IS NOT NULL '
+        'BEGIN '
+        'INSERT INTO order_status_events (order_id, from_status, to_status, assigned_to, created_at) '
+        f'VALUES (NEW.id, NULL, NEW.status, NEW.assigned_to, {_NOW}); '
+        'END'
+    ),
+    'trg_orders_status_update': (
+        'AFTER UPDATE OF status ON orders '
+        'WHEN NEW.status IS NOT NULL AND OLD.status IS NOT NEW.status '
+        'BEGIN '
+        'INSERT INTO order_status_events (order_id, from_status, to_status, assigned_to, created_at) '
+        f'VALUES (NEW.id, OLD.status, NEW.status, NEW.assigned_to, {_NOW}); '
+        'END'
+    ),
+    **ROLLUP_TRIGGERS,
+    **PREP_TOTALS_TRIGGERS,
+}
+
+def _backfill(table, column, source, transform, batch_size):
+    last_id = 0
+    total = 0
+    while True:
+        rows = db.session.execute(
+            text(f'SELECT id, {source} FROM {table} '
+                 f'WHERE id > :last_id AND {column} IS NULL AND {source} IS NOT NULL '
+                 f'ORDER BY id LIMIT :limit'),
+            {'last_id': last_id, 'limit': batch_size}
+        ).all()
+        if not rows:
+            break
+        db.session.execute(
+            text(f'UPDATE {table} SET {column} = :value WHERE id = :id'),
+            [{'id': row_id, 'value': transform(value)} for row_id, value in rows]
+        )
+        db.session.commit()
+        last_id = rows[-1][0]
+        total += len(rows)
+    if total:
+        print(f"Backfilled {table}.{column} for {total} rows")
+
+def _park_email_collisions():
+    # Accounts created before email_normalized existed may share one
+    # normalized address. The oldest account keeps it (it is the one logins
+    # already resolved to); the others get '<address>#<id>', which no lookup
+    # can match, so the unique index can be built. They are listed for an
+    # admin to merge or delete.
+    duplicates = db.session.execute(text(
+        'SELECT id, email FROM users u WHERE EXISTS ('
+        'SELECT 1 FROM users o WHERE o.email_normalized = u.email_normalized AND o.id < u.id'
+        ') ORDER BY id'
+    )).all()
+    if not duplicates:
+        return
+    db.session.execute(
+        db.update(UserModel)
+        .where(UserModel.id.in_([user_id for user_id, _ in duplicates]))
+        .values(email_normalized=UserModel.email_normalized + '#' + db.cast(UserModel.id, db.String))
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    for user_id, email in duplicates:
+        print(f"User {user_id} ({email}) shares a normalized email with an older account; "
+              f"it can no longer sign in by email until merged or removed")
+
+def _seed_token_epochs():
+    # Epochs handed out before the token_epochs counter existed came from
+    # max(users.token_epoch) + 1; the counter continues above them
+    issued = db.session.query(db.func.max(UserModel.token_epoch)).scalar() or 0
+    counter = db.session.get(TableVersionModel, 'token_epochs')
+    if counter is None:
+        db.session.add(TableVersionModel(name='token_epochs', version=issued))
+    elif counter.version < issued:
+        counter.version = issued
+    db.session.commit()
+
+def run_migrations(archive: 'OrderArchive'):
+    inspector = inspect(db.engine)
+    
+    for table, columns in ADDED_COLUMNS.items():
+        existing = {column['name'] for column in inspector.get_columns(table)}
+        for name, ddl in columns:
+            if name not in existing:
+                db.session.execute(text(f'ALTER TABLE {table} ADD COLUMN {name} {ddl}'))
+                print(f"Added column {table}.{name}")
+    
+    db.session.commit()
+    
+    for table, column, source, transform in BACKFILLS:
+        _backfill(table, column, source, transform, BACKFILL_BATCH_SIZE)
+    
+    _park_email_collisions()
+    _seed_token_epochs()
+    
+    # An index that later became unique is dropped and rebuilt
+    inspector = inspect(db.engine)
+    for table in db.metadata.sorted_tables:
+        unique = {index['name']: bool(index['unique']) for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if unique.get(index.name, bool(index.unique)) != bool(index.unique):
+                index.drop(db.engine)
+                print(f"Rebuilding index {index.name}")
+            index.create(db.engine, checkfirst=True)
+    
+    if not is_sqlite():
+        print(f"Order triggers skipped on {db.engine.dialect.name}: they are SQLite-only, so order "
+              "status history and /kitchen/reports stay empty; prep list totals are kept by the app")
+        return
+    
+    # sqlite_master keeps the CREATE statement verbatim, so a trigger whose
+    # definition changed since it was created is replaced
+    for name, ddl in TRIGGERS.items():
+        statement = f'CREATE TRIGGER {name} {ddl}'
+        current = db.session.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = :name"),
+            {'name': name}
+        ).scalar()
+        if current != statement:
+            db.session.execute(text(f'DROP TRIGGER IF EXISTS {name}'))
+            db.session.execute(text(statement))
+    db.session.commit()
+    
+    # Orders written before the rollup triggers existed
+    if rollups_missing():
+        rebuild_rollups(archive)
+        print("Backfilled order rollups")
\ No newline at end of file
@@ -1,11 +1,22 @@
 from datetime import datetime
+from sqlalchemy.orm import validates
 from src.infrastructure.database.session import db
+from src.domain.value_objects.email import normalize_email
 
 class UserModel(db.Model):
     __tablename__ = 'users'
+    __table_args__ = (
+        # find_by_provider's lookup; local accounts have a NULL provider_id,
+        # which SQLite treats as distinct, so they never collide
+        db.Index('ux_users_provider_provider_id', 'provider', 'provider_id', unique=True),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(255), unique=True, nullable=False, index=True)
+    # Every lookup by email goes through this column so it is case-insensitive
+    # and still indexed; kept in sync with email by normalize_email_column.
+    # Unique, so two spellings of one address cannot become two accounts
+    email_normalized = db.Column(db.String(255), unique=True, index=True)
     username = db.Column(db.String(100))
     password_hash = db.Column(db.String(255))
     role = db.Column(db.String(50), default='user')
@@ -14,9 +25,18 @@ class UserModel(db.Model):
     is_active = db.Column(db.Boolean, default=True)
     is_verified = db.Column(db.Boolean, default=False)
     last_login = db.Column(db.DateTime)
+    # Tokens carrying a lower epoch are revoked. Values come from one global
+    # sequence (max + 1 on every bump) so workers can load only the rows
+    # changed since the highest epoch they have seen
+    token_epoch = db.Column(db.Integer, nullable=False, default=0, server_default='0', index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    @validates('email')
+    def normalize_email_column(self, key, email):
+        self.email_normalized = normalize_email(email) if email else None
+        return email
+    
     def to_entity(self):
         from src.domain.entities.user import User, UserRole, AuthProvider
         return User(
@@ -30,6 +50,7 @@ class UserModel(db.Model):
             is_active=self.is_active,
             is_verified=self.is_verified,
             last_login=self.last_login,
+            token_epoch=self.token_epoch or 0,
             created_at=self.created_at,
             updated_at=self.updated_at
         )
@@ -50,6 +71,9 @@ class UserModel(db.Model):
     
 class OrderModel(db.Model):
     __tablename__ = 'orders'
+    __table_args__ = (
+        db.Index('ix_orders_status_created_at', 'status', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     order_number = db.Column(db.String(50), unique=True, nullable=False)
@@ -61,6 +85,7 @@ class OrderModel(db.Model):
     kitchen_notes = db.Column(db.Text)
     created_by = db.Column(db.Integer, db.ForeignKey('users.id'))
     assigned_to = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -79,6 +104,84 @@ class OrderModel(db.Model):
             'kitchen_notes': self.kitchen_notes,
             'created_by': self.created_by,
             'assigned_to': self.assigned_to,
+            'version': self.version,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
\ No newline at end of file
+        }
+
+# Append-only history of order status changes. Rows are written by the
+# triggers in migrations.TRIGGERS, inside the statement that changes
+# orders.status, so every write path (single, bulk, claim-next) records its
+# transitions in the same transaction and with the real previous status.
+class OrderStatusEventModel(db.Model):
+    __tablename__ = 'order_status_events'
+    __table_args__ = (
+        db.Index('ix_order_status_events_order_id_to_status', 'order_id', 'to_status'),
+        db.Index('ix_order_status_events_to_status', 'to_status'),
+        db.Index('ix_order_status_events_created_at', 'created_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    # No foreign key: the history outlives deleted orders
+    order_id = db.Column(db.Integer, nullable=False)
+    from_status = db.Column(db.String(50))
+    to_status = db.Column(db.String(50), nullable=False)
+    assigned_to = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+# Order count and revenue per bucket of orders.created_at (UTC), kept in step
+# with the orders table by the triggers in rollups.py. Revenue is in integer
+# cents so the running additions and subtractions stay exact.
+class OrderRollupHourlyModel(db.Model):
+    __tablename__ = 'order_rollups_hourly'
+    
+    bucket = db.Column(db.String(19), primary_key=True)
+    order_count = db.Column(db.Integer, nullable=False, default=0)
+    cancelled_count = db.Column(db.Integer, nullable=False, default=0)
+    revenue_cents = db.Column(db.Integer, nullable=False, default=0)
+
+class OrderRollupDailyModel(db.Model):
+    __tablename__ = 'order_rollups_daily'
+    
+    bucket = db.Column(db.String(10), primary_key=True)
+    order_count = db.Column(db.Integer, nullable=False, default=0)
+    cancelled_count = db.Column(db.Integer, nullable=False, default=0)
+    revenue_cents = db.Column(db.Integer, nullable=False, default=0)
+
+# One compressed Arrow IPC file of archived orders, written by OrderArchive.
+# The row is committed in the transaction that deletes those orders, so a file
+# without one is left over from an interrupted run and is never read. While
+# pending rows exist, deleting an order does not touch the rollups (the
+# archived orders still count in the reports).
+class OrderArchiveFileModel(db.Model):
+    __tablename__ = 'order_archive_files'
+    __table_args__ = (
+        db.Index('ix_order_archive_files_partition_date', 'partition_date'),
+        db.Index('ix_order_archive_files_pending', 'pending'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    partition_date = db.Column(db.String(10), nullable=False)
+    path = db.Column(db.String(255), unique=True, nullable=False)
+    row_count = db.Column(db.Integer, nullable=False)
+    first_order_id = db.Column(db.Integer, nullable=False)
+    last_order_id = db.Column(db.Integer, nullable=False)
+    pending = db.Column(db.Boolean, nullable=False, default=False, server_default='0')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+# Change counter per table, bumped by writers inside their own transaction
+# (see cache/table_version.py). Being a row, every worker and host sees it.
+class TableVersionModel(db.Model):
+    __tablename__ = 'table_versions'
+    
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+# Item quantities over the orders still in the kitchen, per status. Kept by
+# the triggers in prep_totals.py, so every worker reads the same totals.
+class PrepListTotalModel(db.Model):
+    __tablename__ = 'prep_list_totals'
+    
+    status = db.Column(db.String(20), primary_key=True)
+    name = db.Column(db.String(200), primary_key=True)
+    quantity = db.Column(db.Integer, nullable=False, default=0)
\ No newline at end of file
@@ -0,0 +1,74 @@
+from sqlalchemy import text
+from .session import db
+from ...domain.entities.order import OrderStatus
+
+PREP_STATUSES = (OrderStatus.PENDING.value, OrderStatus.PREPARING.value)
+_TRACKED = '(' + ', '.join(f"'{status}'" for status in PREP_STATUSES) + ')'
+
+# Same reading of the items JSON as cache/prep_list.parse_items: a string
+# counts once, an object gives name and qty (or quantity, default 1); a
+# quantity is a number (truncated) or a string of digits, anything else
+# counts 0. Blank names, non-positive quantities and anything but an array
+# count nothing. Names are trimmed of spaces and only ASCII is lowercased.
+_NAME = "lower(trim(CASE i.type WHEN 'text' THEN i.value ELSE json_extract(i.value, '$.name') END))"
+_RAW_QTY = ("CASE i.type WHEN 'text' THEN 1 ELSE coalesce("
+            "json_extract(i.value, '$.qty'), json_extract(i.value, '$.quantity'), 1) END")
+_QTY = (f"CASE WHEN typeof({_RAW_QTY}) <> 'text' THEN CAST({_RAW_QTY} AS INTEGER) "
+        f"WHEN trim({_RAW_QTY}) <> '' AND trim({_RAW_QTY}) NOT GLOB '*[^0-9]*' "
+        f"THEN CAST(trim({_RAW_QTY}) AS INTEGER) ELSE 0 END")
+
+def _entries(items, columns='', source=''):
+    array = f"CASE WHEN json_valid({items}) AND json_type({items}) = 'array' THEN {items} ELSE '[]' END"
+    return (
+        f'SELECT {columns}{_NAME} AS name, {_QTY} AS qty FROM {source}json_each({array}) AS i '
+        "WHERE i.type = 'text' OR (i.type = 'object' AND json_type(i.value, '$.name') = 'text')"
+    )
+
+def _add(row):
+    return (
+        'INSERT INTO prep_list_totals (status, name, quantity) '
+        f"SELECT {row}.status, name, SUM(qty) FROM ({_entries(row + '.items')}) "
+        f"WHERE {row}.status IN {_TRACKED} AND name <> '' AND qty > 0 GROUP BY name "
+        'ON CONFLICT (status, name) DO UPDATE SET quantity = quantity + excluded.quantity; '
+    )
+
+def _subtract(row):
+    counted = f"SELECT name, SUM(qty) AS qty FROM ({_entries(row + '.items')}) WHERE name <> '' AND qty > 0 GROUP BY name"
+    return (
+        'UPDATE prep_list_totals SET quantity = quantity - '
+        f'(SELECT c.qty FROM ({counted}) AS c WHERE c.name = prep_list_totals.name) '
+        f'WHERE status = {row}.status AND name IN (SELECT name FROM ({counted})); '
+        f'DELETE FROM prep_list_totals WHERE status = {row}.status AND quantity <= 0; '
+    )
+
+# Applied by run_migrations. An order entering, leaving or changing inside the
+# tracked statuses moves its items in the same statement as the write
+PREP_TOTALS_TRIGGERS = {
+    'trg_orders_prep_insert': (
+        f'AFTER INSERT ON orders WHEN NEW.status IN {_TRACKED} '
+        f"BEGIN {_add('NEW')}END"
+    ),
+    'trg_orders_prep_delete': (
+        f'AFTER DELETE ON orders WHEN OLD.status IN {_TRACKED} '
+        f"BEGIN {_subtract('OLD')}END"
+    ),
+    'trg_orders_prep_update': (
+        'AFTER UPDATE OF status, items ON orders '
+        f'WHEN (OLD.status IN {_TRACKED} OR NEW.status IN {_TRACKED}) '
+        'AND (OLD.status IS NOT NEW.status OR OLD.items IS NOT NEW.items) '
+        f"BEGIN {_subtract('OLD')}{_add('NEW')}END"
+    ),
+}
+
+def rebuild_prep_totals() -> None:
+    # Recomputes the table from the active orders (status index) in one
+    # transaction; run at startup so it also covers orders written before the
+    # triggers existed
+    active = f'(SELECT status, items FROM orders WHERE status IN {_TRACKED}) AS o, '
+    db.session.execute(text('DELETE FROM prep_list_totals'))
+    db.session.execute(text(
+        'INSERT INTO prep_list_totals (status, name, quantity) '
+        f"SELECT status, name, SUM(qty) FROM ({_entries('o.items', 'o.status AS status, ', active)}) "
+        "WHERE name <> '' AND qty > 0 GROUP BY status, name"
+    ))
+    db.session.commit()
\ No newline at end of file
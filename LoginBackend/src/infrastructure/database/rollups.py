@@ -0,0 +1,136 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Optional
+from sqlalchemy import text
+from .session import db
+from .models import OrderModel, OrderArchiveFileModel, OrderRollupDailyModel, OrderRollupHourlyModel
+from ..cache.table_version import orders_version
+
+if TYPE_CHECKING:
+    from ..archive.order_archive import OrderArchive
+
+# table -> SQL turning a created_at value into that table's bucket
+ROLLUP_TABLES = {
+    OrderRollupHourlyModel.__tablename__: "strftime('%Y-%m-%d %H:00:00', {})",
+    OrderRollupDailyModel.__tablename__: "date({})",
+}
+
+REBUILD_BATCH_DAYS = 31
+
+_ADD_ON_CONFLICT = (
+    'ON CONFLICT (bucket) DO UPDATE SET '
+    'order_count = order_count + excluded.order_count, '
+    'cancelled_count = cancelled_count + excluded.cancelled_count, '
+    'revenue_cents = revenue_cents + excluded.revenue_cents'
+)
+
+def _cancelled(row):
+    return f"CASE WHEN {row}.status = 'cancelled' THEN 1 ELSE 0 END"
+
+def _revenue_cents(row):
+    return (f"CASE WHEN {row}.status = 'cancelled' THEN 0 "
+            f"ELSE CAST(ROUND(COALESCE({row}.total_amount, 0) * 100) AS INTEGER) END")
+
+def _upserts(row, sign=''):
+    return ''.join(
+        f'INSERT INTO {table} (bucket, order_count, cancelled_count, revenue_cents) '
+        f'VALUES ({bucket.format(row + ".created_at")}, {sign}1, {sign}({_cancelled(row)}), '
+        f'{sign}({_revenue_cents(row)})) {_ADD_ON_CONFLICT}; '
+        for table, bucket in ROLLUP_TABLES.items()
+    )
+
+# Applied by run_migrations. Each order write adjusts its hour and day rows in
+# the same statement, so the rollups can never drift from the orders table; an
+# update that changes neither the amount, the cancelled flag nor the bucket
+# leaves them alone.
+ROLLUP_TRIGGERS = {
+    'trg_orders_rollup_insert': f'AFTER INSERT ON orders BEGIN {_upserts("NEW")}END',
+    'trg_orders_rollup_delete': (
+        'AFTER DELETE ON orders '
+        'WHEN NOT EXISTS (SELECT 1 FROM order_archive_files WHERE pending = 1) '
+        f'BEGIN {_upserts("OLD", "-")}END'
+    ),
+    'trg_orders_rollup_update': (
+        'AFTER UPDATE OF status, total_amount, created_at ON orders '
+        "WHEN (OLD.status = 'cancelled') IS NOT (NEW.status = 'cancelled') "
+        'OR OLD.total_amount IS NOT NEW.total_amount '
+        'OR OLD.created_at IS NOT NEW.created_at '
+        f'BEGIN {_upserts("OLD", "-")}{_upserts("NEW")}END'
+    ),
+}
+
+def _archived_rows(archive: 'OrderArchive', first_day: date, last_day: date):
+    hours = archive.rollup_rows(first_day, last_day)
+    days = defaultdict(lambda: [0, 0, 0])
+    for bucket, orders, cancelled, revenue in hours:
+        total = days[bucket[:10]]
+        total[0] += orders
+        total[1] += cancelled
+        total[2] += revenue
+    return {
+        OrderRollupHourlyModel.__tablename__: hours,
+        OrderRollupDailyModel.__tablename__: [(bucket, *total) for bucket, total in days.items()],
+    }
+
+def _rebuild_range(first_day: date, last_day: date, archive: 'OrderArchive') -> None:
+    start, end = first_day.isoformat(), (last_day + timedelta(days=1)).isoformat()
+    for table in ROLLUP_TABLES:
+        db.session.execute(
+            text(f'DELETE FROM {table} WHERE bucket >= :start AND bucket < :end'),
+            {'start': start, 'end': end}
+        )
+    # Read only once the deletes hold the write lock: the archiver takes the
+    # same lock for a whole batch, so no order can move from the table to the
+    # archive between this read and the orders read below (and be missed by both)
+    archived = _archived_rows(archive, first_day, last_day)
+    for table, bucket in ROLLUP_TABLES.items():
+        db.session.execute(
+            text(f'INSERT INTO {table} (bucket, order_count, cancelled_count, revenue_cents) '
+                 f'SELECT {bucket.format("o.created_at")} AS b, COUNT(*), '
+                 f'SUM({_cancelled("o")}), SUM({_revenue_cents("o")}) '
+                 'FROM orders o WHERE o.created_at >= :start AND o.created_at < :end '
+                 'GROUP BY b'),
+            {'start': start, 'end': end}
+        )
+        if archived[table]:
+            db.session.execute(
+                text(f'INSERT INTO {table} (bucket, order_count, cancelled_count, revenue_cents) '
+                     f'VALUES (:bucket, :orders, :cancelled, :revenue) {_ADD_ON_CONFLICT}'),
+                [{'bucket': bucket, 'orders': orders, 'cancelled': cancelled, 'revenue': revenue}
+                 for bucket, orders, cancelled, revenue in archived[table]]
+            )
+    # Reports are cached under the orders version
+    orders_version.bump()
+    db.session.commit()
+
+def rebuild_rollups(archive: 'OrderArchive', first_day: Optional[date] = None,
+                    last_day: Optional[date] = None) -> int:
+    # Recomputes the rollups from orders plus the archived orders,
+    # REBUILD_BATCH_DAYS per transaction so a long history never holds the
+    # write lock for long. Each batch deletes and reinserts under one lock, so
+    # it is safe to run next to live writes and the archiver.
+    if first_day is None or last_day is None:
+        oldest, newest = db.session.query(
+            db.func.min(OrderModel.created_at), db.func.max(OrderModel.created_at)
+        ).one()
+        days = [day for day in (oldest and oldest.date(), newest and newest.date()) if day]
+        days += [day for day in archive.date_range() if day]
+        if not days:
+            return 0
+        first_day = first_day or min(days)
+        last_day = last_day or max(days)
+    
+    batches = 0
+    day = first_day
+    while day <= last_day:
+        batch_end = min(day + timedelta(days=REBUILD_BATCH_DAYS - 1), last_day)
+        _rebuild_range(day, batch_end, archive)
+        batches += 1
+        day = batch_end + timedelta(days=1)
+    return batches
+
+def rollups_missing() -> bool:
+    return db.session.query(OrderRollupDailyModel.bucket).first() is None and (
+        db.session.query(OrderModel.id).first() is not None
+        or db.session.query(OrderArchiveFileModel.id).first() is not None
+    )
\ No newline at end of file
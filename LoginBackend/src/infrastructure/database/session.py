@@ -1,3 +1,12 @@
 from flask_sqlalchemy import SQLAlchemy
 
-db = SQLAlchemy()
\ No newline at end of file
+db = SQLAlchemy()
+
+# Values bound per IN (...) list; stays well under SQLite's bound-parameter
+# limit (999 before 3.32), so long id lists are queried in chunks of this size
+IN_CLAUSE_CHUNK = 900
+
+def is_sqlite() -> bool:
+    # The order triggers (status history, rollups, prep list totals) and the
+    # SQL that rebuilds their tables are written for SQLite
+    return db.engine.dialect.name == 'sqlite'
\ No newline at end of file
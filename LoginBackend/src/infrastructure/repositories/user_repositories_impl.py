@@ -1,14 +1,16 @@
-from typing import Optional
+from typing import Optional, List, Set, Tuple
 from datetime import datetime
 from ...domain.entities.user import User
 from ...domain.repositories.user_repository import UserRepository
+from ...domain.value_objects.email import normalize_email
 from ..database.models import UserModel
-from ..database.session import db
+from ..database.session import db, IN_CLAUSE_CHUNK
+from ..cache.table_version import token_epochs_version, users_version
 
 class UserRepositoryImpl(UserRepository):
     
     def find_by_email(self, email: str) -> Optional[User]:
-        user_model = UserModel.query.filter_by(email=email).first()
+        user_model = UserModel.query.filter_by(email_normalized=normalize_email(email)).first()
         return user_model.to_entity() if user_model else None
     
     def find_by_id(self, user_id: int) -> Optional[User]:
@@ -22,12 +24,46 @@ class UserRepositoryImpl(UserRepository):
         ).first()
         return user_model.to_entity() if user_model else None
     
+    def find_existing_emails(self, emails: List[str]) -> Set[str]:
+        existing = set()
+        for start in range(0, len(emails), IN_CLAUSE_CHUNK):
+            chunk = [normalize_email(email) for email in emails[start:start + IN_CLAUSE_CHUNK]]
+            rows = db.session.query(UserModel.email_normalized).filter(UserModel.email_normalized.in_(chunk))
+            existing.update(email for (email,) in rows)
+        return existing
+    
     def save(self, user: User) -> User:
         user_model = UserModel.from_entity(user)
         db.session.add(user_model)
         db.session.commit()
         return user_model.to_entity()
     
+    def save_many(self, users: List[User]) -> List[User]:
+        if not users:
+            return []
+        rows = [
+            {
+                'email': user.email,
+                'email_normalized': normalize_email(user.email),
+                'username': user.username,
+                'password_hash': user.password_hash,
+                'role': user.role.value,
+                'provider': user.provider.value,
+                'provider_id': user.provider_id,
+                'is_active': user.is_active,
+                'is_verified': user.is_verified
+            }
+            for user in users
+        ]
+        try:
+            saved = db.session.scalars(db.insert(UserModel).returning(UserModel), rows).all()
+            entities = [user_model.to_entity() for user_model in saved]
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return entities
+    
     def update(self, user: User) -> User:
         user_model = UserModel.query.get(user.id)
         if user_model:
@@ -40,6 +76,7 @@ class UserRepositoryImpl(UserRepository):
             user_model.is_active = user.is_active
             user_model.is_verified = user.is_verified
             user_model.last_login = user.last_login
+            users_version.bump()
             db.session.commit()
             return user_model.to_entity()
         return user
@@ -48,12 +85,49 @@ class UserRepositoryImpl(UserRepository):
         user_model = UserModel.query.get(user_id)
         if user_model:
             db.session.delete(user_model)
+            users_version.bump()
             db.session.commit()
             return True
         return False
     
-    def update_last_login(self, user_id: int) -> None:
+    def update_last_login(self, user_id: int, password_hash: Optional[str] = None) -> None:
         user_model = UserModel.query.get(user_id)
         if user_model:
             user_model.last_login = datetime.utcnow()
-            db.session.commit()
\ No newline at end of file
+            if password_hash:
+                user_model.password_hash = password_hash
+            db.session.commit()
+    
+    def revoke_tokens(
+        self,
+        user_id: int,
+        password_hash: Optional[str] = None,
+        is_active: Optional[bool] = None
+    ) -> Optional[int]:
+        # The counter row stays locked until this transaction commits, so
+        # epochs commit in the order they were handed out on every backend and
+        # a reader that has seen one has seen every lower one
+        values = {
+            'token_epoch': token_epochs_version.bump(),
+            'updated_at': datetime.utcnow(),
+        }
+        if password_hash is not None:
+            values['password_hash'] = password_hash
+        if is_active is not None:
+            values['is_active'] = is_active
+        
+        epoch = db.session.execute(
+            db.update(UserModel)
+            .where(UserModel.id == user_id)
+            .values(**values)
+            .returning(UserModel.token_epoch)
+        ).scalar_one_or_none()
+        db.session.commit()
+        return epoch
+    
+    def latest_token_epoch(self) -> int:
+        return token_epochs_version.value
+    
+    def find_token_epochs_since(self, epoch: int) -> List[Tuple[int, int]]:
+        rows = db.session.query(UserModel.id, UserModel.token_epoch).filter(UserModel.token_epoch > epoch)
+        return [(user_id, token_epoch) for user_id, token_epoch in rows]
\ No newline at end of file
@@ -0,0 +1,46 @@
+from argon2 import PasswordHasher, Type
+from argon2.exceptions import InvalidHashError, VerificationError
+
+class Argon2Service:
+    
+    prefix = '$argon2id$'
+    # argon2-cffi's RFC 9106 low-memory defaults; memory_cost is in KiB
+    time_cost = 3
+    memory_cost = 65536
+    parallelism = 4
+    _hasher = None
+    
+    @classmethod
+    def configure(cls, time_cost: int = None, memory_cost: int = None, parallelism: int = None) -> None:
+        cls.time_cost = time_cost or cls.time_cost
+        cls.memory_cost = memory_cost or cls.memory_cost
+        cls.parallelism = parallelism or cls.parallelism
+        cls._hasher = PasswordHasher(
+            time_cost=cls.time_cost,
+            memory_cost=cls.memory_cost,
+            parallelism=cls.parallelism,
+            type=Type.ID
+        )
+    
+    @classmethod
+    def _get_hasher(cls):
+        if cls._hasher is None:
+            cls.configure()
+        return cls._hasher
+    
+    @classmethod
+    def hash_password(cls, password: str) -> str:
+        return cls._get_hasher().hash(password)
+    
+    @classmethod
+    def verify_password(cls, password: str, hashed_password: str) -> bool:
+        if not hashed_password:
+            return False
+        try:
+            return cls._get_hasher().verify(hashed_password, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    
+    @classmethod
+    def needs_rehash(cls, hashed_password: str) -> bool:
+        return cls._get_hasher().check_needs_rehash(hashed_password)
\ No newline at end of file
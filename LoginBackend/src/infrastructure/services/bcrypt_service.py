@@ -1,10 +1,87 @@
+import math
+import os
+import platform
+import time
 import bcrypt
 
 class BcryptService:
     
+    # Work factor shared by every hash in the process. configure() sets it
+    # once at startup, either explicitly or calibrated so one hash takes about
+    # target_ms on this CPU. A calibrated cost is written to calibration_path
+    # and reused by later starts on the same host, so restarts do not re-time
+    # bcrypt or drift; another host, or a file older than
+    # CALIBRATION_MAX_AGE_DAYS, is calibrated afresh.
+    # Hashes stored with a lower cost are upgraded on the next successful
+    # login via needs_rehash(); higher costs are left alone.
+    prefix = '$2'
+    rounds = 12
+    CALIBRATION_MAX_AGE_DAYS = 30
+    
+    @classmethod
+    def configure(cls, rounds: int = None, target_ms: float = 250,
+                  min_rounds: int = 10, max_rounds: int = 16,
+                  calibration_path: str = None) -> int:
+        if not rounds and calibration_path:
+            rounds = cls._load_calibration(calibration_path, target_ms, min_rounds, max_rounds,
+                                           cls.CALIBRATION_MAX_AGE_DAYS * 86400)
+        if not rounds:
+            rounds = cls.calibrate(target_ms, min_rounds, max_rounds)
+            if calibration_path:
+                cls._save_calibration(calibration_path, target_ms, rounds)
+        cls.rounds = rounds
+        return cls.rounds
+    
     @staticmethod
-    def hash_password(password: str) -> str:
-        salt = bcrypt.gensalt()
+    def _host() -> str:
+        return f'{platform.node()}/{platform.machine()}/{platform.processor()}'
+    
+    @classmethod
+    def _load_calibration(cls, path: str, target_ms: float, min_rounds: int, max_rounds: int,
+                          max_age: float) -> int:
+        # "<target_ms> <rounds> <host>"; ignored once the target, bounds or
+        # host change, or once the file is older than max_age seconds
+        try:
+            if time.time() - os.path.getmtime(path) > max_age:
+                return None
+            with open(path) as f:
+                stored_target, stored_rounds, stored_host = f.read().split(maxsplit=2)
+            stored_target, stored_rounds = float(stored_target), int(stored_rounds)
+        except (OSError, ValueError):
+            return None
+        if stored_target != target_ms or stored_host != cls._host() \
+                or not min_rounds <= stored_rounds <= max_rounds:
+            return None
+        return stored_rounds
+    
+    @classmethod
+    def _save_calibration(cls, path: str, target_ms: float, rounds: int) -> None:
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w') as f:
+                f.write(f'{target_ms} {rounds} {cls._host()}')
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Could not save bcrypt calibration to {path}: {e}")
+    
+    @staticmethod
+    def calibrate(target_ms: float, min_rounds: int = 10, max_rounds: int = 16) -> int:
+        # Each extra round doubles the work, so time the cheapest allowed cost
+        # and extrapolate instead of trying every cost up to the target
+        salt = bcrypt.gensalt(rounds=min_rounds)
+        elapsed = float('inf')
+        for _ in range(3):
+            started = time.perf_counter()
+            bcrypt.hashpw(b'calibration', salt)
+            elapsed = min(elapsed, (time.perf_counter() - started) * 1000)
+        if elapsed >= target_ms:
+            return min_rounds
+        return max(min_rounds, min(max_rounds, min_rounds + int(math.log2(target_ms / elapsed))))
+    
+    @classmethod
+    def hash_password(cls, password: str) -> str:
+        salt = bcrypt.gensalt(rounds=cls.rounds)
         hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
         return hashed.decode('utf-8')
     
@@ -12,4 +89,12 @@ class BcryptService:
     def verify_password(password: str, hashed_password: str) -> bool:
         if not hashed_password:
             return False
-        return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
\ No newline at end of file
+        return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+    
+    @classmethod
+    def needs_rehash(cls, hashed_password: str) -> bool:
+        # Modular crypt format: $2b$<cost>$<salt+hash>
+        parts = hashed_password.split('$') if hashed_password else []
+        if len(parts) != 4 or not parts[2].isdigit():
+            return False
+        return int(parts[2]) < cls.rounds
\ No newline at end of file
@@ -0,0 +1,47 @@
+import hashlib
+import mmap
+import os
+
+DIGEST_SIZE = 20
+
+class BreachedPasswordList:
+    # Read-only view over a file of sorted, fixed-width SHA-1 digests (the
+    # format written by scripts/build_breached_list.py). The file is mmap'd, so
+    # memory use does not grow with the list and forked workers share the
+    # same page-cache pages; a lookup is a binary search of ~log2(n) slices.
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        if size % DIGEST_SIZE:
+            self._file.close()
+            raise ValueError(f'{path} is not a list of {DIGEST_SIZE}-byte digests')
+        self.count = size // DIGEST_SIZE
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def __contains__(self, password: str) -> bool:
+        return self.contains_digest(hashlib.sha1(password.encode('utf-8')).digest())
+    
+    def contains_digest(self, digest: bytes) -> bool:
+        data = self._map
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = mid * DIGEST_SIZE
+            entry = data[offset:offset + DIGEST_SIZE]
+            if entry < digest:
+                lo = mid + 1
+            elif entry > digest:
+                hi = mid
+            else:
+                return True
+        return False
+    
+    def close(self) -> None:
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
@@ -3,7 +3,8 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from ...application.interfaces.auth_service import AuthService
 from ...infrastructure.config.settings import settings
-from src.infrastructure.services.bcrypt_service import BcryptService
+from src.infrastructure.services.password_hashers import PasswordHashers
+from src.domain.entities.permission import permissions_for_role
 
 class JWTService(AuthService):
     
@@ -12,33 +13,40 @@ class JWTService(AuthService):
         self.algorithm = settings.JWT_ALGORITHM
     
     def hash_password(self, password: str) -> str:
-        return BcryptService.hash_password(password)
+        return PasswordHashers.hash_password(password)
     
     def verify_password(self, password: str, hashed_password: str) -> bool:
-        return BcryptService.verify_password(password, hashed_password)
+        return PasswordHashers.verify_password(password, hashed_password)
+    
+    def needs_rehash(self, hashed_password: str) -> bool:
+        return PasswordHashers.needs_rehash(hashed_password)
     
     def create_access_token(
         self, 
         user_id: int, 
         role: str, 
         expires_minutes: int = 1440,
-        is_guest: bool = False
+        is_guest: bool = False,
+        token_epoch: int = 0
     ) -> str:
         expire = datetime.utcnow() + timedelta(minutes=expires_minutes)
         payload = {
             'sub': str(user_id),
             'role': role,
+            'perms': permissions_for_role(role),
             'is_guest': is_guest,
+            'ep': token_epoch,
             'exp': expire,
             'iat': datetime.utcnow(),
             'type': 'access'
         }
         return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
     
-    def create_refresh_token(self, user_id: int) -> str:
+    def create_refresh_token(self, user_id: int, token_epoch: int = 0) -> str:
         expire = datetime.utcnow() + timedelta(days=30)
         payload = {
             'sub': str(user_id),
+            'ep': token_epoch,
             'exp': expire,
             'iat': datetime.utcnow(),
             'type': 'refresh'
@@ -0,0 +1,164 @@
+import time
+import json
+import base64
+import hashlib
+import secrets
+import threading
+import urllib.parse
+import urllib.request
+from typing import Any, Dict, List, Optional
+import jwt
+
+class OIDCError(Exception):
+    pass
+
+class OIDCClient:
+    # One configured OpenID Connect provider. The discovery document and the
+    # JWKS are fetched lazily and kept in memory for cache_ttl seconds, so a
+    # login does no key fetch at all in the steady state. An id_token signed
+    # with an unknown kid (the provider rotated keys) triggers one early JWKS
+    # refresh, at most every JWKS_MIN_REFRESH seconds.
+    JWKS_MIN_REFRESH = 60
+    HTTP_TIMEOUT = 10
+    SIGNING_ALGORITHMS = ('RS256', 'RS384', 'RS512', 'PS256', 'ES256', 'ES384')
+    
+    def __init__(self, name: str, issuer: str, client_id: str, client_secret: str,
+                 redirect_uri: str, scopes: str = 'openid email profile', cache_ttl: int = 3600):
+        self.name = name
+        self.issuer = issuer.rstrip('/')
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.redirect_uri = redirect_uri
+        self.scopes = scopes
+        self.cache_ttl = cache_ttl
+        
+        # Reentrant: refreshing the keys reads the cached discovery document
+        self._lock = threading.RLock()
+        self._discovery = None
+        self._discovery_expires = 0.0
+        self._keys: Dict[str, jwt.PyJWK] = {}
+        self._keys_expires = 0.0
+        self._keys_fetched = 0.0
+    
+    def _fetch_json(self, url: str, form: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        data = urllib.parse.urlencode(form).encode() if form is not None else None
+        req = urllib.request.Request(url, data=data, headers={'Accept': 'application/json'})
+        try:
+            with urllib.request.urlopen(req, timeout=self.HTTP_TIMEOUT) as response:
+                return json.loads(response.read())
+        except (OSError, ValueError) as e:
+            raise OIDCError(f'{self.name}: request to {url} failed: {e}')
+    
+    def discovery(self) -> Dict[str, Any]:
+        with self._lock:
+            if self._discovery is None or time.monotonic() >= self._discovery_expires:
+                document = self._fetch_json(f'{self.issuer}/.well-known/openid-configuration')
+                if document.get('issuer', '').rstrip('/') != self.issuer:
+                    raise OIDCError(f'{self.name}: discovery issuer {document.get("issuer")!r} does not match')
+                self._discovery = document
+                self._discovery_expires = time.monotonic() + self.cache_ttl
+            return self._discovery
+    
+    def _refresh_keys(self) -> None:
+        jwks = self._fetch_json(self.discovery()['jwks_uri'])
+        keys = {}
+        for data in jwks.get('keys', []):
+            if data.get('use', 'sig') != 'sig':
+                continue
+            try:
+                keys[data.get('kid', '')] = jwt.PyJWK(data)
+            except jwt.PyJWKError:
+                continue
+        now = time.monotonic()
+        self._keys = keys
+        self._keys_fetched = now
+        self._keys_expires = now + self.cache_ttl
+    
+    def signing_key(self, kid: Optional[str]) -> jwt.PyJWK:
+        kid = kid or ''
+        key = self._keys.get(kid)
+        if key is not None and time.monotonic() < self._keys_expires:
+            return key
+        with self._lock:
+            now = time.monotonic()
+            stale = now >= self._keys_expires
+            rotated = kid not in self._keys and now - self._keys_fetched >= self.JWKS_MIN_REFRESH
+            if stale or rotated:
+                self._refresh_keys()
+            key = self._keys.get(kid)
+        if key is None:
+            raise OIDCError(f'{self.name}: no signing key with kid {kid!r}')
+        return key
+    
+    @staticmethod
+    def new_login_state() -> Dict[str, str]:
+        return {
+            'state': secrets.token_urlsafe(24),
+            'nonce': secrets.token_urlsafe(24),
+            'code_verifier': secrets.token_urlsafe(48),
+        }
+    
+    def authorization_url(self, login_state: Dict[str, str]) -> str:
+        challenge = base64.urlsafe_b64encode(
+            hashlib.sha256(login_state['code_verifier'].encode()).digest()
+        ).rstrip(b'=').decode()
+        params = {
+            'response_type': 'code',
+            'client_id': self.client_id,
+            'redirect_uri': self.redirect_uri,
+            'scope': self.scopes,
+            'state': login_state['state'],
+            'nonce': login_state['nonce'],
+            'code_challenge': challenge,
+            'code_challenge_method': 'S256',
+        }
+        return f"{self.discovery()['authorization_endpoint']}?{urllib.parse.urlencode(params)}"
+    
+    def exchange_code(self, code: str, code_verifier: str) -> str:
+        tokens = self._fetch_json(self.discovery()['token_endpoint'], {
+            'grant_type': 'authorization_code',
+            'code': code,
+            'redirect_uri': self.redirect_uri,
+            'client_id': self.client_id,
+            'client_secret': self.client_secret,
+            'code_verifier': code_verifier,
+        })
+        if 'id_token' not in tokens:
+            raise OIDCError(f'{self.name}: token response has no id_token')
+        return tokens['id_token']
+    
+    def _allowed_algorithms(self) -> List[str]:
+        advertised = self.discovery().get('id_token_signing_alg_values_supported', ['RS256'])
+        return [alg for alg in advertised if alg in self.SIGNING_ALGORITHMS]
+    
+    def verify_id_token(self, id_token: str, nonce: str) -> Dict[str, Any]:
+        try:
+            header = jwt.get_unverified_header(id_token)
+            key = self.signing_key(header.get('kid'))
+            claims = jwt.decode(
+                id_token,
+                key.key,
+                algorithms=self._allowed_algorithms(),
+                audience=self.client_id,
+                issuer=self.discovery()['issuer'],
+                options={'require': ['exp', 'iat', 'sub']},
+                leeway=60
+            )
+        except jwt.InvalidTokenError as e:
+            raise OIDCError(f'{self.name}: invalid id_token: {e}')
+        if not secrets.compare_digest(str(claims.get('nonce', '')), nonce):
+            raise OIDCError(f'{self.name}: id_token nonce mismatch')
+        return claims
+
+def build_oidc_clients(settings) -> Dict[str, OIDCClient]:
+    clients = {}
+    if settings.GOOGLE_CLIENT_ID:
+        clients['google'] = OIDCClient(
+            name='google',
+            issuer=settings.GOOGLE_OIDC_ISSUER,
+            client_id=settings.GOOGLE_CLIENT_ID,
+            client_secret=settings.GOOGLE_CLIENT_SECRET,
+            redirect_uri=f'{settings.OIDC_REDIRECT_BASE_URL.rstrip("/")}/api/v1/auth/oauth/google/callback',
+            cache_ttl=settings.OIDC_CACHE_TTL
+        )
+    return clients
\ No newline at end of file
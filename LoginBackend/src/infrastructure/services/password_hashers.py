@@ -0,0 +1,47 @@
+from typing import Optional
+from src.infrastructure.services.bcrypt_service import BcryptService
+from src.infrastructure.services.argon2_service import Argon2Service
+
+# Every hasher exposes hash_password, verify_password and needs_rehash plus
+# the modular-crypt prefixes it writes, so a stored hash is routed to the
+# right implementation without a separate algorithm column.
+HASHERS = {
+    'bcrypt': BcryptService,
+    'argon2id': Argon2Service,
+}
+
+class PasswordHashers:
+    
+    default = 'bcrypt'
+    
+    @classmethod
+    def configure(cls, default: str) -> None:
+        if default not in HASHERS:
+            raise ValueError(f"Unknown password hasher '{default}', expected one of {sorted(HASHERS)}")
+        cls.default = default
+    
+    @staticmethod
+    def identify(hashed_password: str) -> Optional[str]:
+        if hashed_password:
+            for name, hasher in HASHERS.items():
+                if hashed_password.startswith(hasher.prefix):
+                    return name
+        return None
+    
+    @classmethod
+    def hash_password(cls, password: str) -> str:
+        return HASHERS[cls.default].hash_password(password)
+    
+    @classmethod
+    def verify_password(cls, password: str, hashed_password: str) -> bool:
+        name = cls.identify(hashed_password)
+        if name is None:
+            return False
+        return HASHERS[name].verify_password(password, hashed_password)
+    
+    @classmethod
+    def needs_rehash(cls, hashed_password: str) -> bool:
+        name = cls.identify(hashed_password)
+        if name is None:
+            return False
+        return name != cls.default or HASHERS[name].needs_rehash(hashed_password)
\ No newline at end of file
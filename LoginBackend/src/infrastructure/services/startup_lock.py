@@ -0,0 +1,24 @@
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+@contextmanager
+def startup_lock(path: str):
+    # Serialises create_app's one-off work (bcrypt calibration, create_all,
+    # migrations, seeding) between processes starting at once, as workers do
+    # under serve.py --no-preload. Without fcntl (Windows) there is nothing
+    # to hold, and a single process is assumed.
+    if fcntl is None or not path:
+        yield
+        return
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
\ No newline at end of file
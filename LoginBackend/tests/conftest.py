@@ -0,0 +1,57 @@
+import os
+import sys
+import threading
+from http.server import ThreadingHTTPServer
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.oidc_stub_provider import StubProvider, make_handler
+
+CLIENT_ID = 'test-client'
+
+@pytest.fixture
+def settings(tmp_path, monkeypatch):
+    # The global settings pointed at a throwaway database; fixtures and tests
+    # adjust further values with monkeypatch before asking for app
+    from src.infrastructure.config.settings import settings
+    monkeypatch.setattr(settings, 'DATABASE_URL', f'sqlite:///{tmp_path}/test.db')
+    monkeypatch.setattr(settings, 'DATABASE_PATH', f'{tmp_path}/test.db')
+    monkeypatch.setattr(settings, 'ARCHIVE_DIR', str(tmp_path / 'archive'))
+    monkeypatch.setattr(settings, 'BCRYPT_ROUNDS', 4)
+    monkeypatch.setattr(settings, 'STARTUP_LOCK_PATH', str(tmp_path / 'startup.lock'))
+    return settings
+
+@pytest.fixture
+def app(settings):
+    from src.api.app import create_app
+    app = create_app()
+    app.config['TESTING'] = True
+    return app
+
+@pytest.fixture
+def web(app):
+    return app.test_client()
+
+def login(web, email, password, role):
+    response = web.post('/api/v1/auth/login', json={'email': email, 'password': password, 'role': role})
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()['access_token']
+
+@pytest.fixture
+def oidc_provider(settings, monkeypatch):
+    # scripts/oidc_stub_provider.py on a free port, served from a thread and
+    # configured as the app's google provider
+    server = ThreadingHTTPServer(('127.0.0.1', 0), None)
+    provider = StubProvider(f'http://127.0.0.1:{server.server_port}', CLIENT_ID,
+                            'stub-user-1', 'social.user@example.com', 'Social User')
+    server.RequestHandlerClass = make_handler(provider)
+    server.RequestHandlerClass.log_message = lambda *args: None
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(settings, 'GOOGLE_OIDC_ISSUER', provider.issuer)
+    monkeypatch.setattr(settings, 'GOOGLE_CLIENT_ID', CLIENT_ID)
+    monkeypatch.setattr(settings, 'GOOGLE_CLIENT_SECRET', 'test-secret')
+    yield provider
+    server.shutdown()
+    server.server_close()
\ No newline at end of file
@@ -0,0 +1,71 @@
+import pytest
+from datetime import datetime
+from conftest import login
+import src.api.v1.routes.kitchen_routes as kitchen_routes
+
+@pytest.fixture
+def headers(web):
+    return {'Authorization': f"Bearer {login(web, 'admin@example.com', 'AdminPass123', 'admin')}"}
+
+@pytest.fixture
+def loads(monkeypatch):
+    calls = []
+    load = kitchen_routes.load_order_columns
+    
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return load(*args, **kwargs)
+    monkeypatch.setattr(kitchen_routes, 'load_order_columns', counting)
+    kitchen_routes._analytics_summary.cache_clear()
+    return calls
+
+def test_range_is_capped(web, headers):
+    response = web.get('/api/v1/kitchen/analytics?from=2024-01-01&to=2025-01-01', headers=headers)
+    assert response.status_code == 400
+    response = web.get('/api/v1/kitchen/analytics?from=2024-01-02&to=2025-01-01', headers=headers)
+    assert response.status_code == 200
+
+def test_results_are_reused_until_an_order_changes(web, headers, loads):
+    web.post('/api/v1/kitchen/orders', headers=headers,
+             json={'items': ['Soup'], 'total_amount': 90.05, 'table_number': 4})
+    first = web.get('/api/v1/kitchen/analytics?archive=false', headers=headers).get_json()
+    second = web.get('/api/v1/kitchen/analytics?archive=false', headers=headers).get_json()
+    assert first == second
+    assert len(loads) == 1
+    
+    web.post('/api/v1/kitchen/orders', headers=headers,
+             json={'items': ['Soup'], 'total_amount': 10, 'table_number': 4})
+    third = web.get('/api/v1/kitchen/analytics?archive=false', headers=headers).get_json()
+    assert len(loads) == 2
+    assert third['totals']['orders'] == first['totals']['orders'] + 1
+
+def test_revenue_matches_the_rollups_to_the_cent(web, headers):
+    for amount in (90.05, 0.125):
+        web.post('/api/v1/kitchen/orders', headers=headers,
+                 json={'items': ['Soup'], 'total_amount': amount, 'table_number': 4})
+    analytics = web.get('/api/v1/kitchen/analytics', headers=headers).get_json()
+    reports = web.get('/api/v1/kitchen/reports', headers=headers).get_json()
+    assert analytics['totals']['revenue'] == reports['totals']['revenue'] == 90.18
+
+def test_other_backends_load_the_same_columns(app, web, headers, monkeypatch):
+    import src.infrastructure.analytics.order_analytics as order_analytics
+    for amount, table in ((90.05, 4), (0.125, 4), (12, None), (-3.005, 'T2')):
+        web.post('/api/v1/kitchen/orders', headers=headers,
+                 json={'items': ['Soup'], 'total_amount': amount, 'table_number': table})
+    today = datetime.utcnow().date()
+    with app.app_context():
+        from_sqlite = order_analytics.load_order_columns(today, today, chunk_size=3)
+        monkeypatch.setattr(order_analytics, 'is_sqlite', lambda: False)
+        portable = order_analytics.load_order_columns(today, today, chunk_size=3)
+    assert len(portable) == 4
+    for name in ('created_at', 'amount_cents', 'cancelled', 'table'):
+        assert getattr(portable, name).tolist() == getattr(from_sqlite, name).tolist()
+    assert portable.table_labels == from_sqlite.table_labels
+
+def test_tied_tables_are_ordered_by_label(app, web, headers):
+    tables = ['T9', 'T1', 'Bar', 'T10', 'Patio']
+    for table in tables:
+        web.post('/api/v1/kitchen/orders', headers=headers,
+                 json={'items': ['Soup'], 'total_amount': 10, 'table_number': table})
+    body = web.get('/api/v1/kitchen/analytics?archive=false', headers=headers).get_json()
+    assert [row['table_number'] for row in body['top_tables']] == sorted(tables)
\ No newline at end of file
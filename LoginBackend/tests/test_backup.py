@@ -0,0 +1,34 @@
+import sqlite3
+import threading
+import time
+from scripts.backup_db import online_backup, verify_backup
+
+def test_backup_finishes_while_the_source_is_written(tmp_path):
+    source = str(tmp_path / 'source.db')
+    conn = sqlite3.connect(source)
+    conn.execute("CREATE TABLE t (x TEXT)")
+    conn.executemany("INSERT INTO t VALUES (?)", [('x' * 500,)] * 4000)
+    conn.commit()
+    conn.close()
+    
+    stop = threading.Event()
+    
+    def write():
+        writer = sqlite3.connect(source, timeout=30)
+        while not stop.is_set():
+            writer.execute("INSERT INTO t VALUES ('y')")
+            writer.commit()
+            time.sleep(0.002)
+        writer.close()
+    
+    thread = threading.Thread(target=write)
+    thread.start()
+    try:
+        stats = online_backup(source, str(tmp_path / 'backup.db'), pages=8, pause=0.002, max_restarts=3)
+    finally:
+        stop.set()
+        thread.join()
+    
+    assert stats['restarts'] == 3
+    assert stats['single_step']
+    assert verify_backup(str(tmp_path / 'backup.db')) == ['ok']
\ No newline at end of file
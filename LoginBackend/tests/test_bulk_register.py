@@ -0,0 +1,29 @@
+import pytest
+from conftest import login
+from src.domain.entities import permission
+from src.domain.entities.permission import Permission
+
+@pytest.fixture
+def staff_manager(web, monkeypatch):
+    # A role that may create staff accounts but not admins
+    role = 'restaurant_staff'
+    granted = permission._ROLE_PERMISSIONS_BY_VALUE[role] | Permission.USERS_CREATE_STAFF
+    monkeypatch.setitem(permission._ROLE_PERMISSIONS_BY_VALUE, role, int(granted))
+    return {'Authorization': f"Bearer {login(web, 'staff@restaurant.com', 'StaffPass123', role)}"}
+
+def bulk(web, headers, role):
+    return web.post('/api/v1/auth/create-restaurant-staff/bulk', headers=headers, json={'users': [
+        {'email': f'new.{role}@example.com', 'password': 'Str0ng!Passphrase', 'role': role}
+    ]})
+
+def test_staff_creators_cannot_create_admins(web, staff_manager):
+    assert bulk(web, staff_manager, 'admin').status_code == 403
+    response = bulk(web, staff_manager, 'restaurant_staff')
+    assert response.status_code == 201
+    assert response.get_json()['users'][0]['role'] == 'restaurant_staff'
+
+def test_admins_can_create_admins(web):
+    headers = {'Authorization': f"Bearer {login(web, 'admin@example.com', 'AdminPass123', 'admin')}"}
+    response = bulk(web, headers, 'admin')
+    assert response.status_code == 201
+    assert response.get_json()['users'][0]['role'] == 'admin'
\ No newline at end of file
@@ -0,0 +1,34 @@
+import pytest
+from sqlalchemy import event
+from conftest import login
+from src.infrastructure.database.session import db
+from src.infrastructure.database.models import OrderModel
+
+@pytest.fixture
+def headers(web):
+    return {'Authorization': f"Bearer {login(web, 'admin@example.com', 'AdminPass123', 'admin')}"}
+
+def test_a_full_batch_of_versioned_updates_stays_under_the_parameter_limit(app, web, headers):
+    with app.app_context():
+        db.session.add_all(
+            OrderModel(order_number=f'bulk-{i}', items='["Soup"]', total_amount=1, status='pending')
+            for i in range(500)
+        )
+        db.session.commit()
+        orders = db.session.query(OrderModel.id, OrderModel.version).all()
+        
+        parameters = []
+        
+        def count(conn, cursor, statement, bound, context, executemany):
+            parameters.append(len(bound))
+        engine = db.engine
+        event.listen(engine, 'before_cursor_execute', count)
+    try:
+        response = web.put('/api/v1/kitchen/orders/status', headers=headers, json={'updates': [
+            {'id': order_id, 'status': 'preparing', 'version': version} for order_id, version in orders
+        ]})
+    finally:
+        event.remove(engine, 'before_cursor_execute', count)
+    
+    assert response.get_json()['updated'] == 500
+    assert max(parameters) < 999
\ No newline at end of file
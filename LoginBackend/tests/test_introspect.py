@@ -0,0 +1,37 @@
+import pytest
+from conftest import login
+
+@pytest.fixture
+def staff_token(web):
+    return login(web, 'staff@restaurant.com', 'StaffPass123', 'restaurant_staff')
+
+@pytest.fixture
+def admin_token(web):
+    return login(web, 'admin@example.com', 'AdminPass123', 'admin')
+
+def introspect(web, token, authorization=None):
+    headers = {'Authorization': authorization} if authorization else {}
+    return web.post('/api/v1/auth/introspect', json={'token': token}, headers=headers)
+
+def test_anonymous_callers_are_refused(web, staff_token):
+    response = introspect(web, staff_token)
+    assert response.status_code == 401
+    assert response.headers['WWW-Authenticate'] == 'Bearer'
+
+def test_tokens_without_the_permission_are_refused(web, staff_token):
+    assert introspect(web, staff_token, f'Bearer {staff_token}').status_code == 401
+
+def test_admin_token_may_introspect(web, staff_token, admin_token):
+    response = introspect(web, staff_token, f'Bearer {admin_token}')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['active'] is True
+    assert body['role'] == 'restaurant_staff'
+
+def test_gateway_secret(settings, monkeypatch, web, staff_token):
+    monkeypatch.setattr(settings, 'INTROSPECTION_SECRET', 'gateway-secret')
+    assert introspect(web, staff_token, 'Bearer gateway-secret').get_json()['active'] is True
+    assert introspect(web, staff_token, 'Bearer wrong-secret').status_code == 401
+
+def test_garbage_is_inactive(web, admin_token):
+    assert introspect(web, 'not-a-token', f'Bearer {admin_token}').get_json() == {'active': False}
\ No newline at end of file
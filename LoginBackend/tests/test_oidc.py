@@ -0,0 +1,118 @@
+import base64
+import hashlib
+import http.client
+import urllib.parse
+import pytest
+from conftest import CLIENT_ID
+from src.infrastructure.services.oidc_service import OIDCClient, OIDCError
+
+REDIRECT_URI = 'http://localhost:5000/api/v1/auth/oauth/google/callback'
+
+@pytest.fixture
+def client(oidc_provider):
+    return OIDCClient('google', oidc_provider.issuer, CLIENT_ID, 'test-secret', REDIRECT_URI)
+
+def authorize(url):
+    # Follows the provider's /authorize redirect one hop and returns the
+    # query it sends back to the redirect_uri
+    parsed = urllib.parse.urlparse(url)
+    connection = http.client.HTTPConnection(parsed.netloc)
+    connection.request('GET', f'{parsed.path}?{parsed.query}')
+    response = connection.getresponse()
+    assert response.status == 302
+    location = response.getheader('Location')
+    connection.close()
+    return location, dict(urllib.parse.parse_qsl(urllib.parse.urlparse(location).query))
+
+def login(client):
+    login_state = client.new_login_state()
+    _, callback = authorize(client.authorization_url(login_state))
+    id_token = client.exchange_code(callback['code'], login_state['code_verifier'])
+    return client.verify_id_token(id_token, login_state['nonce'])
+
+def test_authorization_url_sends_s256_challenge_state_and_nonce(client):
+    login_state = client.new_login_state()
+    params = dict(urllib.parse.parse_qsl(urllib.parse.urlparse(client.authorization_url(login_state)).query))
+    expected = base64.urlsafe_b64encode(
+        hashlib.sha256(login_state['code_verifier'].encode()).digest()
+    ).rstrip(b'=').decode()
+    assert params['code_challenge'] == expected
+    assert params['code_challenge_method'] == 'S256'
+    assert params['state'] == login_state['state']
+    assert params['nonce'] == login_state['nonce']
+    assert login_state['code_verifier'] not in client.authorization_url(login_state)
+
+def test_login_state_is_fresh_each_time(client):
+    first, second = client.new_login_state(), client.new_login_state()
+    assert all(first[name] != second[name] for name in first)
+
+def test_code_exchange_verifies_pkce(client):
+    login_state = client.new_login_state()
+    _, callback = authorize(client.authorization_url(login_state))
+    with pytest.raises(OIDCError):
+        client.exchange_code(callback['code'], client.new_login_state()['code_verifier'])
+
+def test_valid_login_returns_claims(client):
+    claims = login(client)
+    assert claims['sub'] == 'stub-user-1'
+    assert claims['email'] == 'social.user@example.com'
+
+def test_nonce_mismatch_is_rejected(client):
+    login_state = client.new_login_state()
+    _, callback = authorize(client.authorization_url(login_state))
+    id_token = client.exchange_code(callback['code'], login_state['code_verifier'])
+    with pytest.raises(OIDCError, match='nonce'):
+        client.verify_id_token(id_token, client.new_login_state()['nonce'])
+
+def test_discovery_and_jwks_are_cached(client, oidc_provider):
+    for _ in range(3):
+        login(client)
+    assert oidc_provider.hits['discovery'] == 1
+    assert oidc_provider.hits['jwks'] == 1
+    assert oidc_provider.hits['token'] == 3
+
+def test_expired_cache_is_refetched(client, oidc_provider):
+    login(client)
+    client._discovery_expires = client._keys_expires = 0.0
+    login(client)
+    assert oidc_provider.hits['discovery'] == 2
+    assert oidc_provider.hits['jwks'] == 2
+
+def test_rotated_key_triggers_one_jwks_refresh(client, oidc_provider):
+    login(client)
+    oidc_provider.rotate_key()
+    # Within JWKS_MIN_REFRESH of the last fetch an unknown kid is refused
+    # without hitting the provider again
+    with pytest.raises(OIDCError, match='no signing key'):
+        login(client)
+    assert oidc_provider.hits['jwks'] == 1
+    
+    client._keys_fetched -= client.JWKS_MIN_REFRESH
+    assert login(client)['sub'] == 'stub-user-1'
+    login(client)
+    assert oidc_provider.hits['jwks'] == 2
+
+def test_callback_signs_in_through_the_app(oidc_provider, web):
+    response = web.get('/api/v1/auth/oauth/google/authorize')
+    assert response.status_code == 302
+    location, callback = authorize(response.headers['Location'])
+    assert location.startswith(REDIRECT_URI)
+    
+    response = web.get('/api/v1/auth/oauth/google/callback', query_string=callback)
+    assert response.status_code == 201, response.get_json()
+    body = response.get_json()
+    assert body['user']['email'] == 'social.user@example.com'
+    assert body['access_token']
+    
+    # The login state is single use
+    response = web.get('/api/v1/auth/oauth/google/callback', query_string=callback)
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'invalid_state'
+
+def test_callback_rejects_a_foreign_state(oidc_provider, web):
+    _, callback = authorize(web.get('/api/v1/auth/oauth/google/authorize').headers['Location'])
+    callback['state'] = 'forged'
+    response = web.get('/api/v1/auth/oauth/google/callback', query_string=callback)
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'invalid_state'
+    assert oidc_provider.hits['token'] == 0
\ No newline at end of file
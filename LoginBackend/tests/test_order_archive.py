@@ -0,0 +1,91 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from conftest import login
+from src.infrastructure.database.session import db
+from src.infrastructure.database.rollups import rebuild_rollups
+
+@pytest.fixture
+def headers(web):
+    return {'Authorization': f"Bearer {login(web, 'admin@example.com', 'AdminPass123', 'admin')}"}
+
+@pytest.fixture
+def archived_orders(app, web, headers):
+    # 30 served or cancelled orders spread over three days of January,
+    # created out of id order within each day, then archived in small batches
+    ids = []
+    for i in range(30):
+        response = web.post('/api/v1/kitchen/orders', headers=headers,
+                            json={'items': ['Soup'], 'total_amount': 5.55 + i, 'table_number': 1})
+        order_id = response.get_json()['order']['id']
+        targets = ['cancelled'] if i % 4 == 0 else ['preparing', 'ready', 'served']
+        for status in targets:
+            web.put(f'/api/v1/kitchen/orders/{order_id}/status', headers=headers, json={'status': status})
+        ids.append(order_id)
+    with app.app_context():
+        for i, order_id in enumerate(ids):
+            created_at = f'2026-01-1{i % 3} {23 - i % 7:02d}:15:00.000000'
+            db.session.execute(text('UPDATE orders SET created_at = :at, updated_at = :at WHERE id = :id'),
+                               {'at': created_at, 'id': order_id})
+        db.session.commit()
+    return ids
+
+def rollups():
+    return [tuple(row) for table in ('order_rollups_daily', 'order_rollups_hourly')
+            for row in db.session.execute(text(f'SELECT * FROM {table} WHERE order_count != 0 ORDER BY bucket'))]
+
+def test_rebuild_keeps_archived_history(app, archived_orders):
+    with app.app_context():
+        before = rollups()
+        archive = app.extensions['container'].order_archive
+        archive.batch_size = 7
+        assert archive.archive()['orders'] == len(archived_orders)
+        assert db.session.execute(text('SELECT count(*) FROM orders')).scalar() == 0
+        assert rollups() == before
+        
+        db.session.execute(text('DELETE FROM order_rollups_daily'))
+        db.session.execute(text('DELETE FROM order_rollups_hourly'))
+        db.session.commit()
+        rebuild_rollups(archive)
+        assert rollups() == before
+
+def pages(web, headers, query):
+    ids, before_id = [], None
+    while True:
+        url = f'/api/v1/kitchen/orders/archive?from=2026-01-01&to=2026-01-31&fields=status&{query}'
+        body = web.get(url + (f'&before_id={before_id}' if before_id else ''), headers=headers).get_json()
+        ids += [order['id'] for order in body['orders']]
+        if not body['has_more']:
+            return ids
+        before_id = body['next_before_id']
+
+def test_archive_pages_are_in_id_order_across_files(app, web, headers, archived_orders):
+    with app.app_context():
+        archive = app.extensions['container'].order_archive
+        archive.batch_size = 4
+        archive.archive()
+        # Every day is split over several files whose id ranges interleave
+        assert db.session.execute(text('SELECT count(*) FROM order_archive_files')).scalar() > 3
+    
+    assert pages(web, headers, 'limit=4') == sorted(archived_orders, reverse=True)
+    served = [order_id for i, order_id in enumerate(archived_orders) if i % 4]
+    assert pages(web, headers, 'limit=3&status=served') == sorted(served, reverse=True)
+    
+    response = web.get('/api/v1/kitchen/orders/archive?before_id=0', headers=headers)
+    assert response.status_code == 400
+
+def test_archive_defaults_to_the_days_just_past_retention(app, web, headers):
+    response = web.post('/api/v1/kitchen/orders', headers=headers,
+                        json={'items': ['Soup'], 'total_amount': 7, 'table_number': 1})
+    order_id = response.get_json()['order']['id']
+    web.put(f'/api/v1/kitchen/orders/{order_id}/status', headers=headers, json={'status': 'cancelled'})
+    with app.app_context():
+        archive = app.extensions['container'].order_archive
+        at = datetime.utcnow() - timedelta(days=archive.retention_days + 1)
+        db.session.execute(text('UPDATE orders SET created_at = :at, updated_at = :at WHERE id = :id'),
+                           {'at': at, 'id': order_id})
+        db.session.commit()
+        archive.archive()
+    
+    body = web.get('/api/v1/kitchen/orders/archive', headers=headers).get_json()
+    assert [order['id'] for order in body['orders']] == [order_id]
\ No newline at end of file
@@ -0,0 +1,27 @@
+import pytest
+from conftest import login
+
+@pytest.fixture
+def headers(web):
+    return {'Authorization': f"Bearer {login(web, 'admin@example.com', 'AdminPass123', 'admin')}"}
+
+def test_expanded_users_are_refetched_after_a_user_changes(app, web, headers):
+    web.post('/api/v1/kitchen/orders', headers=headers, json={'items': ['Soup'], 'table_number': 1})
+    first = web.get('/api/v1/kitchen/orders/pending?expand=creator', headers=headers)
+    etag = first.headers['ETag']
+    assert web.get('/api/v1/kitchen/orders/pending?expand=creator',
+                   headers={**headers, 'If-None-Match': etag}).status_code == 304
+    
+    with app.app_context():
+        repository = app.extensions['container'].user_repository
+        admin = repository.find_by_email('admin@example.com')
+        admin.username = 'head-chef'
+        repository.update(admin)
+    
+    second = web.get('/api/v1/kitchen/orders/pending?expand=creator',
+                     headers={**headers, 'If-None-Match': etag})
+    assert second.status_code == 200
+    assert second.get_json()['orders'][0]['creator']['username'] == 'head-chef'
+    
+    unexpanded = web.get('/api/v1/kitchen/orders/pending', headers=headers).headers['ETag']
+    assert 'users-' not in unexpanded
\ No newline at end of file
@@ -0,0 +1,106 @@
+import random
+from collections import Counter
+import pytest
+from conftest import login
+from src.infrastructure.cache.prep_list import parse_items
+
+ITEMS = [
+    [{'name': 'Burger', 'quantity': 2}, {'name': ' burger ', 'qty': 1}, 'Fries'],
+    [{'name': 'Salad', 'qty': '3'}, {'name': 'Soup', 'quantity': 0}, {'qty': 2}, 7],
+    [{'name': 'Fries', 'quantity': 1}, {'name': '', 'quantity': 4}],
+    ['Cola', 'cola', {'name': 'Water', 'qty': 'many'}],
+]
+
+@pytest.fixture
+def headers(web):
+    return {'Authorization': f"Bearer {login(web, 'admin@example.com', 'AdminPass123', 'admin')}"}
+
+def expected(web, headers):
+    totals = {}
+    counts = Counter()
+    for order in web.get('/api/v1/kitchen/orders', headers=headers).get_json()['orders']:
+        if order['status'] in ('pending', 'preparing'):
+            counts[order['status']] += 1
+            for name, qty in parse_items(order['items']).items():
+                totals.setdefault(name, {'name': name, 'pending': 0, 'preparing': 0})[order['status']] += qty
+    items = sorted(totals.values(), key=lambda item: (-item['pending'], item['name']))
+    return {'items': items, 'orders': {'pending': counts['pending'], 'preparing': counts['preparing']}}
+
+def prep_list(web, headers):
+    body = web.get('/api/v1/kitchen/prep-list', headers=headers).get_json()
+    return {'items': body['items'], 'orders': body['orders']}
+
+def write_randomly(web, headers, rng, writes=60):
+    ids = []
+    for _ in range(writes):
+        action = rng.choice(['create', 'create', 'status', 'items', 'delete', 'bulk', 'claim'])
+        if action == 'create' or not ids:
+            response = web.post('/api/v1/kitchen/orders', headers=headers,
+                                json={'items': rng.choice(ITEMS), 'table_number': 1})
+            ids.append(response.get_json()['order']['id'])
+        elif action == 'status':
+            web.put(f'/api/v1/kitchen/orders/{rng.choice(ids)}/status', headers=headers,
+                    json={'status': rng.choice(['preparing', 'ready', 'cancelled'])})
+        elif action == 'items':
+            web.put(f'/api/v1/kitchen/orders/{rng.choice(ids)}', headers=headers,
+                    json={'items': rng.choice(ITEMS)})
+        elif action == 'bulk':
+            web.put('/api/v1/kitchen/orders/status', headers=headers, json={'updates': [
+                {'id': order_id, 'status': rng.choice(['pending', 'preparing', 'ready'])}
+                for order_id in rng.sample(ids, min(3, len(ids)))
+            ]})
+        elif action == 'claim':
+            web.post('/api/v1/kitchen/orders/claim-next', headers=headers)
+        else:
+            web.delete(f'/api/v1/kitchen/orders/{ids.pop(rng.randrange(len(ids)))}', headers=headers)
+        assert prep_list(web, headers) == expected(web, headers)
+    assert expected(web, headers)['items']
+
+def test_totals_follow_every_kind_of_order_write(app, web, headers):
+    write_randomly(web, headers, random.Random(7))
+    with app.app_context():
+        app.extensions['container'].prep_list.rebuild()
+    assert prep_list(web, headers) == expected(web, headers)
+
+def test_items_that_are_not_an_array_count_nothing(app, web, headers):
+    from sqlalchemy import text
+    from src.infrastructure.database.session import db
+    response = web.post('/api/v1/kitchen/orders', headers=headers, json={'items': ['Tea'], 'table_number': 1})
+    order_id = response.get_json()['order']['id']
+    assert prep_list(web, headers)['items'] == [{'name': 'tea', 'pending': 1, 'preparing': 0}]
+    with app.app_context():
+        for items in ('{"name": "Tea"}', 'not json', None, '["Tea", "Tea"]'):
+            db.session.execute(text('UPDATE orders SET items = :items WHERE id = :id'),
+                               {'items': items, 'id': order_id})
+            db.session.commit()
+    assert prep_list(web, headers)['items'] == [{'name': 'tea', 'pending': 2, 'preparing': 0}]
+
+def test_backends_without_triggers_keep_the_totals_from_python(app, web, headers, monkeypatch):
+    from sqlalchemy import text
+    from src.infrastructure.database.session import db
+    from src.infrastructure.database.prep_totals import PREP_TOTALS_TRIGGERS
+    import src.infrastructure.cache.prep_list as prep_list_module
+    with app.app_context():
+        for name in PREP_TOTALS_TRIGGERS:
+            db.session.execute(text(f'DROP TRIGGER {name}'))
+        db.session.commit()
+    monkeypatch.setattr(prep_list_module, 'is_sqlite', lambda: False)
+    
+    write_randomly(web, headers, random.Random(11))
+    with app.app_context():
+        app.extensions['container'].prep_list.rebuild()
+    assert prep_list(web, headers) == expected(web, headers)
+
+def test_quantities_are_read_the_same_way_as_parse_items(web, headers):
+    items = [
+        {'name': 'Rice', 'qty': '2.7'}, {'name': 'Rice', 'qty': ' 2 '}, {'name': 'Rice', 'qty': '-1'},
+        {'name': 'Tea', 'qty': 2.7}, {'name': 'Tea', 'qty': None, 'quantity': '3'},
+        {'name': 'Bun', 'qty': [4]}, {'name': 'Bun', 'qty': {'n': 4}}, {'name': 'Bun', 'qty': True},
+        {'name': '\tJam', 'qty': 1}, {'name': 'CRÈME', 'qty': 1},
+    ]
+    web.post('/api/v1/kitchen/orders', headers=headers, json={'items': items, 'table_number': 1})
+    body = prep_list(web, headers)
+    assert body == expected(web, headers)
+    assert {item['name']: item['pending'] for item in body['items']} == {
+        'rice': 2, 'tea': 5, 'bun': 1, '\tjam': 1, 'crÈme': 1
+    }
\ No newline at end of file
@@ -0,0 +1,28 @@
+import os
+import sqlite3
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_workers_starting_together_seed_a_fresh_database_once(tmp_path):
+    # What gunicorn --no-preload does: every worker runs create_app at once
+    db_path = tmp_path / 'startup.db'
+    env = dict(os.environ,
+               DATABASE_URL=f'sqlite:///{db_path}',
+               ARCHIVE_DIR=str(tmp_path / 'archive'),
+               STARTUP_LOCK_PATH=str(tmp_path / 'startup.lock'),
+               BCRYPT_ROUNDS='4')
+    workers = [
+        subprocess.Popen([sys.executable, '-c', 'from src.api.app import create_app; create_app()'],
+                         cwd=ROOT, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        for _ in range(4)
+    ]
+    for worker in workers:
+        _, err = worker.communicate(timeout=120)
+        assert worker.returncode == 0, err.decode()
+    
+    conn = sqlite3.connect(db_path)
+    emails = [row[0] for row in conn.execute("SELECT email FROM users ORDER BY email")]
+    conn.close()
+    assert emails == ['admin@example.com', 'staff@restaurant.com', 'user@example.com']
\ No newline at end of file
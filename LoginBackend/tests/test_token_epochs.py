@@ -0,0 +1,43 @@
+from conftest import login
+
+def me(web, token):
+    return web.get('/api/v1/auth/me', headers={'Authorization': f'Bearer {token}'}).status_code
+
+def test_logout_everywhere_revokes_at_once_on_this_worker(web):
+    token = login(web, 'user@example.com', 'Password123', 'user')
+    assert me(web, token) == 200
+    headers = {'Authorization': f'Bearer {token}'}
+    assert web.post('/api/v1/auth/logout-all', headers=headers).status_code == 200
+    assert me(web, token) == 401
+
+def test_revocation_by_another_worker_is_seen_after_the_ttl(app, web, monkeypatch):
+    # A second app on the same database stands in for another worker
+    from src.api.app import create_app
+    other = create_app().test_client()
+    token = login(web, 'user@example.com', 'Password123', 'user')
+    assert me(web, token) == 200
+    
+    cache = app.extensions['container'].token_epochs
+    monkeypatch.setattr(cache, 'ttl', 3600)
+    other_token = login(other, 'user@example.com', 'Password123', 'user')
+    headers = {'Authorization': f'Bearer {other_token}'}
+    assert other.post('/api/v1/auth/logout-all', headers=headers).status_code == 200
+    assert me(web, token) == 200
+    
+    monkeypatch.setattr(cache, '_next_poll', 0.0)
+    assert me(web, token) == 401
+
+def test_epochs_continue_above_those_issued_before_the_counter(app, web):
+    from sqlalchemy import text
+    from src.infrastructure.database.session import db
+    from src.infrastructure.database.migrations import run_migrations
+    with app.app_context():
+        container = app.extensions['container']
+        user = container.user_repository.find_by_email('user@example.com')
+        db.session.execute(text('UPDATE users SET token_epoch = 41 WHERE id != :id'), {'id': user.id})
+        db.session.execute(text("DELETE FROM table_versions WHERE name = 'token_epochs'"))
+        db.session.commit()
+        run_migrations(container.order_archive)
+        assert container.user_repository.latest_token_epoch() == 41
+        assert container.user_repository.revoke_tokens(user.id) == 42
+        assert container.user_repository.find_token_epochs_since(41) == [(user.id, 42)]
\ No newline at end of file